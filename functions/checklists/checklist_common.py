@@ -4,6 +4,11 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from checklists.checklist_paths import (
+    event_participants_collection_path,
+    items_collection_path,
+    participants_collection_path,
+)
 from firebase_functions import https_fn
 from utils.datetime_helper import get_current_timestamp
 from utils.firestore_helper import FirestoreHelper
@@ -286,8 +291,6 @@ def build_item_patch_payload(entry: Dict[str, Any], now: str) -> Dict[str, Any]:
 def validate_item_patches_event_participants(
     helper: FirestoreHelper, event_id: str, patches: List[Dict[str, Any]]
 ) -> bool:
-    from checklists.checklist_paths import event_participants_collection_path
-
     path = event_participants_collection_path(event_id)
     for patch in patches:
         if "participantIds" not in patch:
@@ -425,8 +428,6 @@ def normalize_items(raw: Any) -> Optional[List[Dict[str, Any]]]:
 def validate_items_event_participants(
     helper: FirestoreHelper, event_id: str, items: List[Dict[str, Any]]
 ) -> bool:
-    from checklists.checklist_paths import event_participants_collection_path
-
     path = event_participants_collection_path(event_id)
     for item in items:
         for participant_id in item_participant_ids(item):
@@ -473,8 +474,6 @@ def build_item_response(item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
 def load_checklist_items(
     helper: FirestoreHelper, event_id: str, checklist_id: str
 ) -> List[Dict[str, Any]]:
-    from checklists.checklist_paths import items_collection_path
-
     rows = helper.query_documents(
         items_collection_path(event_id, checklist_id),
         order_by=[("order", "asc")],
@@ -508,8 +507,6 @@ def build_checklist_summary(
     checklist_id: str,
     checklist_data: Dict[str, Any],
 ) -> Dict[str, Any]:
-    from checklists.checklist_paths import items_collection_path, participants_collection_path
-
     item_count = len(helper.list_document_ids(items_collection_path(event_id, checklist_id)))
     participant_count = len(
         helper.list_document_ids(participants_collection_path(event_id, checklist_id))
@@ -533,8 +530,6 @@ def persist_template_items(
     checklist_id: str,
     items: List[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
-    from checklists.checklist_paths import items_collection_path
-
     now = get_current_timestamp()
     path = items_collection_path(event_id, checklist_id)
     operations = []
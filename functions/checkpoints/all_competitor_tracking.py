@@ -6,6 +6,7 @@ from typing import Any, Dict, List
 from firebase_admin import firestore
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
+from utils.competitor_checkpoints_helper import get_competitor_checkpoints
 from utils.helper_http import verify_bearer_token
 from utils.helper_http_verb import validate_request
 from utils.helpers import convert_firestore_value
@@ -36,8 +37,8 @@ def all_competitor_tracking(req: https_fn.Request) -> https_fn.Response:
     - 500: Internal Server Error (sin respuesta JSON, solo código HTTP)
 
     Nota: Consulta events_tracking/{eventId}/competitor_tracking/{eventId}_{dayOfRaceId}/competitors
-          y para cada competidor obtiene TODOS sus checkpoints desde
-          competitors/{competitorId}/checkpoints.
+          y para cada competidor obtiene TODOS sus checkpoints del arreglo 'checkpoints'
+          de su documento (o de competitors/{competitorId}/checkpoints en estructuras previas).
           No aplica filtros, retorna todos los competidores con todos sus checkpoints.
     """
     # Validar CORS y método HTTP
@@ -163,32 +164,20 @@ def all_competitor_tracking(req: https_fn.Request) -> https_fn.Response:
 
                 competitor_id = competitor_doc.id
 
-                # Construir ruta a TODOS los checkpoints del competidor
-                # events_tracking/{eventId}/competitor_tracking/{eventId}_{dayOfRaceId}/competitors/{competitorId}/checkpoints
-                checkpoints_ref = (
-                    db.collection(FirestoreCollections.EVENT_TRACKING)
-                    .document(event_id)
-                    .collection(FirestoreCollections.EVENT_TRACKING_COMPETITOR_TRACKING)
-                    .document(tracking_id)
-                    .collection(FirestoreCollections.EVENT_TRACKING_COMPETITOR)
-                    .document(competitor_id)
-                    .collection(FirestoreCollections.EVENT_TRACKING_CHECKPOINTS)
+                # TODOS los checkpoints del competidor: arreglo 'checkpoints' del documento
+                # (sin lecturas extra) o, en estructuras previas, la subcolección checkpoints
+                checkpoints_data = get_competitor_checkpoints(
+                    competitor_doc.reference, competitor_data
                 )
 
-                checkpoints_snapshot = checkpoints_ref.get()
-
                 # Construir lista de checkpoints
                 tracking_checkpoints: List[Dict[str, Any]] = []
 
-                for checkpoint_doc in checkpoints_snapshot:
+                for checkpoint_data in checkpoints_data:
                     try:
-                        checkpoint_data = checkpoint_doc.to_dict()
-                        if checkpoint_data is None:
-                            continue
-
                         # Construir objeto CheckpointsTracking
                         checkpoint_tracking = {
-                            "id": checkpoint_doc.id,
+                            "id": checkpoint_data.get("id", ""),
                             "name": checkpoint_data.get("name", ""),
                             "checkpointType": checkpoint_data.get(
                                 "checkpointType", "pass"
@@ -214,7 +203,7 @@ def all_competitor_tracking(req: https_fn.Request) -> https_fn.Response:
                     except (ValueError, AttributeError, RuntimeError, TypeError) as e:
                         logging.warning(
                             "all_competitor_tracking: Error procesando checkpoint %s del competidor %s: %s",
-                            checkpoint_doc.id,
+                            checkpoint_data.get("id"),
                             competitor_id,
                             e,
                         )
@@ -6,6 +6,11 @@ from typing import Any, Dict
 from firebase_admin import firestore
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
+from utils.competitor_checkpoints_helper import (
+    get_competitor_checkpoint,
+    get_competitor_checkpoints,
+    update_competitor_checkpoints,
+)
 from utils.helper_http import verify_bearer_token
 from utils.helper_http_verb import validate_request
 
@@ -57,6 +62,7 @@ def change_competitor_status(req: https_fn.Request) -> https_fn.Response:
           1. Actualiza el checkpoint específico
           2. Limpia checkpoints superiores si el status anterior era 'out'
           3. Actualiza checkpoints superiores si el nuevo status es 'out'
+          Con el arreglo 'checkpoints' del competidor se aplican en una sola escritura.
     """
     # Validar CORS y método HTTP
     validation_response = validate_request(
@@ -276,11 +282,6 @@ def change_competitor_status(req: https_fn.Request) -> https_fn.Response:
             .document(competitor_id)
         )
 
-        checkpoints_ref = competitor_ref.collection(
-            FirestoreCollections.EVENT_TRACKING_CHECKPOINTS
-        )
-        checkpoint_ref = checkpoints_ref.document(checkpoint_id)
-
         # Verificar que el competidor existe
         competitor_doc = competitor_ref.get()
         if not competitor_doc.exists:
@@ -303,9 +304,13 @@ def change_competitor_status(req: https_fn.Request) -> https_fn.Response:
                 },
             )
 
-        # Verificar que el checkpoint existe
-        checkpoint_doc = checkpoint_ref.get()
-        if not checkpoint_doc.exists:
+        # Verificar que el checkpoint existe (arreglo 'checkpoints' del competidor o,
+        # en estructuras previas, su subcolección checkpoints)
+        competitor_data = competitor_doc.to_dict() or {}
+        checkpoint_data = get_competitor_checkpoint(
+            competitor_ref, competitor_data, checkpoint_id
+        )
+        if checkpoint_data is None:
             logging.warning(
                 "change_competitor_status: Checkpoint no encontrado: %s", checkpoint_id
             )
@@ -326,8 +331,7 @@ def change_competitor_status(req: https_fn.Request) -> https_fn.Response:
             )
 
         # Verificar que el order coincide
-        checkpoint_data = checkpoint_doc.to_dict()
-        checkpoint_order = checkpoint_data.get("order") if checkpoint_data else None
+        checkpoint_order = checkpoint_data.get("order")
         if checkpoint_order is not None and checkpoint_order != order_checkpoint:
             logging.warning(
                 "change_competitor_status: Order no coincide - esperado: %s, recibido: %s",
@@ -372,100 +376,72 @@ def change_competitor_status(req: https_fn.Request) -> https_fn.Response:
         if note is not None:
             update_data["note"] = note
 
-        logging.info(
-            "change_competitor_status: Actualizando checkpoint %s con datos: %s",
-            checkpoint_id,
-            update_data,
-        )
-        checkpoint_ref.update(update_data)
+        updates_by_checkpoint_id: Dict[str, Dict[str, Any]] = {
+            checkpoint_id: update_data
+        }
+
+        # Checkpoints con order superior, necesarios solo para los pasos 2 y 3
+        higher_checkpoint_ids = []
+        if last_status in OUT_STATUSES or status in OUT_STATUSES:
+            for cp_data in get_competitor_checkpoints(competitor_ref, competitor_data):
+                cp_order = cp_data.get("order")
+                if cp_order is not None and cp_order > order_checkpoint:
+                    higher_checkpoint_ids.append(cp_data.get("id"))
 
         # ============================================
         # PASO 2: Limpiar checkpoints superiores (si el status anterior era 'out')
         # ============================================
         if last_status in OUT_STATUSES:
-            try:
-                logging.info(
-                    "change_competitor_status: Limpiando checkpoints superiores (order > %s)",
-                    order_checkpoint,
-                )
-                # Obtener todos los checkpoints
-                all_checkpoints = checkpoints_ref.stream()
-
-                # Filtrar y actualizar checkpoints con order superior
-                checkpoints_cleared = 0
-                for cp_doc in all_checkpoints:
-                    cp_data = cp_doc.to_dict()
-                    if cp_data is None:
-                        continue
-
-                    cp_order = cp_data.get("order")
-                    if cp_order is not None and cp_order > order_checkpoint:
-                        clear_data = {
-                            "statusCompetitor": "none",
-                            "checkpointDisable": None,
-                            "checkpointDisableName": None,
-                            "updatedAt": now,
-                        }
-                        checkpoints_ref.document(cp_doc.id).update(clear_data)
-                        checkpoints_cleared += 1
-
-                logging.info(
-                    "change_competitor_status: %d checkpoints superiores limpiados",
-                    checkpoints_cleared,
-                )
-            except Exception as e:
-                # Log error pero continuar (el checkpoint específico ya se actualizó)
-                logging.error(
-                    "change_competitor_status: Error limpiando checkpoints superiores: %s",
-                    e,
-                    exc_info=True,
-                )
+            logging.info(
+                "change_competitor_status: Limpiando checkpoints superiores (order > %s)",
+                order_checkpoint,
+            )
+            for cp_id in higher_checkpoint_ids:
+                updates_by_checkpoint_id[cp_id] = {
+                    "statusCompetitor": "none",
+                    "checkpointDisable": None,
+                    "checkpointDisableName": None,
+                    "updatedAt": now,
+                }
+            logging.info(
+                "change_competitor_status: %d checkpoints superiores limpiados",
+                len(higher_checkpoint_ids),
+            )
 
         # ============================================
         # PASO 3: Actualizar todos los checkpoints superiores (si el nuevo status es 'out')
         # ============================================
         if status in OUT_STATUSES:
-            try:
-                logging.info(
-                    "change_competitor_status: Actualizando checkpoints superiores (order > %s) a status '%s'",
-                    order_checkpoint,
-                    status,
-                )
-                # Obtener todos los checkpoints
-                all_checkpoints = checkpoints_ref.stream()
-
-                # Filtrar y actualizar checkpoints con order superior
-                checkpoints_updated = 0
-                for cp_doc in all_checkpoints:
-                    cp_data = cp_doc.to_dict()
-                    if cp_data is None:
-                        continue
-
-                    cp_order = cp_data.get("order")
-                    if cp_order is not None and cp_order > order_checkpoint:
-                        update_all_data: Dict[str, Any] = {
-                            "statusCompetitor": status,
-                            "checkpointDisable": checkpoint_id,
-                            "checkpointDisableName": checkpoint_name,
-                            "updatedAt": now,
-                        }
-                        if note is not None:
-                            update_all_data["note"] = note
-
-                        checkpoints_ref.document(cp_doc.id).update(update_all_data)
-                        checkpoints_updated += 1
-
-                logging.info(
-                    "change_competitor_status: %d checkpoints superiores actualizados",
-                    checkpoints_updated,
-                )
-            except Exception as e:
-                # Log error pero continuar (el checkpoint específico ya se actualizó)
-                logging.error(
-                    "change_competitor_status: Error actualizando checkpoints superiores: %s",
-                    e,
-                    exc_info=True,
-                )
+            logging.info(
+                "change_competitor_status: Actualizando checkpoints superiores (order > %s) a status '%s'",
+                order_checkpoint,
+                status,
+            )
+            for cp_id in higher_checkpoint_ids:
+                update_all_data: Dict[str, Any] = {
+                    "statusCompetitor": status,
+                    "checkpointDisable": checkpoint_id,
+                    "checkpointDisableName": checkpoint_name,
+                    "updatedAt": now,
+                }
+                if note is not None:
+                    update_all_data["note"] = note
+                updates_by_checkpoint_id[cp_id] = update_all_data
+            logging.info(
+                "change_competitor_status: %d checkpoints superiores actualizados",
+                len(higher_checkpoint_ids),
+            )
+
+        # Los tres pasos se aplican juntos: con el arreglo 'checkpoints' es una sola
+        # escritura transaccional del documento del competidor
+        logging.info(
+            "change_competitor_status: Actualizando checkpoint %s con datos: %s",
+            checkpoint_id,
+            update_data,
+        )
+        update_competitor_checkpoints(
+            db, competitor_ref, competitor_data, updates_by_checkpoint_id
+        )
 
         # Retornar respuesta exitosa
         return https_fn.Response(
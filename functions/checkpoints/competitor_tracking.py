@@ -5,7 +5,9 @@ from typing import Any, Dict, List, Optional
 
 from firebase_admin import firestore
 from firebase_functions import https_fn
+from google.cloud.firestore_v1.base_query import FieldFilter
 from models.firestore_collections import FirestoreCollections
+from utils.competitor_checkpoints_helper import get_competitor_checkpoint
 from utils.helper_http import verify_bearer_token
 from utils.helper_http_verb import validate_request
 from utils.helpers import convert_firestore_value
@@ -103,9 +105,9 @@ def competitor_tracking(req: https_fn.Request) -> https_fn.Response:
             or checkpoint_id.strip() == ""
         ):
             path = req.path
-            logging.warning("competitor_tracking: Path recibido: %s", path)
+            logging.debug("competitor_tracking: Path recibido: %s", path)
             path_parts = [p for p in path.split("/") if p]  # Filtrar strings vacíos
-            logging.warning("competitor_tracking: Path parts: %s", path_parts)
+            logging.debug("competitor_tracking: Path parts: %s", path_parts)
 
             try:
                 # Buscar el patrón /competitor-tracking/{eventId}/{dayOfRaceId}/{checkpointId}
@@ -118,7 +120,7 @@ def competitor_tracking(req: https_fn.Request) -> https_fn.Response:
                             day_of_race_id = path_parts[tracking_index + 2]
                         if not checkpoint_id or checkpoint_id.strip() == "":
                             checkpoint_id = path_parts[tracking_index + 3]
-                        logging.warning(
+                        logging.debug(
                             "competitor_tracking: Parámetros extraídos - eventId: %s, dayOfRaceId: %s, checkpointId: %s",
                             event_id,
                             day_of_race_id,
@@ -161,7 +163,7 @@ def competitor_tracking(req: https_fn.Request) -> https_fn.Response:
 
         # 1. Obtener todos los competidores
         # events_tracking/{eventId}/competitor_tracking/{eventId}_{dayOfRaceId}/competitors
-        logging.warning(
+        logging.debug(
             "competitor_tracking: Obteniendo competidores para eventId=%s, dayOfRaceId=%s, trackingId=%s",
             event_id,
             day_of_race_id,
@@ -205,27 +207,14 @@ def competitor_tracking(req: https_fn.Request) -> https_fn.Response:
 
                 competitor_id = competitor_doc.id
 
-                # Construir ruta al checkpoint específico del competidor
-                # events_tracking/{eventId}/competitor_tracking/{eventId}_{dayOfRaceId}/competitors/{competitorId}/checkpoints/{checkpointId}
-                checkpoint_ref = (
-                    db.collection(FirestoreCollections.EVENT_TRACKING)
-                    .document(event_id)
-                    .collection(FirestoreCollections.EVENT_TRACKING_COMPETITOR_TRACKING)
-                    .document(tracking_id)
-                    .collection(FirestoreCollections.EVENT_TRACKING_COMPETITOR)
-                    .document(competitor_id)
-                    .collection(FirestoreCollections.EVENT_TRACKING_CHECKPOINTS)
-                    .document(checkpoint_id)
+                # Checkpoint específico: del arreglo 'checkpoints' del documento (sin lectura
+                # extra) o, en estructuras previas, de competitors/{competitorId}/checkpoints/{checkpointId}
+                checkpoint_data = get_competitor_checkpoint(
+                    competitor_doc.reference, competitor_data, checkpoint_id
                 )
 
-                checkpoint_doc = checkpoint_ref.get()
-
-                if not checkpoint_doc.exists:
-                    # Si el checkpoint no existe para este competidor, omitirlo
-                    continue
-
-                checkpoint_data = checkpoint_doc.to_dict()
                 if checkpoint_data is None:
+                    # Si el checkpoint no existe para este competidor, omitirlo
                     continue
 
                 # Guardar checkpointType del primer competidor (todos tienen el mismo tipo)
@@ -305,11 +294,12 @@ def competitor_tracking(req: https_fn.Request) -> https_fn.Response:
 
         # 3. Obtener todas las rutas
         # events_tracking/{eventId}/competitor_tracking/{eventId}_{dayOfRaceId}/routes
-        logging.warning(
+        logging.debug(
             "competitor_tracking: Obteniendo rutas para eventId=%s, trackingId=%s",
             event_id,
             tracking_id,
         )
+        # Solo la ruta que contiene el checkpoint (array_contains), sin leer todas las rutas
         routes_ref = (
             db.collection(FirestoreCollections.EVENT_TRACKING)
             .document(event_id)
@@ -317,33 +307,24 @@ def competitor_tracking(req: https_fn.Request) -> https_fn.Response:
             .document(tracking_id)
             .collection(FirestoreCollections.EVENT_ROUTES)
         )
-        routes_snapshot = routes_ref.get()
+        routes_snapshot = (
+            routes_ref.where(
+                filter=FieldFilter("checkpointIds", "array_contains", checkpoint_id)
+            )
+            .limit(1)
+            .get()
+        )
 
-        # 4. Buscar ruta que contiene checkpointId
+        # 4. Nombre de la ruta que contiene checkpointId
         route_name: Optional[str] = None
 
-        if routes_snapshot:
-            for route_doc in routes_snapshot:
-                try:
-                    route_data = route_doc.to_dict()
-                    if route_data is None:
-                        continue
-
-                    checkpoint_ids = route_data.get("checkpointIds")
-                    if checkpoint_ids and isinstance(checkpoint_ids, list):
-                        if checkpoint_id in checkpoint_ids:
-                            route_name = route_data.get("name")
-                            logging.warning(
-                                "competitor_tracking: Ruta encontrada: %s", route_name
-                            )
-                            break
-                except (ValueError, AttributeError, RuntimeError, TypeError) as e:
-                    logging.warning(
-                        "competitor_tracking: Error procesando ruta %s: %s",
-                        route_doc.id,
-                        e,
-                    )
-                    continue
+        for route_doc in routes_snapshot or []:
+            route_data = route_doc.to_dict()
+            if route_data is None:
+                continue
+            route_name = route_data.get("name")
+            logging.debug("competitor_tracking: Ruta encontrada: %s", route_name)
+            break
 
         # 5. Filtrar competidores visibles usando isCompetitorVisible
         if checkpoint_type is None:
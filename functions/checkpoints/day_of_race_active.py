@@ -93,9 +93,9 @@ def day_of_race_active(req: https_fn.Request) -> https_fn.Response:
         # Filtrar documentos donde isActivate sea true
         # Obtener el primer documento que cumpla la condición
         query = day_of_races_ref.where("isActivate", "==", True).limit(1)
-        query_snapshot = query.get()
+        day_of_race_doc = next(query.stream(), None)
 
-        if not query_snapshot or len(query_snapshot) == 0:
+        if day_of_race_doc is None:
             logging.info(
                 "day_of_race_active: No se encontró día de carrera activo para evento %s",
                 event_id,
@@ -106,8 +106,6 @@ def day_of_race_active(req: https_fn.Request) -> https_fn.Response:
                 headers={"Access-Control-Allow-Origin": "*"},
             )
 
-        # Obtener el primer documento del resultado
-        day_of_race_doc = query_snapshot[0]
         day_of_race_data = day_of_race_doc.to_dict()
 
         if day_of_race_data is None:
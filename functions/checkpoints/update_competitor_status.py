@@ -6,6 +6,10 @@ from typing import Any, Dict, Optional
 from firebase_admin import firestore
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
+from utils.competitor_checkpoints_helper import (
+    get_competitor_checkpoint,
+    update_competitor_checkpoints,
+)
 from utils.helper_http import verify_bearer_token
 from utils.helper_http_verb import validate_request
 from utils.helpers import convert_firestore_value
@@ -40,9 +44,10 @@ def update_competitor_status(req: https_fn.Request) -> https_fn.Response:
     - 404: Not Found - competidor o checkpoint no encontrado
     - 500: Internal Server Error
 
-    Nota: Actualiza el documento en:
+    Nota: Actualiza el checkpoint dentro del arreglo 'checkpoints' de
           events_tracking/{eventId}/competitor_tracking/{eventId}_{dayOfRaceId}/
-          competitors/{competitorId}/checkpoints/{checkpointId}
+          competitors/{competitorId} (o el documento checkpoints/{checkpointId} de la
+          subcolección en estructuras previas).
     """
     # Validar CORS y método HTTP
     validation_response = validate_request(
@@ -265,18 +270,28 @@ def update_competitor_status(req: https_fn.Request) -> https_fn.Response:
         # Inicializar Firestore
         db = firestore.client()
         tracking_id = f"{event_id}_{day_of_race_id}"
-        # Construir ruta del documento del checkpoint
-        checkpoint_path = (
+        # Construir ruta del documento del competidor (los checkpoints van en su arreglo
+        # 'checkpoints' o, en estructuras previas, en su subcolección checkpoints)
+        competitor_path = (
             f"{FirestoreCollections.EVENT_TRACKING}/{event_id}/"
             f"{FirestoreCollections.EVENT_TRACKING_COMPETITOR_TRACKING}/{tracking_id}/"
-            f"{FirestoreCollections.EVENT_TRACKING_COMPETITOR}/{competitor_id}/"
-            f"{FirestoreCollections.EVENT_TRACKING_CHECKPOINTS}/{checkpoint_id}"
+            f"{FirestoreCollections.EVENT_TRACKING_COMPETITOR}/{competitor_id}"
+        )
+        checkpoint_path = (
+            f"{competitor_path}/{FirestoreCollections.EVENT_TRACKING_CHECKPOINTS}/"
+            f"{checkpoint_id}"
         )
-        checkpoint_ref = db.document(checkpoint_path)
+        competitor_ref = db.document(competitor_path)
 
         # Verificar que el checkpoint exista
-        checkpoint_doc = checkpoint_ref.get()
-        if not checkpoint_doc.exists:
+        competitor_doc = competitor_ref.get()
+        competitor_data = competitor_doc.to_dict() if competitor_doc.exists else None
+        checkpoint_data = (
+            get_competitor_checkpoint(competitor_ref, competitor_data, checkpoint_id)
+            if competitor_data is not None
+            else None
+        )
+        if checkpoint_data is None:
             logging.warning(
                 "update_competitor_status: Checkpoint no encontrado: %s",
                 checkpoint_path,
@@ -298,8 +313,7 @@ def update_competitor_status(req: https_fn.Request) -> https_fn.Response:
             )
 
         # Obtener nombre del checkpoint si no se proporciona checkpointDisableName
-        checkpoint_data = checkpoint_doc.to_dict()
-        checkpoint_name = checkpoint_data.get("name", "") if checkpoint_data else ""
+        checkpoint_name = checkpoint_data.get("name", "")
         if not checkpoint_disable_name and status in ["out", "outStart", "outLast"]:
             checkpoint_disable_name = checkpoint_name
 
@@ -329,7 +343,9 @@ def update_competitor_status(req: https_fn.Request) -> https_fn.Response:
             checkpoint_path,
             update_data,
         )
-        checkpoint_ref.update(update_data)
+        update_competitor_checkpoints(
+            db, competitor_ref, competitor_data, {checkpoint_id: update_data}
+        )
 
         # Retornar respuesta exitosa
         response_data = {
@@ -64,20 +64,15 @@ def _normalize_pilot_for_display(pilot: Any) -> Any:
     return pilot
 
 
-def _get_participant_doc(
-    db: firestore.Client, event_id: str, user_id: str
-):
-    participant_ref = (
-        db.collection(FirestoreCollections.EVENTS)
-        .document(event_id)
-        .collection(FirestoreCollections.EVENT_PARTICIPANTS)
-        .document(user_id)
-    )
+def _get_participant_doc(event_ref: firestore.DocumentReference, user_id: str):
+    participant_ref = event_ref.collection(
+        FirestoreCollections.EVENT_PARTICIPANTS
+    ).document(user_id)
     return participant_ref.get()
 
 
 def _resolve_participant_event_category(
-    db: firestore.Client, event_id: str, category_doc_id: str
+    event_ref: firestore.DocumentReference, category_doc_id: str
 ) -> Tuple[Optional[str], str]:
     """
     Valida que exista `events/{eventId}/event_categories/{category_doc_id}`.
@@ -88,13 +83,7 @@ def _resolve_participant_event_category(
     cid = (category_doc_id or "").strip()
     if not cid:
         return None, ""
-    ref = (
-        db.collection(FirestoreCollections.EVENTS)
-        .document(event_id)
-        .collection(FirestoreCollections.EVENT_CATEGORIES)
-        .document(cid)
-    )
-    snap = ref.get()
+    snap = event_ref.collection(FirestoreCollections.EVENT_CATEGORIES).document(cid).get()
     if not snap.exists:
         return None, ""
     data = snap.to_dict() or {}
@@ -212,15 +201,10 @@ def _is_debug_request(req: https_fn.Request) -> bool:
     return raw in ("1", "true", "yes", "on")
 
 
-def _event_has_checklist(db: firestore.Client, event_id: str) -> bool:
+def _event_has_checklist(event_ref: firestore.DocumentReference) -> bool:
     """True si existe al menos un documento en events/{eventId}/checklists."""
-    checklists_query = (
-        db.collection(FirestoreCollections.EVENTS)
-        .document(event_id)
-        .collection(FirestoreCollections.EVENT_CHECKLISTS)
-        .limit(1)
-    )
-    return len(checklists_query.get()) > 0
+    checklists_query = event_ref.collection(FirestoreCollections.EVENT_CHECKLISTS).limit(1)
+    return next(checklists_query.stream(), None) is not None
 
 
 def _not_found(req: https_fn.Request, error: str) -> https_fn.Response:
@@ -294,18 +278,19 @@ def competitor_route(req: https_fn.Request) -> https_fn.Response:
             return _not_found(req, "membership_not_found")
 
         result: List[Dict[str, Any]] = []
+        events_col = db.collection(FirestoreCollections.EVENTS)
 
         for mdoc in membership_docs:
             event_id = mdoc.id
-            event_doc = (
-                db.collection(FirestoreCollections.EVENTS).document(event_id).get()
-            )
+            # Referencia al evento construida una vez y reutilizada por las subcolecciones
+            event_ref = events_col.document(event_id)
+            event_doc = event_ref.get()
             if not event_doc.exists:
                 continue
 
             event_name = (event_doc.to_dict() or {}).get("name", "")
 
-            participant_doc = _get_participant_doc(db, event_id, user_id_param)
+            participant_doc = _get_participant_doc(event_ref, user_id_param)
             if not participant_doc.exists:
                 continue
 
@@ -315,14 +300,10 @@ def competitor_route(req: https_fn.Request) -> https_fn.Response:
                 participant_data
             )
             category_id, category_display_name = _resolve_participant_event_category(
-                db, event_id, registration_category_id
+                event_ref, registration_category_id
             )
 
-            routes_col = (
-                db.collection(FirestoreCollections.EVENTS)
-                .document(event_id)
-                .collection(FirestoreCollections.EVENT_ROUTES)
-            )
+            routes_col = event_ref.collection(FirestoreCollections.EVENT_ROUTES)
             visible_query = routes_col.where(
                 filter=FieldFilter("visibleForPilots", "==", True)
             )
@@ -335,7 +316,7 @@ def competitor_route(req: https_fn.Request) -> https_fn.Response:
                     if category_id in (rdata.get("categoryIds") or []):
                         matching_routes.append(rd)
 
-            has_checklist = _event_has_checklist(db, event_id)
+            has_checklist = _event_has_checklist(event_ref)
 
             if not matching_routes:
                 result.append(
@@ -2,6 +2,10 @@ from datetime import datetime
 from typing import Optional
 from models.event_document import EventStatus
 
+# Campos del documento events/{eventId} que lee from_firestore_data. Las consultas que solo
+# construyen EventShortDocument los usan como proyección (select) para no transferir el resto.
+EVENT_SHORT_SOURCE_FIELDS = ("name", "location", "subtitle", "status", "imageUrl", "date", "createdAt")
+
 
 class EventShortDocument:
     """Modelo para eventos cortos (versión simplificada de EventDocument)"""
@@ -9,7 +9,10 @@ from models.paginated_response import PaginatedResponse
 from utils.firestore_helper import FirestoreHelper
 from utils.helper_http_verb import validate_request
 
-from .event_short_document import EventShortDocument
+from .event_short_document import EVENT_SHORT_SOURCE_FIELDS, EventShortDocument
+
+# Campos de event_content que usa la respuesta corta
+_EVENT_CONTENT_FIELDS = ("photoMain", "address", "descriptionShort")
 
 
 @https_fn.on_request()
@@ -74,7 +77,7 @@ def events(req: https_fn.Request) -> https_fn.Response:
             )
         except Exception as e:
             # Si falla por falta de índice, usar sin ordenamiento
-            logging.warning(f"events: Error con order_by, usando sin orden: {str(e)}")
+            logging.warning("events: Error con order_by, usando sin orden: %s", e)
             query = events_ref
 
         # Si se proporciona lastDocId, usar cursor-based pagination (más eficiente)
@@ -85,7 +88,7 @@ def events(req: https_fn.Request) -> https_fn.Response:
                 if last_doc.exists:
                     query = query.start_after(last_doc)
             except Exception as e:
-                logging.warning(f"events: Error con lastDocId {last_doc_id}: {str(e)}")
+                logging.warning("events: Error con lastDocId %s: %s", last_doc_id, e)
         # Si no hay lastDocId pero hay page > 1, usar offset (menos eficiente)
         # Nota: Para mejor rendimiento, se recomienda usar lastDocId
         elif page > 1:
@@ -94,7 +97,8 @@ def events(req: https_fn.Request) -> https_fn.Response:
             # Obtener documentos hasta el offset para usar como cursor
             # Esto es menos eficiente pero funcional
             try:
-                offset_docs = query.limit(offset).get()
+                # Solo se necesita createdAt (campo de orden) para usarlos como cursor
+                offset_docs = query.limit(offset).select(["createdAt"]).get()
                 if len(offset_docs) > 0:
                     query = query.start_after(offset_docs[-1])
                 else:
@@ -114,11 +118,14 @@ def events(req: https_fn.Request) -> https_fn.Response:
                     )
             except Exception as e:
                 logging.warning(
-                    f"events: Error calculando offset para página {page}: {str(e)}"
+                    "events: Error calculando offset para página %s: %s",
+                    page,
+                    e,
                 )
 
-        # Aplicar límite (agregar 1 para verificar si hay más páginas)
-        query = query.limit(limit + 1)
+        # Aplicar límite (agregar 1 para verificar si hay más páginas) y proyectar solo los
+        # campos que usa EventShortDocument
+        query = query.limit(limit + 1).select(EVENT_SHORT_SOURCE_FIELDS)
 
         # Ejecutar query
         events_docs = query.get()
@@ -150,17 +157,19 @@ def events(req: https_fn.Request) -> https_fn.Response:
 
         def _fetch_content(event_id):
             try:
-                snaps = (
+                content_doc = next(
                     db.collection(FirestoreCollections.EVENTS)
                     .document(event_id)
                     .collection(FirestoreCollections.EVENT_CONTENT)
+                    .select(_EVENT_CONTENT_FIELDS)
                     .limit(1)
-                    .get()
+                    .stream(),
+                    None,
                 )
-                if snaps:
-                    return event_id, snaps[0].to_dict() or {}
+                if content_doc is not None:
+                    return event_id, content_doc.to_dict() or {}
             except Exception as e:
-                logging.warning(f"events: event_content error {event_id}: {e}")
+                logging.warning("events: event_content error %s: %s", event_id, e)
             return event_id, None
 
         with ThreadPoolExecutor(max_workers=min(len(events_docs), 10)) as executor:
@@ -207,7 +216,7 @@ def events(req: https_fn.Request) -> https_fn.Response:
                 events_data.append(event_dict)
                 last_document_id = doc.id
             except Exception as e:
-                logging.warning(f"events: Error procesando evento {doc.id}: {str(e)}")
+                logging.warning("events: Error procesando evento %s: %s", doc.id, e)
                 continue
 
         # Crear respuesta paginada usando el modelo genérico
@@ -233,7 +242,7 @@ def events(req: https_fn.Request) -> https_fn.Response:
         )
 
     except ValueError as e:
-        logging.error(f"events: Error de validación: {str(e)}")
+        logging.error("events: Error de validación: %s", e)
         error_response = {
             "error": {
                 "code": "invalid-argument",
@@ -246,7 +255,7 @@ def events(req: https_fn.Request) -> https_fn.Response:
             headers={"Content-Type": "application/json"},
         )
     except Exception as e:
-        logging.error(f"events: Error interno: {str(e)}", exc_info=True)
+        logging.error("events: Error interno: %s", e, exc_info=True)
         error_response = {
             "error": {
                 "code": "internal",
@@ -131,12 +131,13 @@ def event_detail(req: https_fn.Request) -> https_fn.Response:
 
         # Obtener todos los documentos de la subcolección event_content
         # Normalmente hay un solo documento, pero manejamos el caso de múltiples
-        event_content_docs = event_content_ref.limit(1).get()
+        event_content_doc = next(event_content_ref.limit(1).stream(), None)
 
         # Si no hay documentos, retornar 404
-        if not event_content_docs or len(event_content_docs) == 0:
+        if event_content_doc is None:
             logging.info(
-                f"event_detail: Evento {event_id} no encontrado en event_content"
+                "event_detail: Evento %s no encontrado en event_content",
+                event_id,
             )
             return https_fn.Response(
                 "",
@@ -144,12 +145,10 @@ def event_detail(req: https_fn.Request) -> https_fn.Response:
                 headers={"Access-Control-Allow-Origin": "*"},
             )
 
-        # Obtener el primer documento (normalmente solo hay uno)
-        event_content_doc = event_content_docs[0]
         event_data = event_content_doc.to_dict()
 
         if event_data is None:
-            logging.warning(f"event_detail: Datos vacíos para evento {event_id}")
+            logging.warning("event_detail: Datos vacíos para evento %s", event_id)
             return https_fn.Response(
                 "",
                 status=404,
@@ -299,14 +298,14 @@ def event_detail(req: https_fn.Request) -> https_fn.Response:
         )
 
     except ValueError as e:
-        logging.error(f"event_detail: Error de validación: {str(e)}")
+        logging.error("event_detail: Error de validación: %s", e)
         return https_fn.Response(
             "",
             status=400,
             headers={"Access-Control-Allow-Origin": "*"},
         )
     except Exception as e:
-        logging.error(f"event_detail: Error interno: {str(e)}", exc_info=True)
+        logging.error("event_detail: Error interno: %s", e, exc_info=True)
         return https_fn.Response(
             "",
             status=500,
@@ -55,7 +55,21 @@ from firebase_functions.options import set_global_options
 # Importar funciones de tracking
 from tracking import tracking_route
 from tracking.tracking_checkpoint import track_event_checkpoint
-from tracking.tracking_competitors import track_competitors, track_competitors_off
+from tracking.tracking_competitors import (
+    build_competitors_tracking,
+    track_competitors,
+    track_competitors_off,
+)
+from tracking.track_competitor_position_shards import (
+    track_competitor_position_0,
+    track_competitor_position_1,
+    track_competitor_position_2,
+    track_competitor_position_3,
+    track_competitor_position_4,
+    track_competitor_position_5,
+    track_competitor_position_6,
+    track_competitor_position_7,
+)
 
 # Importar funciones de users (una sola función: user_route; despacha por path a read/create/update)
 from users import user_route
@@ -88,6 +102,7 @@ initialize_app(options=_options if _options else None)
 # - track_event_checkpoint: tracking/tracking_checkpoint.py
 # - track_competitors: tracking/tracking_competitors.py
 # - track_competitors_off: tracking/tracking_competitors.py
+# - build_competitors_tracking: tracking/tracking_competitors.py (trigger Firestore del documento principal de tracking)
 # - events: events/events_customer.py
 # - event_detail: events/events_detail_customer.py
 # - event_categories: events/event_categories.py
@@ -104,6 +119,7 @@ initialize_app(options=_options if _options else None)
 # - update_competitor_status: checkpoints/update_competitor_status.py
 # - competitor_route: competitors/competitor_route.py
 # - track_competitor_position: tracking/track_competitor_position.py
+# - track_competitor_position_0..7: tracking/track_competitor_position_shards.py (/api/tracking/competitor-position/{shard})
 # - vehicle_route: vehicles/vehicle_route.py (router: /api/vehicles, /api/vehicles/search, /api/vehicles/{id})
 # - catalog_route: catalogs/catalog_route.py (router: /api/catalogs/vehicle, year, color, relationship-type)
 # - create_competitor: competitors/create_competitor.py
@@ -39,11 +39,12 @@ def _subcollection_path(event_id: str, route_id: str, subcollection: str) -> str
     )
 
 
-def _serialize_route(route_id: str, route_data: Dict[str, Any], event_id: str) -> Dict[str, Any]:
+def _serialize_route(
+    helper: FirestoreHelper, route_id: str, route_data: Dict[str, Any], event_id: str
+) -> Dict[str, Any]:
     """Convierte datos de ruta a dict de respuesta, incluyendo sus checkpoints y trackPoints."""
     result = dict(route_data)
     result["id"] = route_id
-    helper = FirestoreHelper()
     checkpoint_docs = helper.query_documents(
         _subcollection_path(event_id, route_id, FirestoreCollections.EVENT_CHECKPOINTS)
     )
@@ -112,7 +113,7 @@ def handle_get(req: https_fn.Request, user_id: str) -> https_fn.Response:
             LOG.warning("%s Ruta no encontrada routeId=%s", LOG_PREFIX, route_id)
             return https_fn.Response("", status=404, headers=_CORS_HEADERS)
 
-        result = _serialize_route(route_id, route_data, event_id)
+        result = _serialize_route(helper, route_id, route_data, event_id)
         return https_fn.Response(
             json.dumps(result, ensure_ascii=False),
             status=200,
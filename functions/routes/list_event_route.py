@@ -50,11 +50,12 @@ def _strip_timestamps(data: Dict[str, Any]) -> Dict[str, Any]:
     return {k: v for k, v in data.items() if k not in _TIMESTAMP_FIELDS}
 
 
-def _serialize_route(route_id: str, route_data: Dict[str, Any], event_id: str) -> Dict[str, Any]:
+def _serialize_route(
+    helper: FirestoreHelper, route_id: str, route_data: Dict[str, Any], event_id: str
+) -> Dict[str, Any]:
     """Convierte datos de ruta a dict de respuesta, incluyendo checkpoints y trackPoints."""
     result = _strip_timestamps(route_data)
     result["id"] = route_id
-    helper = FirestoreHelper()
     checkpoint_docs = helper.query_documents(
         _subcollection_path(event_id, route_id, FirestoreCollections.EVENT_CHECKPOINTS)
     )
@@ -114,7 +115,7 @@ def handle_list(req: https_fn.Request, user_id: str) -> https_fn.Response:
     try:
         helper = FirestoreHelper()
         route_docs = helper.query_documents(_routes_path(event_id))
-        routes = [_serialize_route(route_id, route_data, event_id) for route_id, route_data in route_docs]
+        routes = [_serialize_route(helper, route_id, route_data, event_id) for route_id, route_data in route_docs]
 
         return https_fn.Response(
             json.dumps(routes, ensure_ascii=False),
@@ -0,0 +1,129 @@
+"""
+Pruebas unitarias para utils/competitor_checkpoints_helper.py.
+
+Cubre el arreglo 'checkpoints' inline (schemaVersion 2) y la subcolección de estructuras previas.
+"""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+# Asegurar que functions esté en el path
+sys.path.insert(0, ".")
+
+_INLINE = {
+    "name": "Piloto",
+    "checkpoints": [
+        {"id": "cp1", "order": 1, "statusCompetitor": "none"},
+        {"id": "cp2", "order": 2, "statusCompetitor": "none"},
+    ],
+}
+
+
+def _make_doc(doc_id, data, exists=True):
+    doc = MagicMock()
+    doc.id = doc_id
+    doc.exists = exists
+    doc.to_dict.return_value = data
+    return doc
+
+
+def test_inline_checkpoints_are_read_without_queries():
+    """Con arreglo inline no se consulta la subcolección."""
+    from utils.competitor_checkpoints_helper import (
+        get_competitor_checkpoint,
+        get_competitor_checkpoints,
+        has_inline_checkpoints,
+    )
+
+    competitor_ref = MagicMock()
+
+    assert has_inline_checkpoints(_INLINE) is True
+    assert get_competitor_checkpoints(competitor_ref, _INLINE) == _INLINE["checkpoints"]
+    assert get_competitor_checkpoint(competitor_ref, _INLINE, "cp2")["order"] == 2
+    assert get_competitor_checkpoint(competitor_ref, _INLINE, "cpX") is None
+    competitor_ref.collection.assert_not_called()
+
+
+def test_legacy_checkpoints_are_read_from_subcollection():
+    """Sin arreglo se lee competitors/{id}/checkpoints y se agrega 'id' a cada dict."""
+    from utils.competitor_checkpoints_helper import (
+        get_competitor_checkpoint,
+        get_competitor_checkpoints,
+        has_inline_checkpoints,
+    )
+
+    competitor_ref = MagicMock()
+    checkpoints_ref = competitor_ref.collection.return_value
+    checkpoints_ref.stream.return_value = iter(
+        [_make_doc("cp1", {"order": 1}), _make_doc("cpNone", None)]
+    )
+    checkpoints_ref.document.return_value.get.return_value = _make_doc(
+        "cp1", {"order": 1}
+    )
+
+    assert has_inline_checkpoints({"name": "Piloto"}) is False
+    assert get_competitor_checkpoints(competitor_ref, {}) == [{"order": 1, "id": "cp1"}]
+    assert get_competitor_checkpoint(competitor_ref, {}, "cp1") == {"order": 1}
+    competitor_ref.collection.assert_called_with("checkpoints")
+
+
+def test_update_inline_checkpoints_in_single_transactional_write():
+    """Con arreglo inline se reescribe el arreglo completo en una transacción."""
+    from utils.competitor_checkpoints_helper import update_competitor_checkpoints
+
+    db = MagicMock()
+    transaction = db.transaction.return_value
+    competitor_ref = MagicMock()
+    competitor_ref.get.return_value = _make_doc("p1", _INLINE)
+
+    with patch(
+        "utils.competitor_checkpoints_helper.firestore.transactional",
+        side_effect=lambda fn: fn,
+    ):
+        update_competitor_checkpoints(
+            db, competitor_ref, _INLINE, {"cp2": {"statusCompetitor": "check"}}
+        )
+
+    competitor_ref.get.assert_called_once_with(transaction=transaction)
+    transaction.update.assert_called_once()
+    ref, data = transaction.update.call_args[0]
+    assert ref is competitor_ref
+    assert data["checkpoints"] == [
+        {"id": "cp1", "order": 1, "statusCompetitor": "none"},
+        {"id": "cp2", "order": 2, "statusCompetitor": "check"},
+    ]
+    # El dict original no se modifica
+    assert _INLINE["checkpoints"][1]["statusCompetitor"] == "none"
+
+
+def test_update_legacy_checkpoints_updates_each_document():
+    """Sin arreglo se actualiza cada documento de la subcolección."""
+    from utils.competitor_checkpoints_helper import update_competitor_checkpoints
+
+    db = MagicMock()
+    competitor_ref = MagicMock()
+    checkpoints_ref = competitor_ref.collection.return_value
+
+    update_competitor_checkpoints(
+        db,
+        competitor_ref,
+        {},
+        {"cp1": {"statusCompetitor": "check"}, "cp2": {"statusCompetitor": "out"}},
+    )
+
+    checkpoints_ref.document.assert_any_call("cp1")
+    checkpoints_ref.document.assert_any_call("cp2")
+    assert checkpoints_ref.document.return_value.update.call_count == 2
+    db.transaction.assert_not_called()
+
+
+def test_update_without_changes_does_nothing():
+    from utils.competitor_checkpoints_helper import update_competitor_checkpoints
+
+    db = MagicMock()
+    competitor_ref = MagicMock()
+
+    update_competitor_checkpoints(db, competitor_ref, _INLINE, {})
+
+    db.transaction.assert_not_called()
+    competitor_ref.collection.assert_not_called()
@@ -169,9 +169,9 @@ def _build_firestore_mock(
         checklists_col = MagicMock()
         checklists_limited = MagicMock()
         if has_checklists_by_event.get(eid, False):
-            checklists_limited.get.return_value = [MagicMock()]
+            checklists_limited.stream.side_effect = lambda: iter([MagicMock()])
         else:
-            checklists_limited.get.return_value = []
+            checklists_limited.stream.side_effect = lambda: iter([])
         checklists_col.limit.return_value = checklists_limited
 
         def ev_sub(name):
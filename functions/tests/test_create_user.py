@@ -44,6 +44,8 @@ def test_create_user_happy_path_new_user(mock_helper_cls):
     assert data == {"id": "newUserId1"}
     mock_helper_cls.return_value.create_document.assert_called_once()
     created_doc = mock_helper_cls.return_value.create_document.call_args[0][1]
+    # Mismo esquema que competitors/staff: ID autogenerado, nunca users/{authUserId}
+    mock_helper_cls.return_value.create_document_with_id.assert_not_called()
     assert created_doc["email"] == "test@example.com"
     assert created_doc["username"] == "test@example.com"
     assert created_doc["authUserId"] == "firebase_uid_123"
@@ -70,6 +72,7 @@ def test_create_user_happy_path_existing_user(mock_helper_cls):
     update_fields = helper.update_document.call_args[0][2]
     assert update_fields["authUserId"] == "firebase_uid_123"
     assert update_fields["isActive"] is True
+    helper.create_document_with_id.assert_not_called()
     helper.create_document.assert_not_called()
 
 
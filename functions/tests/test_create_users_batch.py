@@ -0,0 +1,169 @@
+"""
+Pruebas unitarias para create_batch.handle (alta masiva en Auth + users).
+La validación CORS y token la hace user_route; aquí solo se prueba la lógica de negocio.
+"""
+
+import json
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, ".")
+
+_PATCH_HELPER = "users.create_batch.FirestoreHelper"
+_PATCH_CREATE_AUTH = "users.create_batch.create_firebase_auth_user"
+_PATCH_DELETE_AUTH = "users.create_batch.delete_firebase_auth_user"
+_PATCH_CLAIMS = "users.create_batch.get_bearer_claims"
+
+
+@pytest.fixture(autouse=True)
+def _admin_claims():
+    """Por defecto el token trae admin=true; las pruebas de acceso lo sobreescriben."""
+    with patch(_PATCH_CLAIMS, return_value={"uid": "admin-uid", "admin": True}) as mock_claims:
+        yield mock_claims
+
+
+def _wire_doc_ids(helper):
+    """new_document_id devuelve doc-1, doc-2, ... en orden de alta."""
+    counter = iter(range(1, 1000))
+    helper.new_document_id.side_effect = lambda collection_path: f"doc-{next(counter)}"
+
+
+def _make_request(body):
+    req = MagicMock()
+    req.method = "POST"
+    req.get_json.side_effect = lambda silent=True: body
+    return req
+
+
+def _user(email, password="Password1"):
+    return {"email": email, "password": password}
+
+
+@patch(_PATCH_DELETE_AUTH)
+@patch(_PATCH_CREATE_AUTH)
+@patch(_PATCH_HELPER)
+def test_create_batch_creates_auth_users_and_documents(mock_helper_cls, mock_create, mock_delete):
+    helper = mock_helper_cls.return_value
+    helper.bulk_set.return_value = []
+    _wire_doc_ids(helper)
+    mock_create.side_effect = lambda email, password: f"uid-{email.split('@')[0]}"
+
+    from users.create_batch import handle
+
+    response = handle(_make_request({"users": [_user("a@example.com"), _user("b@example.com")]}))
+
+    assert response.status_code == 200
+    data = json.loads(response.get_data(as_text=True))
+    assert data["failed"] == []
+    assert sorted(data["created"], key=lambda u: u["id"]) == [
+        {"email": "a@example.com", "id": "doc-1"},
+        {"email": "b@example.com", "id": "doc-2"},
+    ]
+    helper.bulk_set.assert_called_once()
+    collection_path, docs = helper.bulk_set.call_args[0]
+    assert collection_path == "users"
+    # ID autogenerado (como users/create), no users/{authUserId}
+    assert docs["doc-1"]["authUserId"] == "uid-a"
+    assert docs["doc-1"]["email"] == "a@example.com"
+    mock_delete.assert_not_called()
+
+
+@patch(_PATCH_DELETE_AUTH)
+@patch(_PATCH_CREATE_AUTH)
+@patch(_PATCH_HELPER)
+def test_create_batch_reports_auth_failures_without_writing(mock_helper_cls, mock_create, mock_delete):
+    helper = mock_helper_cls.return_value
+    helper.bulk_set.return_value = []
+    _wire_doc_ids(helper)
+
+    def create(email, password):
+        if email.startswith("dup"):
+            raise ValueError("EMAIL_EXISTS")
+        return "uid-ok"
+
+    mock_create.side_effect = create
+
+    from users.create_batch import handle
+
+    response = handle(_make_request({"users": [_user("ok@example.com"), _user("dup@example.com")]}))
+
+    data = json.loads(response.get_data(as_text=True))
+    assert data["created"] == [{"email": "ok@example.com", "id": "doc-1"}]
+    assert data["failed"] == [{"email": "dup@example.com", "error": "EMAIL_EXISTS"}]
+    assert list(helper.bulk_set.call_args[0][1]) == ["doc-1"]
+    mock_delete.assert_not_called()
+
+
+@patch(_PATCH_DELETE_AUTH)
+@patch(_PATCH_CREATE_AUTH)
+@patch(_PATCH_HELPER)
+def test_create_batch_rolls_back_auth_for_failed_documents(mock_helper_cls, mock_create, mock_delete):
+    helper = mock_helper_cls.return_value
+    helper.bulk_set.return_value = ["doc-2"]
+    _wire_doc_ids(helper)
+    mock_create.side_effect = lambda email, password: f"uid-{email.split('@')[0]}"
+
+    from users.create_batch import handle
+
+    response = handle(_make_request({"users": [_user("a@example.com"), _user("b@example.com")]}))
+
+    data = json.loads(response.get_data(as_text=True))
+    assert data["created"] == [{"email": "a@example.com", "id": "doc-1"}]
+    assert [f["email"] for f in data["failed"]] == ["b@example.com"]
+    mock_delete.assert_called_once_with("uid-b")
+
+
+@patch(_PATCH_DELETE_AUTH)
+@patch(_PATCH_CREATE_AUTH)
+@patch(_PATCH_HELPER)
+def test_create_batch_bulk_writer_error_rolls_back_all(mock_helper_cls, mock_create, mock_delete):
+    mock_helper_cls.return_value.bulk_set.side_effect = RuntimeError("Firestore down")
+    _wire_doc_ids(mock_helper_cls.return_value)
+    mock_create.side_effect = lambda email, password: f"uid-{email.split('@')[0]}"
+
+    from users.create_batch import handle
+
+    response = handle(_make_request({"users": [_user("a@example.com"), _user("b@example.com")]}))
+
+    data = json.loads(response.get_data(as_text=True))
+    assert data["created"] == []
+    assert sorted(call.args[0] for call in mock_delete.call_args_list) == ["uid-a", "uid-b"]
+
+
+def test_create_batch_invalid_bodies_return_400():
+    from users.create_batch import MAX_USERS_PER_BATCH, handle
+
+    invalid_bodies = [
+        None,
+        {},
+        {"users": []},
+        {"users": ["not-a-dict"]},
+        {"users": [_user("invalid-email")]},
+        {"users": [_user("a@example.com", password="short")]},
+        {"users": [_user("a@example.com"), _user("A@example.com")]},
+        {"users": [_user(f"u{i}@example.com") for i in range(MAX_USERS_PER_BATCH + 1)]},
+    ]
+    with patch(_PATCH_CREATE_AUTH) as mock_create:
+        for body in invalid_bodies:
+            response = handle(_make_request(body))
+            assert response.status_code == 400, body
+        mock_create.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [None, {"uid": "u1"}, {"uid": "u1", "admin": False}, {"uid": "u1", "admin": "true"}],
+)
+def test_create_batch_requires_admin_claim(_admin_claims, claims):
+    """Sin claim admin=true -> 403 sin crear cuentas."""
+    _admin_claims.return_value = claims
+
+    from users.create_batch import handle
+
+    with patch(_PATCH_CREATE_AUTH) as mock_create:
+        response = handle(_make_request({"users": [_user("a@example.com")]}))
+
+    assert response.status_code == 403
+    mock_create.assert_not_called()
@@ -32,26 +32,36 @@ def _make_request(
     return req
 
 
-@patch("vehicles.delete.firestore")
-def test_delete_vehicle_happy_path(mock_firestore_module):
-    """Happy path: DELETE con parametros validos y vehiculo existente -> 204."""
-    user_doc = MagicMock()
-    user_doc.exists = True
-    vehicle_doc = MagicMock()
-    vehicle_doc.exists = True
+def _wire_client(mock_get_db, user_exists: bool = True, vehicle_exists: bool = True):
+    """
+    Cliente mock: users/{userId} y su vehiculo se leen juntos con db.get_all.
+    Retorna (client, user_ref, vehicle_ref).
+    """
     vehicle_ref = MagicMock()
-    vehicle_ref.get.return_value = vehicle_doc
-    vehicle_ref.delete = MagicMock()
-    sub_collection = MagicMock()
-    sub_collection.document.return_value = vehicle_ref
+    vehicle_ref.path = "users/user-1/vehicles/veh-123"
     user_ref = MagicMock()
-    user_ref.get.return_value = user_doc
-    user_ref.collection.return_value = sub_collection
-    users_col = MagicMock()
-    users_col.document.return_value = user_ref
+    user_ref.path = "users/user-1"
+    user_ref.collection.return_value.document.return_value = vehicle_ref
     client = MagicMock()
-    client.collection.return_value = users_col
-    mock_firestore_module.client.return_value = client
+    client.collection.return_value.document.return_value = user_ref
+
+    def _get_all(refs, field_paths=None):
+        exists = {user_ref.path: user_exists, vehicle_ref.path: vehicle_exists}
+        for ref in refs:
+            snap = MagicMock()
+            snap.reference = ref
+            snap.exists = exists[ref.path]
+            yield snap
+
+    client.get_all.side_effect = _get_all
+    mock_get_db.return_value = client
+    return client, user_ref, vehicle_ref
+
+
+@patch("vehicles.delete.get_db")
+def test_delete_vehicle_happy_path(mock_get_db):
+    """Happy path: DELETE con parametros validos y vehiculo existente -> 204."""
+    client, user_ref, vehicle_ref = _wire_client(mock_get_db)
 
     from vehicles.delete import handle
 
@@ -61,6 +71,11 @@ def test_delete_vehicle_happy_path(mock_firestore_module):
     assert response.status_code == 204
     assert response.get_data(as_text=True) == ""
     vehicle_ref.delete.assert_called_once()
+    client.get_all.assert_called_once_with(
+        [user_ref, vehicle_ref], field_paths=["authUserId"]
+    )
+    user_ref.get.assert_not_called()
+    vehicle_ref.get.assert_not_called()
 
 
 def test_delete_vehicle_missing_vehicle_id():
@@ -84,18 +99,10 @@ def test_delete_vehicle_missing_user_id():
     assert response.status_code == 400
 
 
-@patch("vehicles.delete.firestore")
-def test_delete_vehicle_user_not_found(mock_firestore_module):
+@patch("vehicles.delete.get_db")
+def test_delete_vehicle_user_not_found(mock_get_db):
     """Usuario no existe -> 404."""
-    user_doc = MagicMock()
-    user_doc.exists = False
-    user_ref = MagicMock()
-    user_ref.get.return_value = user_doc
-    users_col = MagicMock()
-    users_col.document.return_value = user_ref
-    client = MagicMock()
-    client.collection.return_value = users_col
-    mock_firestore_module.client.return_value = client
+    _, _, vehicle_ref = _wire_client(mock_get_db, user_exists=False, vehicle_exists=False)
 
     from vehicles.delete import handle
 
@@ -103,27 +110,13 @@ def test_delete_vehicle_user_not_found(mock_firestore_module):
     response = handle(req)
 
     assert response.status_code == 404
+    vehicle_ref.delete.assert_not_called()
 
 
-@patch("vehicles.delete.firestore")
-def test_delete_vehicle_not_found(mock_firestore_module):
+@patch("vehicles.delete.get_db")
+def test_delete_vehicle_not_found(mock_get_db):
     """Vehiculo no existe -> 404."""
-    user_doc = MagicMock()
-    user_doc.exists = True
-    vehicle_doc = MagicMock()
-    vehicle_doc.exists = False
-    vehicle_ref = MagicMock()
-    vehicle_ref.get.return_value = vehicle_doc
-    sub_collection = MagicMock()
-    sub_collection.document.return_value = vehicle_ref
-    user_ref = MagicMock()
-    user_ref.get.return_value = user_doc
-    user_ref.collection.return_value = sub_collection
-    users_col = MagicMock()
-    users_col.document.return_value = user_ref
-    client = MagicMock()
-    client.collection.return_value = users_col
-    mock_firestore_module.client.return_value = client
+    _, _, vehicle_ref = _wire_client(mock_get_db, vehicle_exists=False)
 
     from vehicles.delete import handle
 
@@ -134,26 +127,10 @@ def test_delete_vehicle_not_found(mock_firestore_module):
     vehicle_ref.delete.assert_not_called()
 
 
-@patch("vehicles.delete.firestore")
-def test_delete_vehicle_multiple_calls(mock_firestore_module):
+@patch("vehicles.delete.get_db")
+def test_delete_vehicle_multiple_calls(mock_get_db):
     """Dos llamadas seguidas: comportamiento estable."""
-    user_doc = MagicMock()
-    user_doc.exists = True
-    vehicle_doc = MagicMock()
-    vehicle_doc.exists = True
-    vehicle_ref = MagicMock()
-    vehicle_ref.get.return_value = vehicle_doc
-    vehicle_ref.delete = MagicMock()
-    sub_collection = MagicMock()
-    sub_collection.document.return_value = vehicle_ref
-    user_ref = MagicMock()
-    user_ref.get.return_value = user_doc
-    user_ref.collection.return_value = sub_collection
-    users_col = MagicMock()
-    users_col.document.return_value = user_ref
-    client = MagicMock()
-    client.collection.return_value = users_col
-    mock_firestore_module.client.return_value = client
+    _, _, vehicle_ref = _wire_client(mock_get_db)
 
     from vehicles.delete import handle
 
@@ -52,7 +52,7 @@ def test_event_detail_includes_routes_checkpoints_name_type(
         # Campo extra para cubrir el branch "if key not in event_info"
         "foo": "bar",
     }
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     # participants
     participants_ref = MagicMock()
@@ -245,7 +245,7 @@ def test_event_detail_event_content_empty_returns_404(
     from models.firestore_collections import FirestoreCollections
 
     event_content_ref = MagicMock()
-    event_content_ref.limit.return_value.get.return_value = []
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -291,7 +291,7 @@ def test_event_detail_route_without_id_returns_empty_checkpoints(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = {"name": "Evento 1"}
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -356,7 +356,7 @@ def test_event_detail_checkpoint_type_missing_uses_id_as_name_type(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = {"name": "Evento 1"}
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -484,7 +484,7 @@ def test_event_detail_user_id_user_not_found_sets_is_enrolled_none(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = {"name": "Evento 1"}
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -531,7 +531,7 @@ def test_event_detail_user_id_enrolled_true(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = {"name": "Evento 1"}
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -614,7 +614,7 @@ def test_event_detail_event_content_doc_to_dict_none_returns_404(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = None
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -658,7 +658,7 @@ def test_event_detail_checkpoint_type_id_empty_returns_empty_name_type(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = {"name": "Evento 1"}
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -741,7 +741,7 @@ def test_event_detail_checkpoint_type_cache_hit(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = {"name": "Evento 1"}
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -838,7 +838,7 @@ def test_event_detail_multiple_calls_stable(
     event_content_ref = MagicMock()
     event_content_doc = MagicMock()
     event_content_doc.to_dict.return_value = {"name": "Evento 1"}
-    event_content_ref.limit.return_value.get.return_value = [event_content_doc]
+    event_content_ref.limit.return_value.stream.side_effect = lambda: iter([event_content_doc])
 
     participants_ref = MagicMock()
     participants_ref.select.return_value.get.return_value = []
@@ -32,7 +32,9 @@ def _make_query(docs):
 
 def _make_helper(query):
     """Instancia FirestoreHelper con firestore.client() mockeado y collection -> query."""
-    with patch("utils.firestore_helper.firestore") as mock_firestore:
+    with patch("utils.firestore_helper.firestore") as mock_firestore, patch(
+        "utils.firestore_helper._DB_SINGLETON", None
+    ):
         db = MagicMock()
         db.collection.return_value = query
         mock_firestore.client.return_value = db
@@ -154,3 +156,276 @@ def test_query_documents_no_filters_does_not_call_where():
 
     assert result == [("u5", {"name": "n"})]
     query.where.assert_not_called()
+
+
+def test_query_documents_builds_query_on_every_call():
+    """Sin cache de queries: cada llamada arma y ejecuta la query de nuevo."""
+    query = _make_query([])
+    query.stream.side_effect = lambda: iter([_make_doc("u1", {"a": 1})])
+    helper, db = _make_helper(query)
+
+    filters = [{"field": "status", "operator": "in", "value": ["a", "b"]}]
+    with patch("utils.firestore_helper.FieldFilter", _FakeFieldFilter):
+        first = helper.query_documents("users", filters=filters, limit=5)
+        second = helper.query_documents("users", filters=filters, limit=5)
+
+    assert first == second == [("u1", {"a": 1})]
+    assert db.collection.call_count == 2
+    assert query.where.call_count == 2
+    assert query.stream.call_count == 2
+
+
+def test_get_db_creates_client_once():
+    """get_db() crea el cliente en la primera llamada y luego lo reutiliza."""
+    with patch("utils.firestore_helper.firestore") as mock_firestore, patch(
+        "utils.firestore_helper._DB_SINGLETON", None
+    ):
+        from utils.firestore_helper import FirestoreHelper, get_db
+
+        first = get_db()
+        second = FirestoreHelper().db
+
+    assert first is second
+    mock_firestore.client.assert_called_once()
+
+
+def test_multi_get_reads_all_ids_in_one_call_and_skips_missing():
+    """multi_get usa un solo get_all y omite los documentos inexistentes."""
+    col_ref = MagicMock()
+    col_ref.document.side_effect = lambda doc_id: f"ref-{doc_id}"
+    helper, db = _make_helper(col_ref)
+
+    found = _make_doc("e1", {"name": "Evento 1"})
+    found.exists = True
+    missing = _make_doc("e2", None)
+    missing.exists = False
+    db.get_all.return_value = iter([missing, found])
+
+    result = helper.multi_get("events", ["e1", "e2"])
+
+    db.get_all.assert_called_once_with(["ref-e1", "ref-e2"], field_paths=None)
+    assert result == {"e1": {"name": "Evento 1"}}
+
+
+def test_multi_get_and_query_documents_apply_projection():
+    query = _make_query([_make_doc("c1", {"photoMain": "p.jpg"})])
+    helper, db = _make_helper(query)
+    query.select.return_value = query
+    db.get_all.return_value = iter([])
+
+    helper.multi_get("events", ["e1"], field_paths=["name"])
+    results = helper.query_documents("events/e1/event_content", limit=1, field_paths=["photoMain"])
+
+    assert db.get_all.call_args.kwargs == {"field_paths": ["name"]}
+    query.select.assert_called_once_with(["photoMain"])
+    assert results == [("c1", {"photoMain": "p.jpg"})]
+
+
+def test_multi_get_empty_ids_does_not_call_firestore():
+    helper, db = _make_helper(MagicMock())
+
+    assert helper.multi_get("events", []) == {}
+    db.get_all.assert_not_called()
+
+
+def _make_updates(count):
+    return [("events", f"e{i}", {"status": "closed"}) for i in range(count)]
+
+
+def test_batch_update_up_to_limit_uses_single_batch():
+    helper, db = _make_helper(MagicMock())
+
+    assert helper.batch_update(_make_updates(500)) is True
+
+    db.batch.assert_called_once()
+    assert db.batch.return_value.update.call_count == 500
+    db.batch.return_value.commit.assert_called_once()
+    db.bulk_writer.assert_not_called()
+
+
+def test_batch_update_over_limit_routes_to_bulk_writer():
+    helper, db = _make_helper(MagicMock())
+    bulk_writer = db.bulk_writer.return_value
+
+    assert helper.batch_update(_make_updates(501)) is True
+
+    db.batch.assert_not_called()
+    assert bulk_writer.update.call_count == 501
+    bulk_writer.close.assert_called_once()
+
+
+def test_bulk_update_raises_when_writes_exhaust_retries():
+    import pytest
+
+    helper, db = _make_helper(MagicMock())
+    bulk_writer = db.bulk_writer.return_value
+
+    def close():
+        on_error = bulk_writer.on_write_error.call_args[0][0]
+        failure = MagicMock()
+        failure.attempts = 1
+        assert on_error(failure, bulk_writer) is True
+        failure.attempts = 5
+        assert on_error(failure, bulk_writer) is False
+
+    bulk_writer.close.side_effect = close
+
+    with pytest.raises(RuntimeError):
+        helper.bulk_update(_make_updates(3))
+
+
+def test_batch_update_over_limit_failure_logged_once_without_retry():
+    """La delegación al BulkWriter no se reintenta ni se registra dos veces."""
+    import pytest
+    from google.api_core.exceptions import ServiceUnavailable
+
+    helper, db = _make_helper(MagicMock())
+    bulk_writer = db.bulk_writer.return_value
+    bulk_writer.close.side_effect = ServiceUnavailable("unavailable")
+
+    with patch("utils.firestore_helper.LOG") as mock_log, patch(
+        "utils.firestore_helper.time.sleep"
+    ):
+        with pytest.raises(ServiceUnavailable):
+            helper.batch_update(_make_updates(501))
+
+    db.bulk_writer.assert_called_once()
+    bulk_writer.close.assert_called_once()
+    mock_log.error.assert_called_once()
+
+
+def test_batch_update_retries_transient_commit_error():
+    from google.api_core.exceptions import Aborted
+
+    helper, db = _make_helper(MagicMock())
+    db.batch.return_value.commit.side_effect = [Aborted("contention"), None]
+
+    with patch("utils.firestore_helper.time.sleep"):
+        assert helper.batch_update(_make_updates(2)) is True
+
+    assert db.batch.return_value.commit.call_count == 2
+    db.batch.assert_called_once()
+
+
+def test_multi_set_splits_items_into_chunks():
+    helper, db = _make_helper(MagicMock())
+    batches = []
+
+    def new_batch():
+        batch = MagicMock()
+        batches.append(batch)
+        return batch
+
+    db.batch.side_effect = new_batch
+    items = {f"d{i}": {"n": i} for i in range(9)}
+
+    assert helper.multi_set("docs", items, chunk_size=4) == list(items.keys())
+
+    assert sorted(b.set.call_count for b in batches) == [1, 4, 4]
+    for batch in batches:
+        batch.commit.assert_called_once()
+
+
+def test_multi_set_retries_transient_errors():
+    from google.api_core.exceptions import Aborted
+
+    helper, db = _make_helper(MagicMock())
+    failing = MagicMock()
+    failing.commit.side_effect = Aborted("contention")
+    ok = MagicMock()
+    db.batch.side_effect = [failing, ok]
+
+    with patch("utils.firestore_helper.time.sleep") as mock_sleep:
+        helper.multi_set("docs", {"d1": {"n": 1}})
+
+    ok.commit.assert_called_once()
+    mock_sleep.assert_called_once()
+
+
+def test_multi_set_does_not_retry_other_errors():
+    import pytest
+
+    helper, db = _make_helper(MagicMock())
+    db.batch.return_value.commit.side_effect = ValueError("bad data")
+
+    with pytest.raises(ValueError):
+        helper.multi_set("docs", {"d1": {"n": 1}})
+    db.batch.assert_called_once()
+
+
+def test_get_document_retries_transient_errors():
+    from google.api_core.exceptions import ServiceUnavailable
+
+    col_ref = MagicMock()
+    helper, _ = _make_helper(col_ref)
+    snap = MagicMock()
+    snap.exists = True
+    snap.to_dict.return_value = {"name": "Evento"}
+    col_ref.document.return_value.get.side_effect = [ServiceUnavailable("down"), snap]
+
+    with patch("utils.firestore_helper.time.sleep") as mock_sleep:
+        assert helper.get_document("events", "e1") == {"name": "Evento"}
+
+    assert col_ref.document.return_value.get.call_count == 2
+    mock_sleep.assert_called_once()
+
+
+def test_get_document_gives_up_after_max_attempts():
+    import pytest
+    from google.api_core.exceptions import DeadlineExceeded
+
+    col_ref = MagicMock()
+    helper, _ = _make_helper(col_ref)
+    col_ref.document.return_value.get.side_effect = DeadlineExceeded("slow")
+
+    with patch("utils.firestore_helper.time.sleep"), pytest.raises(DeadlineExceeded):
+        helper.get_document("events", "e1")
+
+    assert col_ref.document.return_value.get.call_count == 3
+
+
+def test_create_document_retry_reuses_generated_id():
+    from google.api_core.exceptions import Aborted
+
+    col_ref = MagicMock()
+    helper, _ = _make_helper(col_ref)
+    generated_ref = MagicMock()
+    generated_ref.id = "auto1"
+    written_ref = MagicMock()
+    written_ref.id = "auto1"
+    written_ref.set.side_effect = [Aborted("contention"), None]
+    col_ref.document.side_effect = lambda doc_id=None: generated_ref if doc_id is None else written_ref
+
+    with patch("utils.firestore_helper.time.sleep"):
+        assert helper.create_document("events", {"name": "Evento"}) == "auto1"
+
+    assert written_ref.set.call_count == 2
+    assert [c.args for c in col_ref.document.call_args_list].count(()) == 1
+
+
+def test_list_document_ids_projects_only_document_name():
+    query = _make_query([_make_doc("a", {}), _make_doc("b", {})])
+    query.select.return_value = query
+    helper, _ = _make_helper(query)
+
+    assert helper.list_document_ids("users/u1/membership") == ["a", "b"]
+    query.select.assert_called_once_with(["__name__"])
+
+
+def test_bulk_set_returns_ids_that_exhausted_retries():
+    col_ref = MagicMock()
+    col_ref.document.side_effect = lambda doc_id: f"ref-{doc_id}"
+    helper, db = _make_helper(col_ref)
+    bulk_writer = db.bulk_writer.return_value
+
+    def close():
+        on_error = bulk_writer.on_write_error.call_args[0][0]
+        failure = MagicMock()
+        failure.attempts = 5
+        failure.operation.reference.id = "u2"
+        on_error(failure, bulk_writer)
+
+    bulk_writer.close.side_effect = close
+
+    assert helper.bulk_set("users", {"u1": {"a": 1}, "u2": {"a": 2}}) == ["u2"]
+    assert bulk_writer.set.call_count == 2
@@ -0,0 +1,141 @@
+"""
+Pruebas unitarias para el cache de verificación de tokens en utils.helper_http.
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, ".")
+
+
+def _jwt(name):
+    """Token con forma de JWT (header.payload.firma) identificado por name."""
+    return f"eyJhbGciOiJSUzI1NiJ9.{name}.c2lnbmF0dXJl"
+
+
+def _make_request(token):
+    req = MagicMock()
+    req.headers = {"Authorization": f"Bearer {_jwt(token)}"}
+    return req
+
+
+def _claims(uid="uid1", exp_in=3600):
+    return {"uid": uid, "exp": time.time() + exp_in}
+
+
+@patch("utils.helper_http.auth")
+def test_verify_bearer_token_caches_verified_token(mock_auth):
+    from collections import OrderedDict
+
+    from utils import helper_http
+
+    with patch.object(helper_http, "_token_cache", OrderedDict()):
+        mock_auth.verify_id_token.return_value = _claims()
+
+        assert helper_http.verify_bearer_token(_make_request("tok"), "test") is True
+        assert helper_http.verify_bearer_token(_make_request("tok"), "test") is True
+        assert helper_http.get_bearer_uid(_make_request("tok"), "test") == "uid1"
+
+        mock_auth.verify_id_token.assert_called_once_with(_jwt("tok"))
+        assert _jwt("tok") not in helper_http._token_cache
+
+
+@patch("utils.helper_http.auth")
+def test_verify_bearer_token_does_not_cache_failures(mock_auth):
+    from collections import OrderedDict
+
+    from utils import helper_http
+
+    with patch.object(helper_http, "_token_cache", OrderedDict()):
+        mock_auth.verify_id_token.side_effect = ValueError("firma inválida")
+
+        assert helper_http.verify_bearer_token(_make_request("bad"), "test") is False
+        assert helper_http.verify_bearer_token(_make_request("bad"), "test") is False
+
+        assert mock_auth.verify_id_token.call_count == 2
+        assert len(helper_http._token_cache) == 0
+
+
+@patch("utils.helper_http.auth")
+def test_cached_entry_never_outlives_token_exp(mock_auth):
+    from collections import OrderedDict
+
+    from utils import helper_http
+
+    with patch.object(helper_http, "_token_cache", OrderedDict()):
+        mock_auth.verify_id_token.return_value = _claims(exp_in=-1)
+
+        helper_http.verify_bearer_token(_make_request("old"), "test")
+        helper_http.verify_bearer_token(_make_request("old"), "test")
+
+        assert mock_auth.verify_id_token.call_count == 2
+        assert len(helper_http._token_cache) == 0
+
+
+@patch("utils.helper_http.auth")
+def test_token_close_to_exp_is_not_cached(mock_auth):
+    from collections import OrderedDict
+
+    from utils import helper_http
+
+    with patch.object(helper_http, "_token_cache", OrderedDict()):
+        mock_auth.verify_id_token.return_value = _claims(
+            exp_in=helper_http._TOKEN_EXP_SKEW_SECONDS - 5
+        )
+
+        assert helper_http.verify_bearer_token(_make_request("soon"), "test") is True
+        assert helper_http.verify_bearer_token(_make_request("soon"), "test") is True
+
+        assert mock_auth.verify_id_token.call_count == 2
+        assert len(helper_http._token_cache) == 0
+
+
+@patch("utils.helper_http.auth")
+def test_cache_evicts_oldest_entry(mock_auth):
+    from collections import OrderedDict
+
+    from utils import helper_http
+
+    with patch.object(helper_http, "_token_cache", OrderedDict()), patch.object(
+        helper_http, "_TOKEN_CACHE_MAX_SIZE", 2
+    ):
+        mock_auth.verify_id_token.return_value = _claims()
+        for token in ("a", "b", "c"):
+            helper_http.verify_bearer_token(_make_request(token), "test")
+
+        assert len(helper_http._token_cache) == 2
+        helper_http.verify_bearer_token(_make_request("a"), "test")
+        assert mock_auth.verify_id_token.call_count == 4
+
+
+@patch("utils.helper_http.auth")
+def test_malformed_token_rejected_without_verification(mock_auth):
+    from utils import helper_http
+
+    for token in ("not-a-jwt", "a.b", "a..c", "a.b.c.d", "a.b$.c"):
+        req = MagicMock()
+        req.headers = {"Authorization": f"Bearer {token}"}
+        assert helper_http.verify_bearer_token(req, "test") is False
+        assert helper_http.get_bearer_uid(req, "test") is None
+
+    mock_auth.verify_id_token.assert_not_called()
+
+
+@patch("utils.helper_http.auth")
+def test_get_bearer_claims_returns_custom_claims_from_cache(mock_auth):
+    from collections import OrderedDict
+
+    from utils import helper_http
+
+    with patch.object(helper_http, "_token_cache", OrderedDict()):
+        mock_auth.verify_id_token.return_value = {**_claims(), "admin": True}
+
+        assert helper_http.verify_bearer_token(_make_request("adm"), "test") is True
+        claims = helper_http.get_bearer_claims(_make_request("adm"), "test")
+
+        assert claims["admin"] is True
+        mock_auth.verify_id_token.assert_called_once()
+
+        mock_auth.verify_id_token.side_effect = ValueError("bad token")
+        assert helper_http.get_bearer_claims(_make_request("otro"), "test") is None
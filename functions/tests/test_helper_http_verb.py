@@ -0,0 +1,50 @@
+"""
+Pruebas unitarias para utils.helper_http_verb (preflight CORS y validación de método).
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, ".")
+
+
+def _make_request(method):
+    req = MagicMock()
+    req.method = method
+    return req
+
+
+def test_validate_request_options_returns_cached_preflight():
+    from utils.helper_http_verb import validate_request
+
+    response = validate_request(_make_request("OPTIONS"), ["GET", "DELETE"], "test")
+
+    assert response.status_code == 204
+    assert response.headers["Access-Control-Max-Age"] == "86400"
+    assert response.headers["Access-Control-Allow-Methods"] == "GET, DELETE, OPTIONS"
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+
+def test_validate_request_allowed_method_returns_none():
+    from utils.helper_http_verb import validate_request
+
+    assert validate_request(_make_request("GET"), ["GET"], "test") is None
+
+
+def test_validate_request_disallowed_method_returns_405():
+    from utils.helper_http_verb import validate_request
+
+    response = validate_request(_make_request("PATCH"), ["GET"], "test")
+
+    assert response.status_code == 405
+    assert response.headers["Allow"] == "GET, OPTIONS"
+
+
+def test_compile_methods_is_memoized_per_method_list():
+    from utils.helper_http_verb import _compile_methods
+
+    first = _compile_methods(("GET", "POST"))
+    second = _compile_methods(("GET", "POST"))
+
+    assert first is second
+    assert first == (frozenset({"GET", "POST"}), "GET, POST, OPTIONS")
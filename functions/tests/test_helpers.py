@@ -0,0 +1,103 @@
+"""
+Pruebas unitarias para utils.helpers.convert_firestore_value.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, ".")
+
+
+def test_convert_primitives_and_none_unchanged():
+    from utils.helpers import convert_firestore_value
+
+    for value in ("a", 1, 1.5, True, None):
+        assert convert_firestore_value(value) == value
+
+
+def test_convert_datetimes_to_iso():
+    from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+
+    from utils.helpers import convert_firestore_value
+
+    assert convert_firestore_value(datetime(2025, 1, 2, 3, 4, 5)) == "2025-01-02T03:04:05Z"
+    aware = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert convert_firestore_value(aware) == "2025-01-02T03:04:05+00:00"
+    firestore_dt = DatetimeWithNanoseconds(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert convert_firestore_value(firestore_dt) == "2025-01-02T03:04:05+00:00"
+
+
+class _FakeTimestamp:
+    """Timestamp con la interfaz timestamp()/to_datetime()."""
+
+    def __init__(self, dt):
+        self._dt = dt
+
+    def timestamp(self):
+        return self._dt.timestamp()
+
+    def to_datetime(self):
+        return self._dt
+
+
+def test_convert_object_with_to_datetime():
+    from utils.helpers import convert_firestore_value
+
+    assert convert_firestore_value(_FakeTimestamp(datetime(2025, 1, 2))) == "2025-01-02T00:00:00Z"
+    # Segunda llamada usa el conversor memorizado para el tipo
+    assert convert_firestore_value([_FakeTimestamp(datetime(2025, 1, 3))]) == ["2025-01-03T00:00:00Z"]
+
+
+def test_convert_unknown_type_resolved_once():
+    from utils import helpers
+
+    class Opaque:
+        pass
+
+    value = Opaque()
+    assert helpers.convert_firestore_value(value) is value
+    assert helpers._SCALAR_CONVERTERS[Opaque] is helpers._identity
+
+
+def test_convert_nested_structures_preserve_shape_and_order():
+    from utils.helpers import convert_firestore_value
+
+    dt = datetime(2025, 1, 2)
+    value = {
+        "a": [1, {"b": dt, "c": [dt, "x"]}, []],
+        "d": {"e": {"f": None}},
+        "g": dt,
+    }
+    assert convert_firestore_value(value) == {
+        "a": [1, {"b": "2025-01-02T00:00:00Z", "c": ["2025-01-02T00:00:00Z", "x"]}, []],
+        "d": {"e": {"f": None}},
+        "g": "2025-01-02T00:00:00Z",
+    }
+    assert list(convert_firestore_value(value)) == ["a", "d", "g"]
+
+
+def test_convert_deeply_nested_does_not_recurse():
+    from utils.helpers import convert_firestore_value
+
+    value = leaf = {}
+    for _ in range(5000):
+        leaf["n"] = {}
+        leaf = leaf["n"]
+    leaf["n"] = datetime(2025, 1, 2)
+
+    result = convert_firestore_value(value)
+    for _ in range(5000):
+        result = result["n"]
+    assert result == {"n": "2025-01-02T00:00:00Z"}
+
+
+def test_format_utc_to_local_datetime_matches_strftime():
+    from datetime import datetime, timezone
+
+    from utils.helpers import format_utc_to_local_datetime
+
+    for value in (
+        datetime(2025, 10, 24, 19, 3, 35, 123456),
+        datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    ):
+        assert format_utc_to_local_datetime(value) == value.strftime("%Y-%m-%dT%H:%M:%SZ")
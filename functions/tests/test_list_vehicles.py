@@ -0,0 +1,66 @@
+"""
+Pruebas unitarias para vehicles.list (handle).
+"""
+
+import json
+import sys
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, ".")
+
+
+def _make_request(user_id="user-1"):
+    req = MagicMock()
+    req.args = {"userId": user_id}
+    return req
+
+
+def _make_vehicle_doc(doc_id, data):
+    doc = MagicMock()
+    doc.id = doc_id
+    doc.to_dict.return_value = data
+    return doc
+
+
+@patch("vehicles.list.get_db")
+def test_list_vehicles_returns_projected_vehicles_as_utf8_bytes(mock_get_db):
+    from vehicles import user_exists_cache
+    from vehicles.list import _VEHICLE_FIELDS, handle
+
+    user_ref = MagicMock()
+    user_ref.path = "users/user-1"
+    user_ref.get.return_value.exists = True
+    vehicles_query = user_ref.collection.return_value.select.return_value
+    vehicles_query.stream.return_value = iter(
+        [_make_vehicle_doc("v1", {"branch": "Señal", "year": 2020, "model": "X", "color": "rojo"})]
+    )
+    mock_get_db.return_value.collection.return_value.document.return_value = user_ref
+
+    with patch.object(user_exists_cache, "_user_exists_cache", OrderedDict()):
+        response = handle(_make_request())
+
+    body = response.get_data()
+    assert response.status_code == 200
+    assert response.headers["Content-Length"] == str(len(body))
+    assert json.loads(body) == [
+        {"id": "v1", "branch": "Señal", "year": 2020, "model": "X", "color": "rojo"}
+    ]
+    user_ref.collection.return_value.select.assert_called_once_with(_VEHICLE_FIELDS)
+
+
+@patch("vehicles.list.get_db")
+def test_list_vehicles_user_not_found(mock_get_db):
+    from vehicles import user_exists_cache
+    from vehicles.list import handle
+
+    user_ref = MagicMock()
+    user_ref.path = "users/missing"
+    user_ref.get.return_value.exists = False
+    mock_get_db.return_value.collection.return_value.document.return_value = user_ref
+
+    with patch.object(user_exists_cache, "_user_exists_cache", OrderedDict()):
+        response = handle(_make_request("missing"))
+
+    assert response.status_code == 404
+    user_ref.collection.assert_not_called()
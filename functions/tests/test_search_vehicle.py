@@ -4,6 +4,7 @@ Pruebas unitarias para vehicles.search (handle).
 
 import json
 import sys
+from collections import OrderedDict
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,6 +12,15 @@ import pytest
 sys.path.insert(0, ".")
 
 
+@pytest.fixture(autouse=True)
+def _empty_search_cache():
+    """Cada prueba arranca sin busquedas cacheadas."""
+    from vehicles import search_cache
+
+    with patch.object(search_cache, "_search_cache", OrderedDict()):
+        yield
+
+
 def _make_request(
     method: str = "GET",
     user_id: str = "user-1",
@@ -69,6 +79,12 @@ def test_search_vehicle_found(mock_fs_cls):
     assert body["model"] == "CRF450R"
     assert body["year"] == 2024
     assert body["color"] == "Rojo"
+    assert fs_instance.query_documents.call_args.kwargs["field_paths"] == [
+        "branch",
+        "model",
+        "year",
+        "color",
+    ]
 
 
 # --- Not found ---
@@ -156,15 +172,32 @@ def test_search_vehicle_year_out_of_range():
     assert response.status_code == 400
 
 
+@pytest.mark.parametrize("year", [" 2024", "2024 ", "+2024"])
+@patch("vehicles.search.FirestoreHelper")
+def test_search_vehicle_year_parsed_like_create(mock_fs_cls, year):
+    """year con espacios o "+" inicial se acepta igual que en vehicles/create."""
+    fs_instance = MagicMock()
+    mock_fs_cls.return_value = fs_instance
+    fs_instance.query_documents.return_value = [("veh-abc", VEHICLE_DATA)]
+
+    from vehicles.search import handle
+
+    response = handle(_make_request(year=year))
+
+    assert response.status_code == 200
+    filters = fs_instance.query_documents.call_args.kwargs["filters"]
+    assert {"field": "year", "operator": "==", "value": 2024} in filters
+
+
 # --- Usuario no encontrado ---
 
 
 @patch("vehicles.search.FirestoreHelper")
 def test_search_vehicle_user_not_found(mock_fs_cls):
-    """Usuario no existe -> 404."""
+    """Usuario no existe (subcoleccion vacia) -> 404 sin leer el documento del usuario."""
     fs_instance = MagicMock()
     mock_fs_cls.return_value = fs_instance
-    fs_instance.get_document.return_value = None
+    fs_instance.query_documents.return_value = []
 
     from vehicles.search import handle
 
@@ -172,6 +205,7 @@ def test_search_vehicle_user_not_found(mock_fs_cls):
     response = handle(req)
 
     assert response.status_code == 404
+    fs_instance.get_document.assert_not_called()
 
 
 # --- Multiples llamadas ---
@@ -198,6 +232,39 @@ def test_search_vehicle_multiple_calls(mock_fs_cls):
     body1 = json.loads(r1.response[0])
     body2 = json.loads(r2.response[0])
     assert body1["id"] == body2["id"]
+    # La segunda busqueda identica se responde desde la cache
+    fs_instance.query_documents.assert_called_once()
+
+
+@patch("vehicles.search.FirestoreHelper")
+def test_search_vehicle_does_not_cache_not_found(mock_fs_cls):
+    """Sin coincidencia no se cachea: cada busqueda vuelve a consultar Firestore."""
+    fs_instance = MagicMock()
+    mock_fs_cls.return_value = fs_instance
+    fs_instance.query_documents.return_value = []
+
+    from vehicles.search import handle
+
+    assert handle(_make_request()).status_code == 404
+    assert handle(_make_request()).status_code == 404
+    assert fs_instance.query_documents.call_count == 2
+
+
+@patch("vehicles.search.FirestoreHelper")
+def test_search_vehicle_cache_invalidated_per_user(mock_fs_cls):
+    """invalidate_user_searches fuerza una nueva consulta para ese usuario."""
+    fs_instance = MagicMock()
+    mock_fs_cls.return_value = fs_instance
+    fs_instance.query_documents.return_value = [("veh-abc", VEHICLE_DATA)]
+
+    from vehicles.search import handle
+    from vehicles.search_cache import invalidate_user_searches
+
+    assert handle(_make_request()).status_code == 200
+    invalidate_user_searches("user-1")
+    fs_instance.query_documents.return_value = []
+    assert handle(_make_request()).status_code == 404
+    assert fs_instance.query_documents.call_count == 2
 
 
 # --- Error interno (excepcion en FirestoreHelper) ---
@@ -208,7 +275,7 @@ def test_search_vehicle_internal_error(mock_fs_cls):
     """Excepcion interna -> 500."""
     fs_instance = MagicMock()
     mock_fs_cls.return_value = fs_instance
-    fs_instance.get_document.side_effect = RuntimeError("Firestore down")
+    fs_instance.query_documents.side_effect = RuntimeError("Firestore down")
 
     from vehicles.search import handle
 
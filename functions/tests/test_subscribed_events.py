@@ -13,6 +13,15 @@ sys.path.insert(0, ".")
 _PATCH_HELPER = "users.subscribed_events.FirestoreHelper"
 
 
+def _wire_multi_get(helper):
+    """multi_get derivado de get_document: mismo documento (o ausencia) por ID."""
+    helper.multi_get.side_effect = lambda collection_path, doc_ids, field_paths=None: {
+        doc_id: doc
+        for doc_id in doc_ids
+        if (doc := helper.get_document(collection_path, doc_id)) is not None
+    }
+
+
 def _make_request(args=None):
     req = MagicMock()
     req.method = "GET"
@@ -35,6 +44,7 @@ def test_subscribed_events_missing_user_id_returns_400(mock_helper_cls):
 def test_subscribed_events_user_not_found_returns_404(mock_helper_cls):
     helper = MagicMock()
     mock_helper_cls.return_value = helper
+    _wire_multi_get(helper)
     helper.get_document.return_value = None
     helper.list_document_ids.return_value = []
 
@@ -50,6 +60,7 @@ def test_subscribed_events_user_not_found_returns_404(mock_helper_cls):
 def test_subscribed_events_empty_membership_returns_404(mock_helper_cls):
     helper = MagicMock()
     mock_helper_cls.return_value = helper
+    _wire_multi_get(helper)
     helper.get_document.return_value = {"email": "u@b.com"}
     helper.list_document_ids.return_value = []
 
@@ -65,6 +76,7 @@ def test_subscribed_events_empty_membership_returns_404(mock_helper_cls):
 def test_subscribed_events_happy_path_returns_200_with_result_and_pagination(mock_helper_cls):
     helper = MagicMock()
     mock_helper_cls.return_value = helper
+    _wire_multi_get(helper)
 
     def get_doc(collection_path, doc_id):
         if "users" in collection_path:
@@ -122,6 +134,7 @@ def test_subscribed_events_happy_path_returns_200_with_result_and_pagination(moc
 def test_subscribed_events_pagination_has_more(mock_helper_cls):
     helper = MagicMock()
     mock_helper_cls.return_value = helper
+    _wire_multi_get(helper)
 
     def get_doc(collection_path, doc_id):
         if "users" in collection_path:
@@ -160,6 +173,7 @@ def test_subscribed_events_nonexistent_event_omitted(mock_helper_cls):
     """Si un eventId de membership no existe en events, se omite ese ítem (no falla la petición)."""
     helper = MagicMock()
     mock_helper_cls.return_value = helper
+    _wire_multi_get(helper)
 
     call_count = [0]
 
@@ -200,6 +214,7 @@ def test_subscribed_events_multiple_calls_stable(mock_helper_cls):
     """Múltiples llamadas al handler devuelven resultado estable."""
     helper = MagicMock()
     mock_helper_cls.return_value = helper
+    _wire_multi_get(helper)
     helper.get_document.return_value = {"email": "u@b.com"}
     helper.list_document_ids.return_value = ["ev1"]
     helper.query_documents.return_value = [
@@ -240,6 +255,7 @@ def test_subscribed_events_no_event_content_uses_event_doc_only(mock_helper_cls)
     """Sin event_content: mismo mapeo que /api/events (fecha desde doc, sin overrides)."""
     helper = MagicMock()
     mock_helper_cls.return_value = helper
+    _wire_multi_get(helper)
 
     def get_doc(collection_path, doc_id):
         if "users" in collection_path:
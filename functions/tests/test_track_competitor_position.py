@@ -5,12 +5,23 @@ Pruebas unitarias para track_competitor_position (SPRTMNTRPP-75).
 import sys
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
 
 # Asegurar que functions esté en el path
 sys.path.insert(0, ".")
 
 
+@pytest.fixture(autouse=True)
+def _clear_map_schema_cache():
+    """Aísla cada test del LRU de esquema (módulo-level)."""
+    from tracking.track_competitor_position import _map_schema_cache
+
+    _map_schema_cache.clear()
+    yield
+    _map_schema_cache.clear()
+
+
 def _make_request(
     method: str = "POST",
     event_id: str = "ev1",
@@ -32,7 +43,7 @@ def _make_request(
         "dayId": day_id,
         "competitorId": competitor_id,
     }.get(k, default or "")
-    req.get_json.side_effect = lambda silent=True: body
+    req.get_data.side_effect = lambda cache=True: orjson.dumps(body)
     return req
 
 
@@ -251,13 +262,13 @@ def test_track_competitor_position_data_type_not_string(mock_validate_request):
 
 
 @patch("tracking.track_competitor_position.validate_request")
-def test_track_competitor_position_get_json_raises(mock_validate_request):
-    """get_json lanza ValueError → 400."""
+def test_track_competitor_position_invalid_json_returns_400(mock_validate_request):
+    """Body con JSON malformado → 400."""
     mock_validate_request.return_value = None
     from tracking.track_competitor_position import track_competitor_position
 
     req = _make_request()
-    req.get_json.side_effect = ValueError("Invalid JSON")
+    req.get_data.side_effect = lambda cache=True: b"{not-json"
     response = track_competitor_position(req)
     assert response.status_code == 400
 
@@ -325,3 +336,190 @@ def test_track_competitor_position_multiple_calls(mock_db_reference, mock_valida
     assert r1.status_code == 200
     assert r2.status_code == 200
     assert mock_update.call_count == 2
+
+
+@patch("tracking.track_competitor_position.validate_request")
+@patch("tracking.track_competitor_position.db.reference")
+def test_track_competitor_position_options_preflight(mock_db_reference, mock_validate_request):
+    """OPTIONS → 204 con Max-Age de 24h, sin validar ni tocar RTDB."""
+    from tracking.track_competitor_position import track_competitor_position
+
+    req = _make_request(method="OPTIONS")
+    response = track_competitor_position(req)
+
+    assert response.status_code == 204
+    assert response.headers["Access-Control-Max-Age"] == "86400"
+    assert "POST" in response.headers["Access-Control-Allow-Methods"]
+    mock_validate_request.assert_not_called()
+    mock_db_reference.assert_not_called()
+
+
+@patch("tracking.track_competitor_position.validate_request")
+@patch("tracking.track_competitor_position.db.reference")
+def test_track_competitor_position_existing_map_writes_single_entry(
+    mock_db_reference, mock_validate_request
+):
+    """Historial existente como mapa → update por ruta, solo la entrada nueva."""
+    mock_validate_request.return_value = None
+    existing = {
+        "historial": {
+            "1700000000000": {
+                "id": 1,
+                "coordinates": {"latitude": 1.0, "longitude": 2.0},
+                "data": {"speed": "1", "type": "km"},
+                "timeStamp": "01/01/2026 00:00:01",
+            }
+        }
+    }
+    mock_ref, mock_update = _make_mock_rtdb(existing=existing)
+    mock_db_reference.return_value = mock_ref
+
+    from tracking.track_competitor_position import track_competitor_position
+
+    response = track_competitor_position(_make_request())
+
+    assert response.status_code == 200
+    call_args = mock_update.call_args[0][0]
+    assert "historial" not in call_args
+    assert "current" in call_args
+    historial_paths = [k for k in call_args if k.startswith("historial/")]
+    assert len(historial_paths) == 1
+    assert call_args[historial_paths[0]]["data"]["speed"] == "45"
+
+
+@patch("tracking.track_competitor_position.validate_request")
+@patch("tracking.track_competitor_position.db.reference")
+def test_track_competitor_position_legacy_list_rewrites_historial(
+    mock_db_reference, mock_validate_request
+):
+    """Historial legacy como lista → se migra a mapa y se reescribe completo."""
+    mock_validate_request.return_value = None
+    existing = {
+        "historial": [
+            {
+                "uuid": "a.b",
+                "coordinates": {"latitude": 1.0, "longitude": 2.0},
+                "data": {"speed": "1", "type": "km"},
+                "timeStamp": "01/01/2026 00:00:01",
+            }
+        ]
+    }
+    mock_ref, mock_update = _make_mock_rtdb(existing=existing)
+    mock_db_reference.return_value = mock_ref
+
+    from tracking.track_competitor_position import track_competitor_position
+
+    response = track_competitor_position(_make_request())
+
+    assert response.status_code == 200
+    historial = mock_update.call_args[0][0]["historial"]
+    assert len(historial) == 2
+    assert "a_b" in historial
+
+
+@patch("tracking.track_competitor_position.validate_request")
+def test_track_competitor_position_empty_body_returns_400(mock_validate_request):
+    """Body vacío → 400."""
+    mock_validate_request.return_value = None
+    from tracking.track_competitor_position import track_competitor_position
+
+    req = _make_request()
+    req.get_data.side_effect = lambda cache=True: b""
+    response = track_competitor_position(req)
+    assert response.status_code == 400
+
+
+@patch("tracking.track_competitor_position.validate_request")
+@patch("tracking.track_competitor_position.db.reference")
+def test_track_competitor_position_known_map_schema_skips_full_read(
+    mock_db_reference, mock_validate_request
+):
+    """Segunda escritura a la misma ruta → lectura shallow de claves, sin ref.get() completo."""
+    mock_validate_request.return_value = None
+    mock_ref, mock_update = _make_mock_rtdb(existing={})
+    mock_ref.child.return_value.get.return_value = {"1700000000000": True}
+    mock_db_reference.return_value = mock_ref
+
+    from tracking.track_competitor_position import track_competitor_position
+
+    assert track_competitor_position(_make_request()).status_code == 200
+    assert track_competitor_position(_make_request()).status_code == 200
+
+    assert mock_ref.get.call_count == 1
+    mock_ref.child.assert_called_with("historial")
+    mock_ref.child.return_value.get.assert_called_once_with(shallow=True)
+    second_call = mock_update.call_args_list[1][0][0]
+    assert "historial" not in second_call
+    assert any(k.startswith("historial/") for k in second_call)
+
+
+@patch("tracking.track_competitor_position.HISTORIAL_MAX_SIZE", 1)
+@patch("tracking.track_competitor_position.validate_request")
+@patch("tracking.track_competitor_position.db.reference")
+def test_track_competitor_position_known_map_schema_at_limit_trims(
+    mock_db_reference, mock_validate_request
+):
+    """Ruta en cache con historial lleno → lee historial completo y lo recorta."""
+    mock_validate_request.return_value = None
+    mock_ref, mock_update = _make_mock_rtdb(existing={})
+    old_entry = {"id": 1, "coordinates": {}, "data": {}, "timeStamp": ""}
+    mock_ref.child.return_value.get.side_effect = lambda shallow=False: (
+        {"old": True} if shallow else {"old": old_entry}
+    )
+    mock_db_reference.return_value = mock_ref
+
+    from tracking.track_competitor_position import track_competitor_position
+
+    assert track_competitor_position(_make_request()).status_code == 200
+    assert track_competitor_position(_make_request()).status_code == 200
+
+    historial = mock_update.call_args_list[1][0][0]["historial"]
+    assert len(historial) == 1
+    assert "old" not in historial
+
+
+@patch("tracking.track_competitor_position._LOG_SAMPLE_RATE", 2)
+@patch("tracking.track_competitor_position.LOG")
+@patch("tracking.track_competitor_position.validate_request")
+@patch("tracking.track_competitor_position.db.reference")
+def test_track_competitor_position_ok_log_is_sampled(
+    mock_db_reference, mock_validate_request, mock_log
+):
+    """El log INFO de éxito se muestrea: 1 de cada _LOG_SAMPLE_RATE escrituras."""
+    mock_validate_request.return_value = None
+    mock_ref, _ = _make_mock_rtdb(existing={})
+    mock_db_reference.return_value = mock_ref
+    mock_log.isEnabledFor.return_value = True
+
+    from tracking.track_competitor_position import track_competitor_position
+
+    for _ in range(4):
+        assert track_competitor_position(_make_request()).status_code == 200
+
+    assert mock_log.info.call_count == 2
+
+
+def test_rtdb_safe_key_replaces_forbidden_chars():
+    """_rtdb_safe_key reemplaza . $ # [ ] / por _ y deja intactas claves válidas."""
+    from tracking.track_competitor_position import _rtdb_safe_key
+
+    assert _rtdb_safe_key("a.b$c#d[e]f/g") == "a_b_c_d_e_f_g"
+    assert _rtdb_safe_key("1700000000000") == "1700000000000"
+
+
+@patch("tracking.track_competitor_position.HISTORIAL_MAX_SIZE", 10)
+def test_merge_historial_trims_with_headroom():
+    """Al superar el máximo se recorta al 90%: las siguientes escrituras vuelven al update por ruta."""
+    from tracking.track_competitor_position import _merge_historial
+
+    existing = {
+        f"k{i}": {"id": i, "coordinates": {}, "data": {}, "timeStamp": ""} for i in range(10)
+    }
+    historial = _merge_historial(
+        existing, "new", {"id": 100, "coordinates": {}, "data": {}, "timeStamp": ""}
+    )
+
+    assert len(historial) == 9
+    assert "new" in historial
+    assert "k0" not in historial and "k1" not in historial
+    assert "k2" in historial
@@ -0,0 +1,48 @@
+"""
+Pruebas unitarias para los shards de track_competitor_position.
+"""
+
+import sys
+import zlib
+from unittest.mock import MagicMock, patch
+
+# Asegurar que functions esté en el path
+sys.path.insert(0, ".")
+
+
+def test_competitor_position_shard_is_stable_crc32():
+    """El shard es crc32(competitorId) % SHARD_COUNT y siempre está en rango."""
+    from tracking.track_competitor_position_shards import (
+        SHARD_COUNT,
+        competitor_position_shard,
+    )
+
+    for competitor_id in ("comp1", "comp2", "9f1c-uuid"):
+        shard = competitor_position_shard(competitor_id)
+        assert shard == zlib.crc32(competitor_id.encode("utf-8")) % SHARD_COUNT
+        assert 0 <= shard < SHARD_COUNT
+
+
+def test_shard_functions_have_distinct_entry_points():
+    """Cada shard se despliega con su propio entryPoint."""
+    from tracking import track_competitor_position_shards as shards
+
+    entry_points = {
+        getattr(shards, f"track_competitor_position_{i}").__firebase_endpoint__.entryPoint
+        for i in range(shards.SHARD_COUNT)
+    }
+    assert entry_points == {
+        f"track_competitor_position_{i}" for i in range(shards.SHARD_COUNT)
+    }
+
+
+@patch("tracking.track_competitor_position_shards._handle_track_competitor_position")
+def test_shard_function_delegates_with_request_validation(mock_handle):
+    """El shard delega en el handler compartido sin omitir validate_request."""
+    from tracking.track_competitor_position_shards import track_competitor_position_3
+
+    req = MagicMock()
+    mock_handle.return_value = "response"
+
+    assert track_competitor_position_3(req) == "response"
+    mock_handle.assert_called_once_with(req, skip_request_validation=False)
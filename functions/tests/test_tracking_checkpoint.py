@@ -0,0 +1,84 @@
+"""
+Pruebas unitarias para tracking/tracking_checkpoint.py (track_event_checkpoint).
+
+Se invoca la función original (inspect.unwrap(track_event_checkpoint)) con un
+CallableRequest simulado y Firestore mockeado.
+"""
+
+import inspect
+import sys
+from unittest.mock import MagicMock, patch
+
+from google.api_core.exceptions import AlreadyExists
+
+# Asegurar que functions esté en el path
+sys.path.insert(0, ".")
+
+_CALL_DATA = {"eventId": "ev1", "status": "inProgress", "day": "day1"}
+
+
+def _wire_db(mock_client):
+    """Evento 'inProgress' y referencia al documento tracking_checkpoint/ev1_day1."""
+    event_doc = MagicMock()
+    event_doc.exists = True
+    event_doc.to_dict.return_value = {"name": "Rally 2026", "status": "inProgress"}
+    event_ref = MagicMock()
+    event_ref.get.return_value = event_doc
+    tracking_doc_ref = MagicMock()
+    event_ref.collection.return_value.document.return_value = tracking_doc_ref
+    db = MagicMock()
+    db.collection.return_value.document.return_value = event_ref
+    mock_client.return_value = db
+    return event_ref, tracking_doc_ref
+
+
+def _call(data=None):
+    from tracking.tracking_checkpoint import track_event_checkpoint
+
+    req = MagicMock()
+    req.data = data or dict(_CALL_DATA)
+    return inspect.unwrap(track_event_checkpoint)(req)
+
+
+@patch("tracking.tracking_checkpoint.firestore.client")
+def test_track_event_checkpoint_creates_document(mock_client):
+    """Primera llamada: create() del documento {eventId}_{day} con el estado inicial."""
+    event_ref, tracking_doc_ref = _wire_db(mock_client)
+
+    result = _call()
+
+    event_ref.collection.assert_called_once_with("tracking_checkpoint")
+    event_ref.collection.return_value.document.assert_called_once_with("ev1_day1")
+    tracking_doc_ref.create.assert_called_once()
+    tracking_doc_ref.set.assert_not_called()
+    created = tracking_doc_ref.create.call_args[0][0]
+    assert created["competitors"] == []
+    assert [cp["name"] for cp in created["checkpoints"]] == ["Inicio", "Meta"]
+    assert result["success"] is True
+    assert result["already_exists"] is False
+    assert result["tracking_data"]["checkpoints_count"] == 2
+    assert result["tracking_data"]["competitors_count"] == 0
+
+
+@patch("tracking.tracking_checkpoint.firestore.client")
+def test_track_event_checkpoint_repeat_call_keeps_existing_document(mock_client):
+    """Llamada repetida: no sobrescribe el tracking en vivo y retorna el documento existente."""
+    _, tracking_doc_ref = _wire_db(mock_client)
+    tracking_doc_ref.create.side_effect = AlreadyExists("exists")
+    existing = {
+        "eventId": "ev1",
+        "checkpoints": [{"id": "ev1_start_1", "statusCompetitor": "check"}],
+        "competitors": [{"id": "c1"}, {"id": "c2"}],
+        "status": "inProgress",
+    }
+    tracking_doc_ref.get.return_value.to_dict.return_value = existing
+
+    result = _call()
+
+    tracking_doc_ref.set.assert_not_called()
+    tracking_doc_ref.update.assert_not_called()
+    assert result["success"] is True
+    assert result["already_exists"] is True
+    assert result["tracking_data"]["checkpoints_count"] == 1
+    assert result["tracking_data"]["competitors_count"] == 2
+    assert result["tracking_data"]["checkpoints"] == existing["checkpoints"]
@@ -0,0 +1,658 @@
+"""
+Pruebas unitarias para tracking/tracking_competitors.py (track_competitors, track_competitors_off).
+
+Se invoca la función original (inspect.unwrap(track_competitors)) con un CallableRequest
+simulado y un cliente de Firestore falso que registra las escrituras del BulkWriter.
+"""
+
+import inspect
+import sys
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from firebase_functions import https_fn
+
+# Asegurar que functions esté en el path
+sys.path.insert(0, ".")
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+
+_UPDATE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _make_doc(
+    doc_id: str, data: dict | None, exists: bool = True, update_time: datetime = _UPDATE_TIME
+):
+    doc = MagicMock()
+    doc.id = doc_id
+    doc.exists = exists
+    doc.update_time = update_time
+    doc.to_dict.return_value = data
+    return doc
+
+
+def _make_query(docs: list):
+    """Query/colección falsa: soporta get(), stream(), where(...) y select(...) encadenados."""
+    query = MagicMock()
+    query.get.return_value = docs
+    query.stream.side_effect = lambda *args, **kwargs: iter(docs)
+    query.where.return_value = query
+    query.select.return_value = query
+    return query
+
+
+class _FakeRef:
+    """DocumentReference falsa con path, subcolecciones y lectura configurable."""
+
+    def __init__(self, path: str, snapshot=None):
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+        self._snapshot = snapshot or _make_doc(self.id, None, exists=False)
+        self.update = MagicMock()
+        self.set = MagicMock()
+
+    def collection(self, name: str):
+        return _FakeCollection(f"{self.path}/{name}")
+
+    def get(self, *args, **kwargs):
+        return self._snapshot
+
+
+class _FakeCollection:
+    def __init__(self, path: str, documents: dict | None = None):
+        self.path = path
+        self._documents = documents if documents is not None else {}
+
+    def document(self, doc_id: str):
+        path = f"{self.path}/{doc_id}"
+        ref = _FakeRef(path, self._documents.get(path))
+        self._documents.setdefault("__refs__", {})[path] = ref
+        return ref
+
+
+class _FakeDb:
+    """Cliente Firestore falso para track_competitors."""
+
+    def __init__(self, event_data, checkpoints, participants, categories, routes):
+        self.event_doc = _make_doc("ev1", event_data, exists=event_data is not None)
+        self.checkpoints = _make_query(checkpoints)
+        self.participants = _make_query(participants)
+        self.categories = _make_query(categories)
+        self.routes = _make_query(routes)
+        self.documents: dict = {}
+        self.bulk = MagicMock()
+        self.writes: dict[str, dict] = {}
+        self.bulk.set.side_effect = lambda ref, data, *a, **k: self.writes.__setitem__(
+            ref.path, data
+        )
+
+    def collection(self, path: str):
+        if path == "events":
+            events = MagicMock()
+            events.document.side_effect = lambda doc_id: _FakeRef(
+                f"events/{doc_id}", self.event_doc
+            )
+            return events
+        if path.endswith("/checkpoints"):
+            return self.checkpoints
+        if path.endswith("/participants"):
+            return self.participants
+        if path.endswith("/event_categories"):
+            return self.categories
+        if path.endswith("/routes"):
+            return self.routes
+        return _FakeCollection(path, self.documents)
+
+    def ref(self, path: str):
+        """DocumentReference creada por la función bajo prueba para un path."""
+        return self.documents["__refs__"][path]
+
+    def bulk_writer(self):
+        return self.bulk
+
+    def get_all(self, refs, *args, **kwargs):
+        # Orden inverso a propósito: get_all no garantiza el orden de entrada
+        snapshots = []
+        for ref in reversed(list(refs)):
+            snapshot = ref.get()
+            snapshot.reference = ref
+            snapshots.append(snapshot)
+        return snapshots
+
+
+def _make_call(data: dict):
+    req = MagicMock()
+    req.data = data
+    return req
+
+
+_EVENT = {"name": "Rally 2026", "status": "inProgress"}
+_CALL_DATA = {
+    "eventId": "ev1",
+    "dayId": "day1",
+    "status": True,
+    "dayName": "Día 1",
+    "wait": True,
+}
+_TRACKING_PATH = "events_tracking/ev1/competitor_tracking/ev1_day1"
+
+
+def _default_db(**overrides):
+    checkpoints = [
+        _make_doc(
+            "cp1",
+            {"name": "Salida", "type": "start", "order": 1, "eventRouteId": ["r1"]},
+        ),
+        _make_doc(
+            "cp2",
+            {"name": "Meta", "type": "invalid-type", "order": 2, "eventRouteId": ["r1", "r2"]},
+        ),
+    ]
+    participants = [
+        _make_doc(
+            "p_late",
+            {
+                "personalData": {"fullName": "Tarde"},
+                "competitionCategory": {"pilotNumber": "7", "registrationCategory": "Pro"},
+                "timesToStart": {"day1": datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)},
+            },
+        ),
+        _make_doc(
+            "p_none",
+            {
+                "personalData": {"fullName": "Sin hora"},
+                "competitionCategory": {"registrationCategory": "Pro"},
+            },
+        ),
+        _make_doc(
+            "p_early",
+            {
+                "personalData": {"fullName": "Temprano"},
+                "competitionCategory": {"pilotNumber": "x"},
+                "timesToStart": {"day1": "2026-01-01T08:00:00Z"},
+            },
+        ),
+    ]
+    categories = [_make_doc("cat1", {"name": "Pro"})]
+    routes = [
+        _make_doc("r1", {"name": "Ruta 1", "routeUrl": "u1", "categoryIds": ["cat1", "catX"]}),
+    ]
+    params = dict(
+        event_data=_EVENT,
+        checkpoints=checkpoints,
+        participants=participants,
+        categories=categories,
+        routes=routes,
+    )
+    params.update(overrides)
+    return _FakeDb(**params)
+
+
+@pytest.fixture
+def fake_db():
+    db = _default_db()
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        yield db
+
+
+def _call(data=None):
+    from tracking.tracking_competitors import track_competitors
+
+    return inspect.unwrap(track_competitors)(_make_call(data or dict(_CALL_DATA)))
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+
+def test_track_competitors_happy_path_writes_full_structure(fake_db):
+    """Crea documento principal, routes, competidores y checkpoints vía BulkWriter."""
+    result = _call()
+
+    assert result["success"] is True
+    assert result["tracking_id"] == "ev1_day1"
+    assert result["competitors_count"] == 3
+    assert result["routes_count"] == 1
+
+    from tracking.tracking_competitors import TRACKING_SCHEMA_VERSION
+
+    main_doc = fake_db.ref(_TRACKING_PATH).set.call_args[0][0]
+    assert main_doc["isActive"] is True
+    assert main_doc["dayName"] == "Día 1"
+    assert main_doc["schemaVersion"] == TRACKING_SCHEMA_VERSION
+    assert main_doc["competitorsCount"] == 3
+    assert main_doc["routesCount"] == 1
+    assert len(main_doc["sourceFingerprint"]) == 64
+
+    writes = fake_db.writes
+
+    route = writes[f"{_TRACKING_PATH}/routes/r1"]
+    assert route["checkpointIds"] == ["cp1", "cp2"]
+    assert route["categories"] == [
+        {"id": "cat1", "description": "Pro"},
+        {"id": "catX", "description": "Categoría no encontrada"},
+    ]
+
+    # Checkpoints como arreglo en el documento del competidor, sin subcolección
+    checkpoints = writes[f"{_TRACKING_PATH}/competitors/p_late"]["checkpoints"]
+    assert [checkpoint["id"] for checkpoint in checkpoints] == ["cp1", "cp2"]
+    assert checkpoints[1]["checkpointType"] == "start"
+    assert checkpoints[1]["statusCompetitor"] == "none"
+    assert not any("/checkpoints/" in path for path in writes)
+    fake_db.bulk.close.assert_called_once()
+    # Lecturas vía stream(): no se materializan las colecciones con get()
+    fake_db.participants.get.assert_not_called()
+    fake_db.checkpoints.get.assert_not_called()
+
+
+def test_track_competitors_orders_competitors_by_time_to_start(fake_db):
+    """Competidores con timeToStart primero (ascendente), luego los que no tienen."""
+    _call()
+
+    writes = fake_db.writes
+    early = writes[f"{_TRACKING_PATH}/competitors/p_early"]
+    late = writes[f"{_TRACKING_PATH}/competitors/p_late"]
+    none = writes[f"{_TRACKING_PATH}/competitors/p_none"]
+
+    assert early["order"] == 1  # pilotNumber no numérico → índice + 1
+    assert early["timeToStart"] == "2026-01-01T08:00:00Z"
+    assert late["order"] == 7  # pilotNumber numérico
+    assert late["timeToStart"] == "2026-01-01T10:00:00Z"
+    assert none["order"] == 3
+    assert "timeToStart" not in none
+
+
+def _existing_main_doc(db, **overrides):
+    """Documento principal ya construido (schemaVersion actual) con la huella actual de db."""
+    from tracking.tracking_competitors import TRACKING_SCHEMA_VERSION, _source_fingerprint
+
+    data = {
+        "schemaVersion": TRACKING_SCHEMA_VERSION,
+        "competitorsCount": 3,
+        "routesCount": 1,
+        "sourceFingerprint": _source_fingerprint(db, "ev1", "day1"),
+    }
+    data.update(overrides)
+    return _make_doc("ev1_day1", data)
+
+
+def test_track_competitors_reactivates_existing_structure():
+    """Estructura existente, fuente sin cambios → solo update del documento principal."""
+    db = _default_db()
+    db.documents[_TRACKING_PATH] = _existing_main_doc(db)
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        result = _call(dict(_CALL_DATA, dayName="Día 1 (bis)"))
+
+    assert result["success"] is True
+    assert result["reactivated"] is True
+    assert result["competitors_count"] == 3
+    assert result["routes_count"] == 1
+    update = db.ref(_TRACKING_PATH).update.call_args[0][0]
+    assert update["isActive"] is True
+    assert update["dayName"] == "Día 1 (bis)"
+    db.ref(_TRACKING_PATH).set.assert_not_called()
+    # La huella solo lee IDs: ningún documento de la fuente se deserializa
+    for participant_doc in db.participants.get.return_value:
+        participant_doc.to_dict.assert_not_called()
+    assert db.writes == {}
+
+
+def _edit_participant(db):
+    db.participants.get.return_value[0].update_time = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def _swap_participant(db):
+    db.participants.get.return_value[0].id = "p_other"
+
+
+def _rename_checkpoint(db):
+    db.checkpoints.get.return_value[1].update_time = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def _edit_route(db):
+    db.routes.get.return_value[0].update_time = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def _add_category(db):
+    db.categories.get.return_value.append(_make_doc("cat2", {"name": "Amateur"}))
+
+
+@pytest.mark.parametrize(
+    "change_source,call_overrides",
+    [
+        (_edit_participant, {}),  # timesToStart/categoría editados, mismo conteo
+        (_swap_participant, {}),  # participante reemplazado por otro
+        (_rename_checkpoint, {}),  # checkpoint renombrado o reordenado
+        (_edit_route, {}),  # route editada (las routes no se contaban)
+        (_add_category, {}),  # categoría agregada
+        (None, {"rebuild": True}),  # regeneración explícita
+    ],
+)
+def test_track_competitors_rebuilds_when_source_changed(change_source, call_overrides):
+    """Huella distinta a la guardada (o 'rebuild') → se regenera en lugar de solo reactivar."""
+    db = _default_db()
+    db.documents[_TRACKING_PATH] = _existing_main_doc(db)
+    if change_source:
+        change_source(db)
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        result = _call(dict(_CALL_DATA, **call_overrides))
+
+    from tracking.tracking_competitors import _source_fingerprint
+
+    assert "reactivated" not in result
+    assert result["competitors_count"] == 3
+    main_doc = db.ref(_TRACKING_PATH).set.call_args[0][0]
+    assert main_doc["sourceFingerprint"] == _source_fingerprint(db, "ev1", "day1")
+
+
+def test_track_competitors_rebuilds_main_doc_without_fingerprint():
+    """Documento principal anterior a la huella (sin sourceFingerprint) → se regenera."""
+    db = _default_db()
+    db.documents[_TRACKING_PATH] = _existing_main_doc(db, sourceFingerprint=None)
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        result = _call()
+
+    assert "reactivated" not in result
+    db.ref(_TRACKING_PATH).set.assert_called_once()
+
+
+def test_track_competitors_rebuilds_structure_with_old_schema():
+    """Documento principal sin schemaVersion (o con otra) → se regenera toda la estructura."""
+    db = _default_db()
+    db.documents[_TRACKING_PATH] = _make_doc("ev1_day1", {"isActive": False})
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        result = _call()
+
+    assert "reactivated" not in result
+    assert result["competitors_count"] == 3
+    db.ref(_TRACKING_PATH).set.assert_called_once()
+    assert f"{_TRACKING_PATH}/competitors/p_late" in db.writes
+
+
+def test_track_competitors_bulk_failure_does_not_write_main_doc(fake_db):
+    """Si fallan escrituras de la estructura, no se marca el documento principal."""
+    from tracking import tracking_competitors as module
+
+    def _close_with_failure():
+        on_error = fake_db.bulk.on_write_error.call_args[0][0]
+        failure = MagicMock()
+        failure.attempts = module._BULK_WRITER_MAX_ATTEMPTS
+        on_error(failure, fake_db.bulk)
+
+    fake_db.bulk.close.side_effect = _close_with_failure
+
+    with pytest.raises(https_fn.HttpsError):
+        _call()
+
+    fake_db.ref(_TRACKING_PATH).set.assert_not_called()
+
+
+def test_track_competitors_categories_fallback_from_participants():
+    """Sin event_categories, el mapa de categorías sale de los participantes."""
+    db = _default_db(
+        categories=[],
+        routes=[_make_doc("r1", {"name": "Ruta 1", "categoryIds": ["Pro"]})],
+    )
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        _call()
+
+    route = db.writes[f"{_TRACKING_PATH}/routes/r1"]
+    assert route["categories"] == [{"id": "Pro", "description": "Pro"}]
+    # El fallback reutiliza los datos ya extraídos: un solo to_dict() por participante
+    for participant_doc in db.participants.get.return_value:
+        assert participant_doc.to_dict.call_count == 1
+
+
+def test_track_competitors_event_not_in_progress_returns_failure():
+    """Evento fuera de inProgress → success False, sin escrituras."""
+    db = _default_db(event_data={"name": "Rally", "status": "draft"})
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        result = _call()
+
+    assert result["success"] is False
+    assert result["event_status"] == "draft"
+    assert db.writes == {}
+
+
+def test_track_competitors_event_not_found_raises():
+    """Evento inexistente → HttpsError not-found."""
+    db = _default_db(event_data=None)
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        with pytest.raises(https_fn.HttpsError) as exc_info:
+            _call()
+
+    assert exc_info.value.code == https_fn.FunctionsErrorCode.NOT_FOUND
+
+
+def test_track_competitors_missing_params_raises():
+    """Parámetros faltantes → HttpsError invalid-argument."""
+    with pytest.raises(https_fn.HttpsError) as exc_info:
+        _call({"eventId": "ev1"})
+
+    assert exc_info.value.code == https_fn.FunctionsErrorCode.INVALID_ARGUMENT
+
+
+def test_track_competitors_bulk_write_failures_raise_internal(fake_db):
+    """Si el BulkWriter agota reintentos en alguna operación → HttpsError internal."""
+    from tracking import tracking_competitors as module
+
+    def _close_with_failure():
+        on_error = fake_db.bulk.on_write_error.call_args[0][0]
+        failure = MagicMock()
+        failure.attempts = module._BULK_WRITER_MAX_ATTEMPTS
+        failure.operation.reference.path = _TRACKING_PATH
+        assert on_error(failure, fake_db.bulk) is False
+
+    fake_db.bulk.close.side_effect = _close_with_failure
+
+    with pytest.raises(https_fn.HttpsError) as exc_info:
+        _call()
+
+    assert exc_info.value.code == https_fn.FunctionsErrorCode.INTERNAL
+
+
+def test_track_competitors_bulk_writer_retries_transient_errors(fake_db):
+    """Errores con menos intentos que el máximo se reintentan."""
+    _call()
+
+    on_error = fake_db.bulk.on_write_error.call_args[0][0]
+    failure = MagicMock()
+    failure.attempts = 1
+    assert on_error(failure, fake_db.bulk) is True
+
+
+def test_track_competitors_background_marks_building_and_returns(fake_db):
+    """Sin wait/verbose: documento principal en 'building' y respuesta inmediata."""
+    call_data = dict(_CALL_DATA)
+    call_data.pop("wait")
+
+    result = _call(call_data)
+
+    assert result["success"] is True
+    assert result["status"] == "processing"
+    assert result["tracking_id"] == "ev1_day1"
+    main_doc = fake_db.ref(_TRACKING_PATH).set.call_args[0][0]
+    assert main_doc["status"] == "building"
+    assert main_doc["isActive"] is False
+    assert main_doc["requestedIsActive"] is True
+    fake_db.participants.stream.assert_not_called()
+    assert fake_db.writes == {}
+
+
+# ============================================================================
+# build_competitors_tracking (trigger Firestore)
+# ============================================================================
+
+
+def _make_change(after_data, before_data=None):
+    event = MagicMock()
+    after = _make_doc("ev1_day1", after_data, exists=after_data is not None)
+    after.reference = _FakeRef(_TRACKING_PATH)
+    event.data.after = after
+    event.data.before = (
+        _make_doc("ev1_day1", before_data) if before_data is not None else None
+    )
+    return event
+
+
+_BUILDING = {
+    "eventId": "ev1",
+    "dayId": "day1",
+    "dayName": "Día 1",
+    "isActive": False,
+    "requestedIsActive": True,
+    "status": "building",
+    "buildRequestedAt": "2026-01-01T08:00:00Z",
+}
+
+
+def _build(event, db):
+    from tracking.tracking_competitors import build_competitors_tracking
+
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        inspect.unwrap(build_competitors_tracking)(event)
+
+
+def test_build_competitors_tracking_builds_and_marks_ready():
+    """status 'building' nuevo → construye la estructura y deja el documento en 'ready'."""
+    db = _default_db()
+    event = _make_change(_BUILDING)
+
+    _build(event, db)
+
+    main_doc = event.data.after.reference.set.call_args[0][0]
+    assert main_doc["status"] == "ready"
+    assert main_doc["isActive"] is True
+    assert main_doc["competitorsCount"] == 3
+    assert f"{_TRACKING_PATH}/competitors/p_late" in db.writes
+
+
+def test_build_competitors_tracking_ignores_other_writes():
+    """'ready', borrado o el mismo buildRequestedAt no vuelven a construir."""
+    db = _default_db()
+
+    _build(_make_change(dict(_BUILDING, status="ready"), _BUILDING), db)
+    _build(_make_change(None, _BUILDING), db)
+    _build(_make_change(dict(_BUILDING, updatedAt="x"), _BUILDING), db)
+
+    db.participants.stream.assert_not_called()
+    assert db.writes == {}
+
+
+def test_build_competitors_tracking_marks_error_on_failure():
+    """Si la construcción falla, el documento principal queda en 'error'."""
+    db = _default_db()
+    db.bulk.close.side_effect = RuntimeError("sin conexión")
+    event = _make_change(_BUILDING)
+
+    _build(event, db)
+
+    update = event.data.after.reference.update.call_args[0][0]
+    assert update["status"] == "error"
+    assert "sin conexión" in update["errorMessage"]
+    event.data.after.reference.set.assert_not_called()
+
+
+# ============================================================================
+# track_competitors_off
+# ============================================================================
+
+_DAY_PATH = "events/ev1/day_of_races/day1"
+
+
+def _call_off(db, data=None):
+    from tracking.tracking_competitors import track_competitors_off
+
+    with patch("tracking.tracking_competitors.firestore.client", return_value=db):
+        return inspect.unwrap(track_competitors_off)(
+            _make_call(data or {"eventId": "ev1", "dayId": "day1"})
+        )
+
+
+def test_track_competitors_off_deactivates_day_and_tracking():
+    """Lee día y tracking con un solo get_all y marca ambos como inactivos."""
+    db = _default_db()
+    db.documents[_DAY_PATH] = _make_doc("day1", {"isActivate": True})
+    db.documents[_TRACKING_PATH] = _make_doc("ev1_day1", {"isActivate": True})
+
+    result = _call_off(db)
+
+    assert result["success"] is True
+    assert result["previous_status"] is True
+    day_update = db.ref(_DAY_PATH).update.call_args[0][0]
+    tracking_update = db.ref(_TRACKING_PATH).update.call_args[0][0]
+    assert day_update["isActivate"] is False
+    assert tracking_update["isActivate"] is False
+    assert day_update["updatedAt"] == tracking_update["updatedAt"]
+
+
+def test_track_competitors_off_tracking_not_found_raises():
+    """Sin documento de tracking → HttpsError not-found (el día se actualiza igual)."""
+    db = _default_db()
+    db.documents[_DAY_PATH] = _make_doc("day1", {"isActivate": True})
+
+    with pytest.raises(https_fn.HttpsError) as exc_info:
+        _call_off(db)
+
+    assert exc_info.value.code == https_fn.FunctionsErrorCode.NOT_FOUND
+    db.ref(_DAY_PATH).update.assert_called_once()
+
+
+def test_track_competitors_off_missing_params_raises():
+    """Parámetros faltantes → HttpsError invalid-argument."""
+    with pytest.raises(https_fn.HttpsError) as exc_info:
+        _call_off(_default_db(), {"eventId": "ev1"})
+
+    assert exc_info.value.code == https_fn.FunctionsErrorCode.INVALID_ARGUMENT
+
+
+def test_track_competitors_response_omits_detail_by_default(fake_db):
+    """Sin verbose la respuesta solo trae conteos, no las listas."""
+    result = _call()
+
+    assert "competitors" not in result
+    assert "routes" not in result
+
+
+def test_track_competitors_verbose_includes_detail(fake_db):
+    """Con verbose=True se incluyen competitors (con checkpoints) y routes."""
+    result = _call(dict(_CALL_DATA, verbose=True))
+
+    assert len(result["competitors"]) == 3
+    assert result["competitors"][0]["checkpointsCount"] == 2
+    assert result["competitors"][0]["checkpoints"][0] == {
+        "checkpointId": "cp1",
+        "checkpointName": "Salida",
+    }
+    assert result["routes"][0]["routeId"] == "r1"
+
+
+def test_coerce_time_to_start_slow_paths():
+    """Timestamp con timestamp(), con solo to_datetime(), strings y tipos no soportados."""
+    from tracking.tracking_competitors import _coerce_time_to_start
+
+    expected = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+    class _Timestamp:
+        def timestamp(self):
+            return expected.timestamp()
+
+    class _BrokenTimestamp:
+        def timestamp(self):
+            raise TypeError("sin timestamp")
+
+        def to_datetime(self):
+            return datetime(2026, 1, 1, 8, 0)
+
+    assert _coerce_time_to_start(_Timestamp()) == expected
+    assert _coerce_time_to_start(_BrokenTimestamp()) == expected
+    assert _coerce_time_to_start("2026-01-01T08:00:00Z") == expected
+    assert _coerce_time_to_start("2026-01-01T08:00:00") == expected
+    assert _coerce_time_to_start("no-es-fecha") is None
+    assert _coerce_time_to_start(12345) is None
@@ -0,0 +1,223 @@
+"""
+Pruebas unitarias para vehicles.update (handle) (SPRTMNTRPP-72).
+"""
+
+import json
+import sys
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, ".")
+
+VALID_BODY = {"branch": "Toyota", "model": "Hilux", "year": 2020, "color": "Rojo"}
+
+
+@pytest.fixture(autouse=True)
+def _empty_user_cache():
+    """Cada prueba arranca sin usuarios cacheados."""
+    from vehicles import user_exists_cache
+
+    with patch.object(user_exists_cache, "_user_exists_cache", OrderedDict()):
+        yield
+
+
+def _make_request(body=None, user_id: str = "user-1"):
+    """Construye un mock de Request para PUT /api/vehicles/veh-123."""
+    req = MagicMock()
+    req.method = "PUT"
+    req.path = "/api/vehicles/veh-123"
+    req.args.get.side_effect = lambda k, default=None: (
+        user_id if k == "userId" else default
+    )
+    req.get_json.return_value = dict(VALID_BODY) if body is None else body
+    return req
+
+
+def _wire_client(mock_get_db, user_exists: bool = True, vehicle_data=None):
+    """
+    Cliente mock: users/{userId} y su vehiculo se leen juntos con db.get_all.
+    vehicle_data None indica que el vehiculo no existe.
+    Retorna (client, user_ref, vehicle_ref).
+    """
+    vehicle_ref = MagicMock()
+    vehicle_ref.path = "users/user-1/vehicles/veh-123"
+    user_ref = MagicMock()
+    user_ref.path = "users/user-1"
+    user_ref.collection.return_value.document.return_value = vehicle_ref
+    client = MagicMock()
+    client.collection.return_value.document.return_value = user_ref
+
+    def _get_all(refs, field_paths=None):
+        for ref in refs:
+            snap = MagicMock()
+            snap.reference = ref
+            if ref is user_ref:
+                snap.exists = user_exists
+                snap.to_dict.return_value = {"authUserId": "user-1"}
+            else:
+                snap.exists = vehicle_data is not None
+                snap.to_dict.return_value = vehicle_data
+            yield snap
+
+    client.get_all.side_effect = _get_all
+    vehicle_doc = MagicMock()
+    vehicle_doc.exists = vehicle_data is not None
+    vehicle_doc.to_dict.return_value = vehicle_data
+    vehicle_ref.get.return_value = vehicle_doc
+    mock_get_db.return_value = client
+    return client, user_ref, vehicle_ref
+
+
+@patch("vehicles.update.get_db")
+def test_update_vehicle_reads_user_and_vehicle_in_one_get_all(mock_get_db):
+    """Happy path: una sola lectura batch (get_all) y un update -> 200."""
+    client, user_ref, vehicle_ref = _wire_client(
+        mock_get_db, vehicle_data={"photoUrl": "https://x/p.png", "mileageKm": 1200}
+    )
+
+    from vehicles.update import handle
+
+    response = handle(_make_request())
+
+    assert response.status_code == 200
+    client.get_all.assert_called_once_with(
+        [user_ref, vehicle_ref], field_paths=["authUserId", "photoUrl", "mileageKm"]
+    )
+    user_ref.get.assert_not_called()
+    vehicle_ref.get.assert_not_called()
+    vehicle_ref.update.assert_called_once()
+    body = json.loads(response.get_data())
+    assert body["id"] == "veh-123"
+    assert body["photoUrl"] == "https://x/p.png"
+    assert body["mileageKm"] == 1200
+
+
+@patch("vehicles.update.get_db")
+def test_update_vehicle_cached_user_reads_only_vehicle(mock_get_db):
+    """Segunda llamada del mismo usuario: solo se lee el vehiculo."""
+    client, _, vehicle_ref = _wire_client(mock_get_db, vehicle_data={})
+
+    from vehicles.update import handle
+
+    assert handle(_make_request()).status_code == 200
+    assert handle(_make_request()).status_code == 200
+
+    client.get_all.assert_called_once()
+    vehicle_ref.get.assert_called_once_with(field_paths=["photoUrl", "mileageKm"])
+
+
+@patch("vehicles.update.get_db")
+def test_update_vehicle_user_not_found(mock_get_db):
+    """Usuario no existe -> 404 sin escribir."""
+    _, _, vehicle_ref = _wire_client(mock_get_db, user_exists=False)
+
+    from vehicles.update import handle
+
+    response = handle(_make_request())
+
+    assert response.status_code == 404
+    vehicle_ref.update.assert_not_called()
+
+
+@patch("vehicles.update.get_db")
+def test_update_vehicle_not_found(mock_get_db):
+    """Vehiculo no existe -> 404 sin escribir."""
+    _, _, vehicle_ref = _wire_client(mock_get_db, vehicle_data=None)
+
+    from vehicles.update import handle
+
+    response = handle(_make_request())
+
+    assert response.status_code == 404
+    vehicle_ref.update.assert_not_called()
+
+
+def test_update_vehicle_invalid_body():
+    """Body invalido -> 400 sin leer Firestore."""
+    from vehicles.update import handle
+
+    response = handle(_make_request(body={"branch": "Toyota"}))
+
+    assert response.status_code == 400
+
+
+@patch("vehicles.update.get_db")
+def test_update_vehicle_full_body_cached_user_skips_read(mock_get_db):
+    """Usuario cacheado y body con photoUrl/mileageKm: update sin lectura previa."""
+    client, _, vehicle_ref = _wire_client(mock_get_db, vehicle_data={})
+    full_body = {**VALID_BODY, "photoUrl": "https://x/new.png", "mileageKm": 10}
+
+    from vehicles.update import handle
+
+    assert handle(_make_request(body=dict(full_body))).status_code == 200
+    client.get_all.reset_mock()
+    response = handle(_make_request(body=dict(full_body)))
+
+    assert response.status_code == 200
+    client.get_all.assert_not_called()
+    vehicle_ref.get.assert_not_called()
+    assert json.loads(response.get_data())["photoUrl"] == "https://x/new.png"
+
+
+@patch("vehicles.update.get_db")
+def test_update_vehicle_not_found_on_write(mock_get_db):
+    """Sin lectura previa, un vehiculo inexistente se detecta por NotFound en update -> 404."""
+    from google.api_core.exceptions import NotFound
+
+    _, _, vehicle_ref = _wire_client(mock_get_db, vehicle_data={})
+    full_body = {**VALID_BODY, "photoUrl": "https://x/new.png", "mileageKm": 10}
+
+    from vehicles.update import handle
+
+    assert handle(_make_request(body=dict(full_body))).status_code == 200
+    vehicle_ref.update.side_effect = NotFound("no document")
+    response = handle(_make_request(body=dict(full_body)))
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("/api/vehicles/veh-1", "veh-1"),
+        ("/api/vehicles/veh-1/", "veh-1"),
+        ("//api//vehicles/veh-1/extra", "veh-1"),
+        ("/api/vehicles/", None),
+        ("/api/users/veh-1", None),
+        ("", None),
+    ],
+)
+def test_vehicle_id_from_path(path, expected):
+    """Extrae vehicleId del path con el mismo criterio que el split previo."""
+    from vehicles.update import _vehicle_id_from_path
+
+    assert _vehicle_id_from_path(path) == expected
+
+
+@patch("vehicles.update.get_db")
+def test_update_vehicle_normalizes_body_once(mock_get_db):
+    """Strings sin espacios y year como int en el documento escrito."""
+    _, _, vehicle_ref = _wire_client(mock_get_db, vehicle_data={})
+    body = {"branch": " Toyota ", "model": "Hilux ", "year": "2020", "color": " Rojo"}
+
+    from vehicles.update import handle
+
+    response = handle(_make_request(body=body))
+
+    assert response.status_code == 200
+    written = vehicle_ref.update.call_args[0][0]
+    assert written["branch"] == "Toyota"
+    assert written["model"] == "Hilux"
+    assert written["color"] == "Rojo"
+    assert written["year"] == 2020
+
+
+def test_update_vehicle_blank_string_field():
+    """branch con solo espacios -> 400."""
+    from vehicles.update import handle
+
+    response = handle(_make_request(body={**VALID_BODY, "branch": "   "}))
+
+    assert response.status_code == 400
@@ -116,6 +116,25 @@ def test_user_route_post_create_dispatches_to_create(mock_validate, mock_verify)
     mock_create_handle.assert_called_once_with(req)
 
 
+@patch("users.user_route.verify_bearer_token", return_value=True)
+@patch("users.user_route.validate_request", return_value=None)
+def test_user_route_post_create_batch_dispatches_to_create_batch(mock_validate, mock_verify):
+    from users.user_route import user_route, _ROUTES
+
+    mock_batch_handle = MagicMock()
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_batch_handle.return_value = mock_resp
+    new_routes = dict(_ROUTES)
+    new_routes["create-batch"] = ("POST", mock_batch_handle)
+
+    with patch.dict("users.user_route._ROUTES", new_routes):
+        req = _make_request(path="/api/users/create-batch", method="POST")
+        response = user_route(req)
+    assert response.status_code == 200
+    mock_batch_handle.assert_called_once_with(req)
+
+
 @patch("users.user_route.verify_bearer_token", return_value=True)
 @patch("users.user_route.validate_request", return_value=None)
 def test_user_route_put_update_dispatches_to_update(mock_validate, mock_verify):
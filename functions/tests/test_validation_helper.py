@@ -0,0 +1,67 @@
+"""
+Pruebas unitarias para utils.validation_helper.
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+
+def test_validate_password_ok():
+    from utils.validation_helper import validate_password
+
+    assert validate_password("abcdefg1") == (True, "")
+    assert validate_password("1234567a") == (True, "")
+
+
+def test_validate_password_too_short():
+    from utils.validation_helper import validate_password
+
+    is_valid, msg = validate_password("abc1")
+    assert is_valid is False
+    assert "8 caracteres" in msg
+
+
+def test_validate_password_requires_ascii_letter():
+    from utils.validation_helper import validate_password
+
+    is_valid, msg = validate_password("12345678")
+    assert is_valid is False
+    assert "letra" in msg
+
+    # Igual que el patrón [a-zA-Z] anterior: letras no ASCII no cuentan
+    assert validate_password("ñññññ123")[0] is False
+
+
+def test_validate_password_requires_digit():
+    from utils.validation_helper import validate_password
+
+    is_valid, msg = validate_password("abcdefgh")
+    assert is_valid is False
+    assert "número" in msg
+
+
+def test_validate_email_and_phone():
+    from utils.validation_helper import validate_email, validate_phone
+
+    assert validate_email("rider@example.com") is True
+    assert validate_email("rider@example") is False
+    assert validate_phone("(123) 456-7890") is True
+    assert validate_phone("+521234567890") is True
+    assert validate_phone("12345") is False
+
+
+def test_parse_non_negative_int():
+    from utils.validation_helper import parse_non_negative_int
+
+    assert parse_non_negative_int(2024) == 2024
+    assert parse_non_negative_int(" 2024 ") == 2024
+    assert parse_non_negative_int("+2024") == 2024
+    assert parse_non_negative_int("++2024") is None
+    assert parse_non_negative_int(2024.0) == 2024
+    assert parse_non_negative_int("20x4") is None
+    assert parse_non_negative_int("-5") is None
+    assert parse_non_negative_int(-5) is None
+    assert parse_non_negative_int("²") is None
+    assert parse_non_negative_int(None) is None
+    assert parse_non_negative_int([2024]) is None
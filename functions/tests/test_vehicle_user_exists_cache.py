@@ -0,0 +1,53 @@
+"""
+Pruebas unitarias para vehicles.user_exists_cache.
+"""
+
+import sys
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, ".")
+
+
+def _make_user_ref(exists: bool, path: str = "users/u1"):
+    user_ref = MagicMock()
+    user_ref.path = path
+    user_ref.get.return_value.exists = exists
+    return user_ref
+
+
+def test_existing_user_is_read_once_within_ttl():
+    from vehicles import user_exists_cache
+
+    user_ref = _make_user_ref(True)
+    with patch.object(user_exists_cache, "_user_exists_cache", OrderedDict()):
+        assert user_exists_cache.user_exists(user_ref) is True
+        assert user_exists_cache.user_exists(user_ref) is True
+
+    user_ref.get.assert_called_once_with(field_paths=["authUserId"])
+
+
+def test_missing_user_is_not_cached():
+    from vehicles import user_exists_cache
+
+    user_ref = _make_user_ref(False)
+    with patch.object(user_exists_cache, "_user_exists_cache", OrderedDict()):
+        assert user_exists_cache.user_exists(user_ref) is False
+        assert user_exists_cache.user_exists(user_ref) is False
+
+    assert user_ref.get.call_count == 2
+
+
+def test_expired_entry_reads_user_again():
+    from vehicles import user_exists_cache
+
+    user_ref = _make_user_ref(True)
+    with patch.object(
+        user_exists_cache, "_user_exists_cache", OrderedDict()
+    ), patch.object(user_exists_cache.time, "monotonic") as mock_now:
+        mock_now.return_value = 100.0
+        user_exists_cache.user_exists(user_ref)
+        mock_now.return_value = 100.0 + user_exists_cache.USER_EXISTS_TTL_SECONDS + 1
+        user_exists_cache.user_exists(user_ref)
+
+    assert user_ref.get.call_count == 2
@@ -1,7 +1,11 @@
 # Tracking package
 from .track_competitor_position import track_competitor_position
 from .tracking_checkpoint import track_event_checkpoint
-from .tracking_competitors import track_competitors, track_competitors_off
+from .tracking_competitors import (
+    build_competitors_tracking,
+    track_competitors,
+    track_competitors_off,
+)
 from .tracking_route import tracking_route
 
 __all__ = [
@@ -10,5 +14,6 @@ __all__ = [
     "track_event_checkpoint",
     "track_competitors",
     "track_competitors_off",
+    "build_competitors_tracking",
 ]
 
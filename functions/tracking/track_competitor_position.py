@@ -6,11 +6,13 @@ y los guarda en Realtime Database en la ruta sport_monitor/tracking/{eventId}/{d
 con current e historial. API pública: no requiere Bearer token.
 """
 
+import itertools
 import logging
-import re
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
+import orjson
 from firebase_admin import db
 from firebase_functions import https_fn
 from utils.helper_http_verb import validate_request
@@ -18,19 +20,62 @@ from utils.helper_http_verb import validate_request
 LOG = logging.getLogger(__name__)
 LOG_PREFIX = "[track_competitor_position]"
 
+# Solo 1 de cada N escrituras exitosas se registra en INFO (WARNING/ERROR sin muestreo)
+_LOG_SAMPLE_RATE = 100
+_ok_counter = itertools.count()
+
 # Ruta base en Realtime Database (SPRTMNTRPP-75)
 RTDB_BASE_PATH = "sport_monitor/tracking"
 
 # Límite de entradas en historial para evitar crecimiento ilimitado
 HISTORIAL_MAX_SIZE = 2000
+# Al superar el límite se recorta a esta fracción del máximo: deja holgura para que las
+# escrituras siguientes vuelvan a la actualización por ruta en lugar de recortar cada vez
+HISTORIAL_TRIM_RATIO = 0.9
 
 # Realtime Database no permite en claves: . $ # [ ] /
-_RTDB_KEY_SANITIZE = re.compile(r"[.$#\[\]/]")
+_RTDB_FORBIDDEN_KEY_CHARS = ".$#[]/"
+_RTDB_KEY_TRANSLATION = str.maketrans(
+    {char: "_" for char in _RTDB_FORBIDDEN_KEY_CHARS}
+)
+
+# Headers CORS compartidos por todas las respuestas; Max-Age de 24h para que el
+# navegador cachee el preflight y no repita OPTIONS en cada envío de posición.
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+    "Access-Control-Max-Age": "86400",
+}
+
+# LRU (por instancia) de rutas cuyo historial ya se confirmó como mapa. Para esas rutas
+# se omite la lectura completa del nodo: basta contar claves con una lectura shallow.
+_MAP_SCHEMA_CACHE_MAX_SIZE = 10000
+_map_schema_cache: OrderedDict[Tuple[str, str, str], bool] = OrderedDict()
+
+
+def _is_map_schema_known(schema_key: Tuple[str, str, str]) -> bool:
+    """True si ya se escribió historial como mapa para (eventId, dayId, competitorId)."""
+    if schema_key not in _map_schema_cache:
+        return False
+    _map_schema_cache.move_to_end(schema_key)
+    return True
+
+
+def _remember_map_schema(schema_key: Tuple[str, str, str]) -> None:
+    """Marca la ruta como historial en forma de mapa, desalojando la entrada más antigua."""
+    _map_schema_cache[schema_key] = True
+    _map_schema_cache.move_to_end(schema_key)
+    if len(_map_schema_cache) > _MAP_SCHEMA_CACHE_MAX_SIZE:
+        _map_schema_cache.popitem(last=False)
 
 
 def _rtdb_safe_key(key: str) -> str:
     """Sanitiza una clave para que sea válida en Realtime Database (no permite . $ # [ ] /)."""
-    return _RTDB_KEY_SANITIZE.sub("_", key)
+    # Caso común (uuid numérico): sin caracteres prohibidos, se retorna la misma cadena
+    if not any(char in key for char in _RTDB_FORBIDDEN_KEY_CHARS):
+        return key
+    return key.translate(_RTDB_KEY_TRANSLATION)
 
 
 def _rtdb_ref(event_id: str, day_id: str, competitor_id: str):
@@ -84,35 +129,79 @@ def _time_stamp_to_id(time_stamp: str) -> int:
 def _build_current_entry(
     uuid: str, latitude: float, longitude: float
 ) -> Dict[str, Any]:
-    """Construye el objeto current (solo uuid, latitude, longitude)."""
+    """Construye el objeto current (solo uuid, latitude, longitude). Coordenadas ya convertidas a float."""
     return {
         "uuid": uuid,
-        "latitude": float(latitude),
-        "longitude": float(longitude),
+        "latitude": latitude,
+        "longitude": longitude,
     }
 
 
 def _build_historial_value(
     id_long: int,
-    coordinates: Dict[str, Any],
+    latitude: float,
+    longitude: float,
     data: Dict[str, Any],
     time_stamp: str,
 ) -> Dict[str, Any]:
-    """Construye el valor de una entrada del mapa historial (id, coordinates, data, timeStamp). Sin uuid en data."""
+    """
+    Construye el valor de una entrada del mapa historial (id, coordinates, data, timeStamp). Sin uuid en data.
+    Reutiliza las coordenadas ya convertidas; speed y type ya se validaron como string.
+    """
     return {
         "id": id_long,
         "coordinates": {
-            "latitude": float(coordinates.get("latitude")),
-            "longitude": float(coordinates.get("longitude")),
+            "latitude": latitude,
+            "longitude": longitude,
         },
         "data": {
-            "speed": str(data.get("speed", "")),
-            "type": str(data.get("type", "")),
+            "speed": data["speed"],
+            "type": data["type"],
         },
         "timeStamp": time_stamp,
     }
 
 
+def _merge_historial(
+    existing_historial: Any, historial_key: str, historial_value: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Construye el historial completo a reescribir: migra la forma legacy (lista) a mapa,
+    agrega la entrada nueva y, si supera HISTORIAL_MAX_SIZE, recorta a
+    HISTORIAL_TRIM_RATIO del máximo conservando las más recientes.
+    """
+    if existing_historial is None or not isinstance(
+        existing_historial, (dict, list)
+    ):
+        historial: Dict[str, Any] = {}
+    elif isinstance(existing_historial, list):
+        # Compatibilidad: si venía como lista, convertir a mapa con claves válidas para RTDB
+        historial = {
+            _rtdb_safe_key(str(item.get("uuid", i))): {
+                "id": _time_stamp_to_id(item.get("timeStamp", "01/01/1970 00:00:00")),
+                "coordinates": (
+                    item.get("coordinates", {})
+                    if isinstance(item.get("coordinates"), dict)
+                    else {}
+                ),
+                "data": (
+                    item.get("data", {}) if isinstance(item.get("data"), dict) else {}
+                ),
+                "timeStamp": str(item.get("timeStamp", "")),
+            }
+            for i, item in enumerate(existing_historial)
+            if isinstance(item, dict)
+        }
+    else:
+        historial = dict(existing_historial)
+    historial[historial_key] = historial_value
+    if len(historial) > HISTORIAL_MAX_SIZE:
+        trim_size = max(1, int(HISTORIAL_MAX_SIZE * HISTORIAL_TRIM_RATIO))
+        sorted_entries = sorted(historial.items(), key=lambda x: x[1].get("id", 0))
+        historial = dict(sorted_entries[-trim_size:])
+    return historial
+
+
 def _handle_track_competitor_position(
     req: https_fn.Request, skip_request_validation: bool = False
 ) -> https_fn.Response:
@@ -133,6 +222,8 @@ def _handle_track_competitor_position(
     - timeStamp (string): ej. "DD/MM/YYYY HH:mm:ss"
 
     Actualiza current y añade una entrada a historial en Realtime Database.
+    Si el historial ya es un mapa bajo el límite, solo se escribe la entrada nueva
+    (historial/{uuid}); si es lista legacy o hay que recortar, se reescribe completo.
     - current: uuid, latitude, longitude.
     - historial: mapa (no lista); clave = uuid (ISO string), valor = { id (long desde timeStamp),
       coordinates, data, timeStamp }. El id es el timeStamp del request convertido a Unix timestamp.
@@ -140,9 +231,14 @@ def _handle_track_competitor_position(
 
     Returns:
     - 200: Sin body si la operación es exitosa
+    - 204: Preflight CORS (OPTIONS)
     - 400: Parámetros o body inválidos
     - 500: Error interno
     """
+    # Preflight CORS antes de cualquier validación o acceso a RTDB
+    if req.method == "OPTIONS":
+        return https_fn.Response("", status=204, headers=_CORS_HEADERS)
+
     if not skip_request_validation:
         validation_response = validate_request(
             req, ["POST"], "track_competitor_position", return_json_error=False
@@ -157,143 +253,106 @@ def _handle_track_competitor_position(
 
         if not event_id:
             LOG.warning("%s eventId faltante o vacío", LOG_PREFIX)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
+            return https_fn.Response("", status=400, headers=_CORS_HEADERS)
         if not day_id:
             LOG.warning("%s dayId faltante o vacío", LOG_PREFIX)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
+            return https_fn.Response("", status=400, headers=_CORS_HEADERS)
         if not competitor_id:
             LOG.warning("%s competitorId faltante o vacío", LOG_PREFIX)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
+            return https_fn.Response("", status=400, headers=_CORS_HEADERS)
 
         try:
-            body = req.get_json(silent=True)
+            # orjson sobre los bytes crudos: más rápido que get_json (json stdlib)
+            raw_body = req.get_data(cache=False)
+            body = orjson.loads(raw_body) if raw_body else None
             if body is None:
                 LOG.warning("%s Request body inválido o faltante", LOG_PREFIX)
-                return https_fn.Response(
-                    "",
-                    status=400,
-                    headers={"Access-Control-Allow-Origin": "*"},
-                )
+                return https_fn.Response("", status=400, headers=_CORS_HEADERS)
         except (ValueError, TypeError) as e:
             LOG.warning("%s Error parseando JSON: %s", LOG_PREFIX, e)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
+            return https_fn.Response("", status=400, headers=_CORS_HEADERS)
 
         body_error = _validate_body(body)
         if body_error:
             LOG.warning("%s %s", LOG_PREFIX, body_error)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
+            return https_fn.Response("", status=400, headers=_CORS_HEADERS)
 
         ref = _rtdb_ref(event_id, day_id, competitor_id)
-        existing = ref.get() or {}
+        schema_key = (event_id, day_id, competitor_id)
+        if _is_map_schema_known(schema_key):
+            # Historial ya confirmado como mapa: solo se leen las claves, no los valores
+            existing_historial = None
+            historial_size = len(ref.child("historial").get(shallow=True) or {})
+        else:
+            existing_historial = (ref.get() or {}).get("historial")
+            historial_size = (
+                len(existing_historial)
+                if isinstance(existing_historial, dict)
+                else None
+            )
 
         # Mismo criterio que Dart: DateTime.now().millisecondsSinceEpoch
         uuid = str(int(datetime.now(timezone.utc).timestamp() * 1000))
 
-        coordinates = body.get("coordinates", {})
-        data = body.get("data", {})
-        time_stamp = body.get("timeStamp", "")
+        coordinates = body["coordinates"]
+        data = body["data"]
+        time_stamp = body["timeStamp"]
 
-        latitude = float(coordinates.get("latitude"))
-        longitude = float(coordinates.get("longitude"))
+        # Una sola conversión a float, compartida por current e historial
+        latitude = float(coordinates["latitude"])
+        longitude = float(coordinates["longitude"])
 
         current_entry = _build_current_entry(uuid, latitude, longitude)
         id_long = _time_stamp_to_id(time_stamp)
-        historial_value = _build_historial_value(id_long, coordinates, data, time_stamp)
+        historial_value = _build_historial_value(
+            id_long, latitude, longitude, data, time_stamp
+        )
 
-        existing_historial = existing.get("historial")
-        if existing_historial is None or not isinstance(
-            existing_historial, (dict, list)
-        ):
-            historial: Dict[str, Any] = {}
-        elif isinstance(existing_historial, list):
-            # Compatibilidad: si venía como lista, convertir a mapa con claves válidas para RTDB
-            historial = {
-                _rtdb_safe_key(str(item.get("uuid", i))): {
-                    "id": _time_stamp_to_id(
-                        item.get("timeStamp", "01/01/1970 00:00:00")
-                    ),
-                    "coordinates": (
-                        item.get("coordinates", {})
-                        if isinstance(item.get("coordinates"), dict)
-                        else {}
-                    ),
-                    "data": (
-                        item.get("data", {})
-                        if isinstance(item.get("data"), dict)
-                        else {}
-                    ),
-                    "timeStamp": str(item.get("timeStamp", "")),
+        historial_key = _rtdb_safe_key(uuid)
+        if historial_size is not None and historial_size < HISTORIAL_MAX_SIZE:
+            # Caso común: historial ya es mapa y no requiere recorte. Escritura por ruta
+            # (multi-location update): solo viaja la entrada nueva, no el historial completo.
+            ref.update(
+                {
+                    "current": current_entry,
+                    f"historial/{historial_key}": historial_value,
                 }
-                for i, item in enumerate(existing_historial)
-                if isinstance(item, dict)
-            }
+            )
         else:
-            historial = dict(existing_historial)
-        historial[_rtdb_safe_key(uuid)] = historial_value
-        if len(historial) > HISTORIAL_MAX_SIZE:
-            sorted_entries = sorted(historial.items(), key=lambda x: x[1].get("id", 0))
-            historial = dict(sorted_entries[-HISTORIAL_MAX_SIZE:])
-
-        ref.update(
-            {
-                "current": current_entry,
-                "historial": historial,
-            }
-        )
+            if existing_historial is None and historial_size is not None:
+                # Ruta en cache que alcanzó el límite: se necesita el historial completo para recortar
+                existing_historial = ref.child("historial").get()
+            historial = _merge_historial(
+                existing_historial, historial_key, historial_value
+            )
+            ref.update(
+                {
+                    "current": current_entry,
+                    "historial": historial,
+                }
+            )
+        _remember_map_schema(schema_key)
 
-        LOG.info(
-            "%s OK eventId=%s competitorId=%s dayId=%s uuid=%s",
-            LOG_PREFIX,
-            event_id,
-            competitor_id,
-            day_id,
-            uuid,
-        )
-        return https_fn.Response(
-            "",
-            status=200,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "POST, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            },
-        )
+        if next(_ok_counter) % _LOG_SAMPLE_RATE == 0 and LOG.isEnabledFor(
+            logging.INFO
+        ):
+            LOG.info(
+                "%s OK eventId=%s competitorId=%s dayId=%s uuid=%s",
+                LOG_PREFIX,
+                event_id,
+                competitor_id,
+                day_id,
+                uuid,
+            )
+        return https_fn.Response("", status=200, headers=_CORS_HEADERS)
 
     except ValueError as e:
         LOG.error("%s Error de validación: %s", LOG_PREFIX, e)
-        return https_fn.Response(
-            "",
-            status=400,
-            headers={"Access-Control-Allow-Origin": "*"},
-        )
+        return https_fn.Response("", status=400, headers=_CORS_HEADERS)
     except Exception as e:
         # Incluye errores de Firebase (ej. databaseURL no configurado), KeyError, TypeError, etc.
         LOG.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
-        return https_fn.Response(
-            "",
-            status=500,
-            headers={"Access-Control-Allow-Origin": "*"},
-        )
+        return https_fn.Response("", status=500, headers=_CORS_HEADERS)
 
 
 @https_fn.on_request()
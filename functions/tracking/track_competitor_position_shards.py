@@ -0,0 +1,48 @@
+"""
+Shards de track_competitor_position.
+
+Publica SHARD_COUNT funciones idénticas (track_competitor_position_0 .. _7) que comparten
+el handler de track_competitor_position. El cliente elige el shard con
+competitor_position_shard(competitorId) (crc32 % SHARD_COUNT) y llama a
+/api/tracking/competitor-position/{shard}. Así cada instancia ve un subconjunto estable
+de competidores y sus caches en memoria (esquema de historial, conexiones) se reutilizan.
+"""
+
+import zlib
+from typing import Callable
+
+from firebase_functions import https_fn
+
+from .track_competitor_position import _handle_track_competitor_position
+
+# Debe coincidir con el número de rewrites /api/tracking/competitor-position/{n} en firebase.json
+SHARD_COUNT = 8
+
+
+def competitor_position_shard(competitor_id: str) -> int:
+    """Shard asignado a un competidor: crc32(competitorId) % SHARD_COUNT (reproducible en el cliente)."""
+    return zlib.crc32(competitor_id.encode("utf-8")) % SHARD_COUNT
+
+
+def _make_shard_function(
+    shard: int,
+) -> Callable[[https_fn.Request], https_fn.Response]:
+    """Crea la función HTTP del shard; el nombre define el entryPoint desplegado."""
+
+    def handler(req: https_fn.Request) -> https_fn.Response:
+        return _handle_track_competitor_position(req, skip_request_validation=False)
+
+    handler.__name__ = f"track_competitor_position_{shard}"
+    handler.__qualname__ = handler.__name__
+    handler.__doc__ = f"Shard {shard} de track_competitor_position."
+    return https_fn.on_request()(handler)
+
+
+track_competitor_position_0 = _make_shard_function(0)
+track_competitor_position_1 = _make_shard_function(1)
+track_competitor_position_2 = _make_shard_function(2)
+track_competitor_position_3 = _make_shard_function(3)
+track_competitor_position_4 = _make_shard_function(4)
+track_competitor_position_5 = _make_shard_function(5)
+track_competitor_position_6 = _make_shard_function(6)
+track_competitor_position_7 = _make_shard_function(7)
@@ -1,6 +1,7 @@
 from firebase_functions import https_fn
 from firebase_admin import firestore
 from datetime import datetime
+from google.api_core.exceptions import AlreadyExists
 from models.event_document import EventDocument, EventStatus
 from models.checkpoint_tracking import (
     TrackingCheckpoint,
@@ -16,6 +17,8 @@ def track_event_checkpoint(req: https_fn.CallableRequest) -> dict:
     Función que recibe un eventId y un status.
     Si el status es 'inProgress', busca la colección en Firestore y crea
     una nueva colección llamada 'tracking_checkpoint'.
+    El documento usa el id '{eventId}_{day}' y se crea con create(): si ya existe no se
+    sobrescribe (conserva competitors y checkpoints en vivo) y se retorna el existente.
     """
     try:
         # Obtener datos de la petición callable
@@ -99,22 +102,32 @@ def track_event_checkpoint(req: https_fn.CallableRequest) -> dict:
                 status="inProgress",
             )
 
-            # Agregar el documento inicial
-            tracking_ref.add(tracking_checkpoint.to_dict())
-
+            # Id determinista por (evento, día): un reintento o doble envío no crea un
+            # duplicado con auto-id ni pisa el tracking en vivo (set con merge reemplazaría
+            # los arreglos competitors/checkpoints); se responde con el documento existente.
+            tracking_doc_ref = tracking_ref.document(f"{event_id}_{day}")
+            tracking_doc = tracking_checkpoint.to_dict()
+            already_exists = False
+            try:
+                tracking_doc_ref.create(tracking_doc)
+            except AlreadyExists:
+                already_exists = True
+                tracking_doc = tracking_doc_ref.get().to_dict() or {}
+
+            checkpoints = tracking_doc.get("checkpoints") or []
+            action = "ya existía" if already_exists else "creada"
             return {
                 "success": True,
-                "message": f"Colección 'tracking_checkpoint' creada para el evento '{event.name}' ({event_id})",
+                "message": f"Colección 'tracking_checkpoint' {action} para el evento '{event.name}' ({event_id})",
+                "already_exists": already_exists,
                 "event_id": event_id,
                 "event_name": event.name,
                 "event_status": event.status.value,
                 "status": status,
                 "tracking_data": {
-                    "checkpoints_count": len(tracking_checkpoint.checkpoints),
-                    "competitors_count": len(tracking_checkpoint.competitors),
-                    "checkpoints": [
-                        cp.to_dict() for cp in tracking_checkpoint.checkpoints
-                    ],
+                    "checkpoints_count": len(checkpoints),
+                    "competitors_count": len(tracking_doc.get("competitors") or []),
+                    "checkpoints": checkpoints,
                 },
             }
 
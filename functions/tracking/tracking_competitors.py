@@ -1,11 +1,667 @@
-from firebase_functions import https_fn
+from firebase_functions import firestore_fn, https_fn
 from firebase_admin import firestore
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from google.cloud.firestore_v1.field_path import FieldPath
 from models.event_document import EventDocument, EventStatus
 from models.checkpoint_tracking import CheckpointType
+from utils.competitor_checkpoints_helper import COMPETITOR_CHECKPOINTS_FIELD
 from utils.helpers import format_utc_to_local_datetime
 
+# Reintentos por operación del BulkWriter antes de darla por fallida
+_BULK_WRITER_MAX_ATTEMPTS = 5
+
+# Versión de la estructura de tracking (routes/competitors/checkpoints). Subirla cuando
+# cambie la forma de los documentos para que track_competitors la vuelva a generar.
+# v2: los checkpoints de cada competidor se guardan como arreglo en su documento.
+TRACKING_SCHEMA_VERSION = 2
+
+# Estado del documento principal mientras build_competitors_tracking construye la estructura
+TRACKING_STATUS_BUILDING = "building"
+TRACKING_STATUS_READY = "ready"
+TRACKING_STATUS_ERROR = "error"
+
+# Tipos de checkpoint válidos (membership O(1), sin construir el Enum) y valor por defecto
+_VALID_CHECKPOINT_TYPES = frozenset(checkpoint_type.value for checkpoint_type in CheckpointType)
+_DEFAULT_CHECKPOINT_TYPE = CheckpointType.START.value
+
+
+def _create_bulk_writer(db, write_failures: list):
+    """
+    Crea un BulkWriter que agrupa y envía en paralelo los set() de la estructura de tracking.
+
+    Las operaciones que agotan _BULK_WRITER_MAX_ATTEMPTS se registran en write_failures
+    para que el llamador falle explícitamente en lugar de perderlas en silencio.
+    """
+    bulk_writer = db.bulk_writer()
+
+    def _on_write_error(failure, _bulk_writer) -> bool:
+        if failure.attempts < _BULK_WRITER_MAX_ATTEMPTS:
+            return True
+        logging.error(
+            "track_competitors: Error escribiendo %s: %s",
+            failure.operation.reference.path,
+            failure.message,
+        )
+        write_failures.append(failure)
+        return False
+
+    bulk_writer.on_write_error(_on_write_error)
+    return bulk_writer
+
+
+def _coerce_time_to_start(value) -> datetime | None:
+    """
+    Camino lento para timesToStart que no llegan como datetime: Timestamp con
+    timestamp()/to_datetime() o string ISO 8601. Retorna datetime con tz UTC o None.
+    """
+    if callable(getattr(value, "timestamp", None)):
+        try:
+            return datetime.fromtimestamp(value.timestamp(), tz=timezone.utc)
+        except (AttributeError, TypeError):
+            if not hasattr(value, "to_datetime"):
+                return None
+            parsed = value.to_datetime()
+    elif isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _collect_participants(participants_query, day_id: str) -> list:
+    """
+    Consume el stream de participantes conservando solo lo necesario para ordenarlos y
+    crear cada competidor: tuplas (id, personalData, competitionCategory, timeToStart).
+    Los DocumentSnapshot no se retienen, así la memoria no depende del tamaño de cada documento.
+    """
+    utc = timezone.utc
+    participants = []
+    for participant_doc in participants_query.stream():
+        participant_data = participant_doc.to_dict()
+
+        # Buscar timestoStart (Map<String, DateTime>) y verificar si day_id existe
+        time_start_map = participant_data.get("timesToStart", {})
+        time_to_start = None
+
+        if time_start_map and day_id in time_start_map:
+            # Obtener el valor DateTime del mapa
+            time_start_value = time_start_map[day_id]
+
+            # Caso casi universal: Firebase Admin entrega DatetimeWithNanoseconds (datetime)
+            if isinstance(time_start_value, datetime):
+                time_to_start = (
+                    time_start_value
+                    if time_start_value.tzinfo is not None
+                    else time_start_value.replace(tzinfo=utc)
+                )
+            else:
+                time_to_start = _coerce_time_to_start(time_start_value)
+                if time_to_start is None:
+                    logging.warning(
+                        "track_competitors: No se pudo interpretar timeStart para participante %s, día %s: %s",
+                        participant_doc.id,
+                        day_id,
+                        type(time_start_value),
+                    )
+
+            logging.debug(
+                "track_competitors: Participante %s tiene timeToStart: %s para día %s",
+                participant_doc.id,
+                time_to_start,
+                day_id,
+            )
+
+        participants.append(
+            (
+                participant_doc.id,
+                participant_data.get("personalData", {}),
+                participant_data.get("competitionCategory", {}),
+                time_to_start,
+            )
+        )
+    return participants
+
+
+def _index_checkpoints(checkpoints_query) -> tuple:
+    """
+    Consume el stream de checkpoints decodificando cada uno una sola vez.
+    Retorna (datos por checkpointId, lista de checkpointIds por routeId/eventRouteId).
+    """
+    checkpoint_data_by_id = {}
+    checkpoint_ids_by_route = {}
+    for checkpoint_doc in checkpoints_query.stream():
+        checkpoint_data = checkpoint_doc.to_dict()
+        checkpoint_data_by_id[checkpoint_doc.id] = checkpoint_data
+        for route_id in checkpoint_data.get("eventRouteId", []):
+            checkpoint_ids_by_route.setdefault(route_id, []).append(checkpoint_doc.id)
+    return checkpoint_data_by_id, checkpoint_ids_by_route
+
+
+def _build_categories_map(categories_query) -> dict:
+    """
+    Mapa de categorías ID -> descripción desde el stream de event_categories.
+    El ID es el document ID y la descripción está en el campo 'name'.
+    """
+    categories_map = {}
+    for category_doc in categories_query.stream():
+        category_data = category_doc.to_dict()
+        if category_data is None:
+            continue
+
+        # El campo 'name' contiene la descripción/nombre de la categoría
+        category_description = category_data.get("name", "Sin descripción")
+        categories_map[category_doc.id] = category_description
+        logging.debug(
+            "track_competitors: Categoría mapeada - ID: %s, name (descripción): %s",
+            category_doc.id,
+            category_description,
+        )
+    return categories_map
+
+
+def _count_routes(routes_query) -> int:
+    """Cuenta las routes del evento desde el stream; en DEBUG muestra las primeras 3."""
+    debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+    routes_count = 0
+    for route_doc in routes_query.stream():
+        if debug_enabled and routes_count < 3:
+            route_data = route_doc.to_dict()
+            logging.debug(
+                "track_competitors: Route %s - name: %s, dayOfRaceIds: %s",
+                route_doc.id,
+                route_data.get("name", "N/A"),
+                route_data.get("dayOfRaceIds", []),
+            )
+        routes_count += 1
+    return routes_count
+
+
+def _source_query_fingerprint(query) -> list:
+    """
+    Entradas "id@update_time" de los documentos de query, leyendo solo el ID (sin campos):
+    cualquier alta, baja o edición de un documento cambia su entrada.
+    """
+    return sorted(
+        f"{doc.id}@{doc.update_time.isoformat()}"
+        for doc in query.select([FieldPath.document_id()]).stream()
+    )
+
+
+def _source_fingerprint(db, event_id: str, day_id: str) -> str:
+    """
+    Huella de la fuente de la estructura de tracking: hash de los IDs y update_time de los
+    checkpoints del día, participantes, categorías y routes del día (los mismos conjuntos que
+    lee _build_tracking_structure), consultados en paralelo.
+    """
+    source_queries = (
+        (
+            "checkpoints",
+            db.collection(f"events/{event_id}/checkpoints").where(
+                "dayOfRaceId", "array_contains", day_id
+            ),
+        ),
+        ("participants", db.collection(f"events/{event_id}/participants")),
+        ("event_categories", db.collection(f"events/{event_id}/event_categories")),
+        (
+            "routes",
+            db.collection(f"events/{event_id}/routes").where(
+                "dayOfRaceIds", "array_contains", day_id
+            ),
+        ),
+    )
+    with ThreadPoolExecutor(max_workers=len(source_queries)) as executor:
+        futures = [
+            (name, executor.submit(_source_query_fingerprint, query))
+            for name, query in source_queries
+        ]
+        digest = hashlib.sha256()
+        for name, future in futures:
+            for entry in future.result():
+                digest.update(f"{name}/{entry}\n".encode())
+    return digest.hexdigest()
+
+
+def _build_tracking_structure(
+    db,
+    main_doc_ref,
+    event_id: str,
+    day_id: str,
+    day_name: str,
+    day_status,
+    now_local: str,
+    verbose: bool = False,
+) -> tuple:
+    """
+    Lee checkpoints, participantes, categorías y routes del evento y escribe la estructura de
+    tracking (routes y competidores) bajo main_doc_ref; el documento principal se escribe al
+    final con status 'ready'. Retorna (competitors_count, competitors_created, routes_created);
+    las listas de detalle solo se llenan con verbose.
+    """
+    # La huella se calcula antes de leer la fuente: una edición concurrente deja una huella
+    # vieja y la siguiente llamada regenera, en lugar de guardar una huella que no corresponde
+    # a lo construido.
+    source_fingerprint = _source_fingerprint(db, event_id, day_id)
+
+    # Las lecturas de checkpoints, participantes, categorías y routes son independientes:
+    # se lanzan en paralelo para que la latencia sea la de la más lenta y no la suma.
+    # - checkpoints: events/{eventId}/checkpoints filtrados por dayOfRaceId (array) = day_id
+    # - participants: events/{eventId}/participants
+    # - categories: events/{eventId}/event_categories (descripción en el campo 'name')
+    # - routes: events/{eventId}/routes (todas, para debug) y filtradas por dayOfRaceIds = day_id
+    logging.info(
+        "track_competitors: Leyendo checkpoints, participantes, categorías y routes de events/%s para el día %s",
+        event_id,
+        day_id,
+    )
+    checkpoints_ref = db.collection(f"events/{event_id}/checkpoints")
+    participants_ref = db.collection(f"events/{event_id}/participants")
+    categories_ref = db.collection(f"events/{event_id}/event_categories")
+    routes_ref = db.collection(f"events/{event_id}/routes")
+
+    # Cada lectura usa stream() y se procesa mientras llegan los documentos; de los
+    # participantes solo se conservan tuplas mínimas, no los DocumentSnapshot completos.
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        checkpoints_future = executor.submit(
+            _index_checkpoints,
+            checkpoints_ref.where("dayOfRaceId", "array_contains", day_id),
+        )
+        participants_future = executor.submit(
+            _collect_participants, participants_ref, day_id
+        )
+        categories_future = executor.submit(_build_categories_map, categories_ref)
+        all_routes_count_future = executor.submit(_count_routes, routes_ref)
+        routes_future = executor.submit(
+            list,
+            routes_ref.where("dayOfRaceIds", "array_contains", day_id).stream(),
+        )
+        checkpoint_data_by_id, checkpoint_ids_by_route = checkpoints_future.result()
+        sorted_participants = participants_future.result()
+        categories_map = categories_future.result()
+        all_routes_count = all_routes_count_future.result()
+        routes_docs = routes_future.result()
+
+    logging.info(
+        "track_competitors: Encontrados %s checkpoints asociados al día %s",
+        len(checkpoint_data_by_id),
+        day_id,
+    )
+    logging.info(
+        "track_competitors: Encontrados %s participantes en la subcolección",
+        len(sorted_participants),
+    )
+
+    # Si no hay categorías en la colección, crear un mapa desde los participantes
+    if len(categories_map) == 0:
+        logging.info(
+            "track_competitors: No se encontraron categorías en la colección. Creando mapa desde participantes..."
+        )
+        for _, _, competition_category, _ in sorted_participants:
+            category_id = competition_category.get(
+                "id"
+            ) or competition_category.get("registrationCategory")
+            category_description = competition_category.get(
+                "registrationCategory", "Sin categoría"
+            )
+
+            if category_id and category_id not in categories_map:
+                categories_map[category_id] = category_description
+                logging.debug(
+                    "track_competitors: Categoría desde participante - ID: %s, Descripción: %s",
+                    category_id,
+                    category_description,
+                )
+
+    logging.info(
+        "track_competitors: Mapa de categorías creado con %s categorías",
+        len(categories_map),
+    )
+
+    logging.info(
+        "track_competitors: Total de routes en el evento: %s",
+        all_routes_count,
+    )
+
+    logging.info(
+        "track_competitors: Encontradas %s routes asociadas al día %s",
+        len(routes_docs),
+        day_id,
+    )
+
+    if len(routes_docs) == 0:
+        logging.warning(
+            "track_competitors: No se encontraron routes para el día %s. Verificar que las routes tengan el campo 'dayOfRaceIds' (array) que contenga el valor '%s'",
+            day_id,
+            day_id,
+        )
+
+    # Datos de checkpoint comunes a todos los competidores, resueltos una sola vez:
+    # (id, name, checkpointType, order). Tipos vacíos o inválidos se mapean a "start".
+    normalized_checkpoints = []
+    for checkpoint_id, checkpoint_data in checkpoint_data_by_id.items():
+        checkpoint_type_str = checkpoint_data.get("type", "")
+        if checkpoint_type_str in _VALID_CHECKPOINT_TYPES:
+            checkpoint_type_value = checkpoint_type_str
+        else:
+            if checkpoint_type_str:
+                logging.warning(
+                    "track_competitors: Tipo de checkpoint inválido '%s' para checkpoint %s. Usando 'start' como valor por defecto.",
+                    checkpoint_type_str,
+                    checkpoint_id,
+                )
+            checkpoint_type_value = _DEFAULT_CHECKPOINT_TYPE
+        normalized_checkpoints.append(
+            (
+                checkpoint_id,
+                checkpoint_data.get("name", "Checkpoint"),
+                checkpoint_type_value,
+                checkpoint_data.get("order", 0),
+            )
+        )
+
+    # Estado inicial de los checkpoints, idéntico para todos los competidores: se construye
+    # una vez y se reutiliza (BulkWriter.set serializa el dict al encolarlo). Va como arreglo
+    # 'checkpoints' en el documento del competidor en lugar de un documento por checkpoint;
+    # ~250 bytes por checkpoint queda muy por debajo del límite de 1 MiB por documento.
+    checkpoints_tracking_array = [
+        {
+            "id": checkpoint_id,
+            "name": checkpoint_name,
+            "checkpointType": checkpoint_type_value,
+            "checkpointDisable": None,
+            "checkpointDisableName": None,
+            "order": checkpoint_order,
+            "statusCompetitor": "none",  # Estado inicial
+            "passTime": now_local,  # Se actualizará cuando pase
+            "note": None,
+            "createdAt": now_local,
+            "updatedAt": now_local,
+        }
+        for (
+            checkpoint_id,
+            checkpoint_name,
+            checkpoint_type_value,
+            checkpoint_order,
+        ) in normalized_checkpoints
+    ]
+
+    logging.info(
+        "track_competitors: Creando estructura optimizada con ID: %s",
+        main_doc_ref.id,
+    )
+
+    # Las escrituras de routes y competidores se encolan en un BulkWriter en lugar
+    # de un set() secuencial por documento.
+    write_failures: list = []
+    bulk_writer = _create_bulk_writer(db, write_failures)
+
+    # Crear subcolección de routes (al mismo nivel que competitors)
+    # Las routes son generales para todos los competidores
+    routes_collection_ref = main_doc_ref.collection("routes")
+    routes_created = []
+
+    if len(routes_docs) > 0:
+        logging.info(
+            "track_competitors: Creando %s documentos de routes en la colección 'routes'",
+            len(routes_docs),
+        )
+
+        for route_doc in routes_docs:
+            try:
+                route_data = route_doc.to_dict()
+                route_id = route_doc.id
+
+                # Validar que route_data no sea None
+                if route_data is None:
+                    logging.warning(
+                        "track_competitors: Route %s tiene datos None, saltando...",
+                        route_id,
+                    )
+                    continue
+
+                route_doc_ref = routes_collection_ref.document(route_id)
+
+                # Mapear categoryIds a objetos con id y description
+                category_ids = route_data.get("categoryIds", [])
+                categories_with_description = []
+
+                for cat_id in category_ids:
+                    category_info = {
+                        "id": cat_id,
+                        "description": categories_map.get(
+                            cat_id, "Categoría no encontrada"
+                        ),
+                    }
+                    categories_with_description.append(category_info)
+
+                # Checkpoints cuyo eventRouteId contiene esta route
+                checkpoint_ids_list = checkpoint_ids_by_route.get(route_id, [])
+
+                route_tracking_data = {
+                    "name": route_data.get("name", ""),
+                    "routeUrl": route_data.get("routeUrl", ""),
+                    "categories": categories_with_description,
+                    "checkpointIds": checkpoint_ids_list,  # Lista de IDs de checkpoints
+                    "createdAt": now_local,
+                    "updatedAt": now_local,
+                }
+
+                bulk_writer.set(route_doc_ref, route_tracking_data)
+
+                routes_created.append(
+                    {
+                        "routeId": route_id,
+                        "routeName": route_data.get("name", "Route"),
+                        "routeUrl": route_data.get("routeUrl", ""),
+                        "checkpointsCount": len(checkpoint_ids_list),
+                    }
+                )
+                logging.debug(
+                    "track_competitors: Route %s encolada: %s con %d checkpoints",
+                    route_id,
+                    route_data.get("name", "Route"),
+                    len(checkpoint_ids_list),
+                )
+            except Exception as e:
+                logging.error(
+                    "track_competitors: Error al crear route %s: %s",
+                    route_doc.id,
+                    e,
+                    exc_info=True,
+                )
+                continue
+
+        logging.info(
+            "track_competitors: %s routes creadas exitosamente de %s encontradas",
+            len(routes_created),
+            len(routes_docs),
+        )
+    else:
+        logging.info(
+            "track_competitors: No hay routes para crear (0 routes encontradas para el día %s)",
+            day_id,
+        )
+
+    # Crear subcolección de competidores
+    competitors_collection_ref = main_doc_ref.collection("competitors")
+
+    competitors_count = 0
+    competitors_created = []
+    logging.info(
+        "track_competitors: Creando %s documentos de competidores",
+        len(sorted_participants),
+    )
+
+    # Un solo sort (estable): primero los que tienen timeToStart, del más antiguo al más
+    # nuevo; luego los que no lo tienen, en su orden original.
+    latest_time = datetime.max.replace(tzinfo=timezone.utc)
+    sorted_participants.sort(key=lambda x: (x[3] is None, x[3] or latest_time))
+
+    participants_with_time_count = sum(
+        1 for participant in sorted_participants if participant[3] is not None
+    )
+    logging.info(
+        "track_competitors: %d participantes con timeToStart, %d sin timeToStart",
+        participants_with_time_count,
+        len(sorted_participants) - participants_with_time_count,
+    )
+
+    # Crear documentos de competidores en el orden correcto
+    for i, (
+        competitor_id,
+        personal_data,
+        competition_category,
+        time_to_start,
+    ) in enumerate(sorted_participants):
+        # Crear documento del competidor
+        competitor_doc_ref = competitors_collection_ref.document(competitor_id)
+
+        competitor_data = {
+            "id": competitor_id,
+            "name": personal_data.get("fullName", "Competidor"),
+            # Asigna el orden del competidor:
+            # Si pilotNumber existe y es un número válido, usa ese número como el order.
+            # Si no, usa el índice del ciclo + 1 (i + 1) como valor por defecto.
+            "order": (
+                int(competition_category.get("pilotNumber", i + 1))
+                if competition_category.get("pilotNumber") is not None
+                and str(competition_category.get("pilotNumber")).isdigit()
+                else int(i + 1)
+            ),
+            "category": competition_category.get(
+                "registrationCategory", "Sin categoría"
+            ),
+            "number": competition_category.get("pilotNumber", "Sin número"),
+            COMPETITOR_CHECKPOINTS_FIELD: checkpoints_tracking_array,
+            "createdAt": now_local,
+            "updatedAt": now_local,
+        }
+
+        # Agregar timeToStart si existe
+        if time_to_start is not None:
+            # Asegurar que el datetime esté en UTC antes de formatearlo
+            if time_to_start.tzinfo is not None:
+                # Convertir a UTC si tiene timezone
+                time_to_start_utc = time_to_start.astimezone(timezone.utc).replace(
+                    tzinfo=None
+                )
+            else:
+                # Asumir que ya está en UTC si no tiene timezone
+                time_to_start_utc = time_to_start
+
+            competitor_data["timeToStart"] = format_utc_to_local_datetime(
+                time_to_start_utc
+            )
+            logging.debug(
+                "track_competitors: Competidor %s - order: %d, timeToStart: %s",
+                competitor_id,
+                i + 1,
+                competitor_data["timeToStart"],
+            )
+
+        bulk_writer.set(competitor_doc_ref, competitor_data)
+
+        competitors_count += 1
+        if verbose:
+            competitors_created.append(
+                {
+                    "competitorId": competitor_id,
+                    "competitorName": personal_data.get("fullName", "Competidor"),
+                    "checkpointsCount": len(normalized_checkpoints),
+                    "checkpoints": [
+                        {"checkpointId": checkpoint[0], "checkpointName": checkpoint[1]}
+                        for checkpoint in normalized_checkpoints
+                    ],
+                }
+            )
+
+        logging.debug(
+            "track_competitors: Competidor %d encolado: %s (ID: %s) con %d checkpoints",
+            i + 1,
+            competitor_data["name"],
+            competitor_id,
+            len(normalized_checkpoints),
+        )
+
+    # close() espera a que se envíen todas las operaciones encoladas
+    bulk_writer.close()
+    if write_failures:
+        raise RuntimeError(
+            f"{len(write_failures)} escrituras de tracking fallaron tras {_BULK_WRITER_MAX_ATTEMPTS} intentos"
+        )
+
+    # El documento principal (con schemaVersion) se escribe al final, solo si toda la
+    # estructura quedó escrita; así una ejecución parcial no activa la reactivación rápida.
+    main_doc_data = {
+        "eventId": event_id,
+        "dayId": day_id,
+        "dayName": day_name,
+        "isActive": day_status,
+        "schemaVersion": TRACKING_SCHEMA_VERSION,
+        "status": TRACKING_STATUS_READY,
+        "competitorsCount": competitors_count,
+        "routesCount": len(routes_created),
+        # Huella de la fuente al construir: la reactivación rápida la compara con la actual
+        "sourceFingerprint": source_fingerprint,
+        "createdAt": now_local,
+        "updatedAt": now_local,
+    }
+    main_doc_ref.set(main_doc_data)
+
+    logging.info(
+        "track_competitors: %s competidores procesados con estructura optimizada",
+        competitors_count,
+    )
+
+    return competitors_count, competitors_created, routes_created
+
+
+def _enqueue_tracking_build(
+    main_doc_ref,
+    event: EventDocument,
+    event_id: str,
+    day_id: str,
+    day_name: str,
+    day_status,
+    now_local: str,
+) -> dict:
+    """
+    Deja el documento principal en status 'building' (isActive false) y responde de inmediato;
+    build_competitors_tracking se dispara con esa escritura, construye la estructura y lo deja
+    en 'ready' con el isActive solicitado. El cliente escucha el documento principal.
+    """
+    main_doc_ref.set(
+        {
+            "eventId": event_id,
+            "dayId": day_id,
+            "dayName": day_name,
+            "isActive": False,
+            "requestedIsActive": day_status,
+            "status": TRACKING_STATUS_BUILDING,
+            "buildRequestedAt": now_local,
+            "createdAt": now_local,
+            "updatedAt": now_local,
+        }
+    )
+    logging.info(
+        "track_competitors: Construcción de %s encolada en segundo plano", main_doc_ref.id
+    )
+    return {
+        "success": True,
+        "status": "processing",
+        "message": f"Tracking de competidores en construcción para el evento '{event.name}' día {day_id}",
+        "event_id": event_id,
+        "day_id": day_id,
+        "event_name": event.name,
+        "tracking_id": main_doc_ref.id,
+        "structure_type": "optimized_granular",
+    }
+
 
 @https_fn.on_call()
 def track_competitors(req: https_fn.CallableRequest) -> dict:
@@ -13,11 +669,18 @@ def track_competitors(req: https_fn.CallableRequest) -> dict:
     Función que recibe eventId, dayId y status.
     Si el status es 'inProgress', toma los datos del evento y crea
     la estructura de tracking de competidores optimizada para actualizaciones granulares.
+    Por defecto responde {"status": "processing"} y la estructura se construye en segundo
+    plano (build_competitors_tracking); con 'wait': true se construye dentro de la llamada.
+    La respuesta solo incluye conteos; con 'verbose': true (implica 'wait') agrega el
+    detalle de competitors (con sus checkpoints) y routes.
+    Una estructura ya construida solo se reactiva si no cambió ningún checkpoint del día,
+    participante, categoría ni route del día (huella de IDs y update_time); 'rebuild': true
+    fuerza regenerarla.
     """
     try:
         # Obtener datos de la petición callable
         data = req.data
-        logging.info(f"track_competitors: Iniciando función con datos: {data}")
+        logging.debug("track_competitors: Iniciando función con datos: %s", data)
 
         # Validar parámetros requeridos
         if (
@@ -36,40 +699,56 @@ def track_competitors(req: https_fn.CallableRequest) -> dict:
         day_id = data["dayId"]
         day_status = data["status"]
         day_name = data["dayName"]
+        verbose = bool(data.get("verbose", False))
+        # 'rebuild': true fuerza regenerar la estructura aunque ya exista
+        rebuild = bool(data.get("rebuild", False))
+        # Por defecto la estructura se construye en segundo plano; 'wait' (o 'verbose', que
+        # necesita el detalle) la construye dentro de la llamada
+        wait = bool(data.get("wait", False)) or verbose
 
         logging.info(
-            f"track_competitors: Procesando evento {event_id}, día {day_id}, status {day_status}, nombre del día {day_name}"
+            "track_competitors: Procesando evento %s, día %s, status %s, nombre del día %s",
+            event_id,
+            day_id,
+            day_status,
+            day_name,
         )
 
+        # Timestamp común para createdAt/updatedAt/passTime de toda la estructura (una sola vez)
+        now_local = format_utc_to_local_datetime(datetime.now(timezone.utc))
+
         # Inicializar Firestore
         db = firestore.client()
 
         # Buscar el evento
-        logging.info(f"track_competitors: Buscando evento {event_id} en Firestore")
         event_ref = db.collection("events").document(event_id)
         event_doc = event_ref.get()
 
         if not event_doc.exists:
             logging.error(
-                f"track_competitors: Evento {event_id} no encontrado en Firestore"
+                "track_competitors: Evento %s no encontrado en Firestore",
+                event_id,
             )
             raise https_fn.HttpsError(
                 code="not-found", message=f"Evento con ID {event_id} no encontrado"
             )
 
-        logging.info(f"track_competitors: Evento {event_id} encontrado en Firestore")
-
         # Mapear el documento del evento al modelo
         event_data = event_doc.to_dict()
         event = EventDocument.from_dict(event_data, event_id)
         logging.info(
-            f"track_competitors: Evento mapeado - Nombre: {event.name}, Estado: {event.status.value}"
+            "track_competitors: Evento %s encontrado - Nombre: %s, Estado: %s",
+            event_id,
+            event.name,
+            event.status.value,
         )
 
         # Validar: solo continuar si el evento está en progreso
         if event.status != EventStatus.IN_PROGRESS:
             logging.warning(
-                f"track_competitors: Evento {event.name} no está en progreso. Estado actual: {event.status.display_name}"
+                "track_competitors: Evento %s no está en progreso. Estado actual: %s",
+                event.name,
+                event.status.display_name,
             )
             return {
                 "success": False,
@@ -79,450 +758,59 @@ def track_competitors(req: https_fn.CallableRequest) -> dict:
                 "event_status": event.status.value,
             }
 
-        # Obtener checkpoints desde la subcolección events/{eventId}/checkpoints
-        # Filtrar solo los checkpoints asociados al día específico usando dayOfRaceId
-        logging.info(
-            f"track_competitors: Buscando checkpoints en events/{event_id}/checkpoints filtrados por dayOfRaceId={day_id}"
-        )
-        checkpoints_ref = db.collection(f"events/{event_id}/checkpoints")
-        # Filtrar checkpoints que contengan el day_id en el array dayOfRaceId
-        checkpoints_query = checkpoints_ref.where(
-            "dayOfRaceId", "array_contains", day_id
-        )
-        checkpoints_docs = checkpoints_query.get()
-
-        logging.info(
-            f"track_competitors: Encontrados {len(checkpoints_docs)} checkpoints asociados al día {day_id}"
-        )
-
-        # Obtener participantes desde la subcolección events/{eventId}/participants
-        logging.info(
-            f"track_competitors: Buscando participantes en events/{event_id}/participants"
-        )
-        participants_ref = db.collection(f"events/{event_id}/participants")
-        participants_docs = participants_ref.get()
-
-        logging.info(
-            f"track_competitors: Encontrados {len(participants_docs)} participantes en la subcolección"
-        )
-
-        # Obtener categorías del evento para mapear IDs con descripciones
-        # La colección es event_categories y el campo de descripción es 'name'
-        logging.info(
-            f"track_competitors: Buscando categorías en events/{event_id}/event_categories"
-        )
-        categories_ref = db.collection(f"events/{event_id}/event_categories")
-        categories_docs = categories_ref.get()
-
-        # Crear mapa de categorías: ID -> descripción
-        # El ID es el document ID y la descripción está en el campo 'name'
-        categories_map = {}
-        for category_doc in categories_docs:
-            category_data = category_doc.to_dict()
-            if category_data is None:
-                continue
-
-            category_id = category_doc.id
-            # El campo 'name' contiene la descripción/nombre de la categoría
-            category_description = category_data.get("name", "Sin descripción")
-            categories_map[category_id] = category_description
-            logging.debug(
-                f"track_competitors: Categoría mapeada - ID: {category_id}, name (descripción): {category_description}"
-            )
-
-        # Si no hay categorías en la colección, crear un mapa desde los participantes
-        if len(categories_map) == 0:
-            logging.info(
-                f"track_competitors: No se encontraron categorías en la colección. Creando mapa desde participantes..."
-            )
-            for participant_doc in participants_docs:
-                participant_data = participant_doc.to_dict()
-                competition_category = participant_data.get("competitionCategory", {})
-                category_id = competition_category.get(
-                    "id"
-                ) or competition_category.get("registrationCategory")
-                category_description = competition_category.get(
-                    "registrationCategory", "Sin categoría"
-                )
-
-                if category_id and category_id not in categories_map:
-                    categories_map[category_id] = category_description
-                    logging.debug(
-                        f"track_competitors: Categoría desde participante - ID: {category_id}, Descripción: {category_description}"
-                    )
-
-        logging.info(
-            f"track_competitors: Mapa de categorías creado con {len(categories_map)} categorías"
-        )
-
-        # Obtener routes desde la subcolección events/{eventId}/routes
-        # Filtrar solo las routes asociadas al día específico usando dayOfRaceId
-        logging.info(
-            f"track_competitors: Buscando routes en events/{event_id}/routes filtradas por dayOfRaceId={day_id}"
-        )
-        routes_ref = db.collection(f"events/{event_id}/routes")
-
-        # Primero obtener todas las routes para debug
-        all_routes_docs = routes_ref.get()
-        logging.info(
-            f"track_competitors: Total de routes en el evento: {len(all_routes_docs)}"
-        )
-
-        if len(all_routes_docs) > 0:
-            # Mostrar información de las primeras routes para debug
-            for i, route_doc in enumerate(all_routes_docs[:3]):  # Primeras 3 para debug
-                route_data = route_doc.to_dict()
-                day_of_race_ids = route_data.get("dayOfRaceIds", [])
-                logging.info(
-                    f"track_competitors: Route {route_doc.id} - name: {route_data.get('name', 'N/A')}, dayOfRaceIds: {day_of_race_ids}"
-                )
-
-        # Filtrar routes que contengan el day_id en el array dayOfRaceIds
-        routes_query = routes_ref.where("dayOfRaceIds", "array_contains", day_id)
-        routes_docs = routes_query.get()
-
-        logging.info(
-            f"track_competitors: Encontradas {len(routes_docs)} routes asociadas al día {day_id}"
-        )
-
-        if len(routes_docs) == 0:
-            logging.warning(
-                f"track_competitors: No se encontraron routes para el día {day_id}. Verificar que las routes tengan el campo 'dayOfRaceIds' (array) que contenga el valor '{day_id}'"
-            )
-
-        # Crear el documento principal de tracking
         tracking_doc_id = f"{event_id}_{day_id}"
         collection_path = f"events_tracking/{event_id}/competitor_tracking"
-
-        logging.info(
-            f"track_competitors: Creando estructura optimizada con ID: {tracking_doc_id}"
-        )
-
-        # Crear documento principal con metadata
         main_doc_ref = db.collection(collection_path).document(tracking_doc_id)
 
-        main_doc_data = {
-            "eventId": event_id,
-            "dayId": day_id,
-            "dayName": day_name,
-            "isActive": day_status,
-            "createdAt": format_utc_to_local_datetime(datetime.utcnow()),
-            "updatedAt": format_utc_to_local_datetime(datetime.utcnow()),
-        }
-
-        main_doc_ref.set(main_doc_data)
-        logging.info(f"track_competitors: Documento principal creado")
-
-        # Crear subcolección de routes (al mismo nivel que competitors)
-        # Las routes son generales para todos los competidores
-        routes_collection_ref = main_doc_ref.collection("routes")
-        routes_created = []
-
-        if len(routes_docs) > 0:
-            logging.info(
-                f"track_competitors: Creando {len(routes_docs)} documentos de routes en la colección 'routes'"
-            )
-
-            for route_doc in routes_docs:
-                try:
-                    route_data = route_doc.to_dict()
-                    route_id = route_doc.id
-
-                    # Validar que route_data no sea None
-                    if route_data is None:
-                        logging.warning(
-                            f"track_competitors: Route {route_id} tiene datos None, saltando..."
-                        )
-                        continue
-
-                    route_doc_ref = routes_collection_ref.document(route_id)
-
-                    # Mapear categoryIds a objetos con id y description
-                    category_ids = route_data.get("categoryIds", [])
-                    categories_with_description = []
-
-                    for cat_id in category_ids:
-                        category_info = {
-                            "id": cat_id,
-                            "description": categories_map.get(
-                                cat_id, "Categoría no encontrada"
-                            ),
-                        }
-                        categories_with_description.append(category_info)
-
-                    # Obtener los checkpoints asociados a esta route
-                    checkpoint_ids_list = []
-                    for checkpoint_doc_item in checkpoints_docs:
-                        checkpoint_data_item = checkpoint_doc_item.to_dict()
-                        event_route_ids = checkpoint_data_item.get("eventRouteId", [])
-
-                        # Si este checkpoint tiene el route_id en su eventRouteId
-                        if route_id in event_route_ids:
-                            checkpoint_item_id = checkpoint_doc_item.id
-                            checkpoint_ids_list.append(checkpoint_item_id)
-
-                    route_tracking_data = {
-                        "name": route_data.get("name", ""),
-                        "routeUrl": route_data.get("routeUrl", ""),
-                        "categories": categories_with_description,
-                        "checkpointIds": checkpoint_ids_list,  # Lista de IDs de checkpoints
-                        "createdAt": format_utc_to_local_datetime(datetime.utcnow()),
-                        "updatedAt": format_utc_to_local_datetime(datetime.utcnow()),
-                    }
-
-                    route_doc_ref.set(route_tracking_data)
-
-                    routes_created.append(
-                        {
-                            "routeId": route_id,
-                            "routeName": route_data.get("name", "Route"),
-                            "routeUrl": route_data.get("routeUrl", ""),
-                            "checkpointsCount": len(checkpoint_ids_list),
-                        }
-                    )
-                    logging.info(
-                        f"track_competitors: Route {route_id} creada exitosamente: {route_data.get('name', 'Route')} con {len(checkpoint_ids_list)} checkpoints"
-                    )
-                except Exception as e:
-                    logging.error(
-                        f"track_competitors: Error al crear route {route_doc.id}: {str(e)}",
-                        exc_info=True,
-                    )
-                    continue
-
-            logging.info(
-                f"track_competitors: {len(routes_created)} routes creadas exitosamente de {len(routes_docs)} encontradas"
+        # Si la estructura ya existe con la versión actual y la fuente no cambió (misma huella
+        # de checkpoints, participantes, categorías y routes), solo se reactiva el documento
+        # principal (una escritura) en lugar de reescribir routes, competidores y checkpoints.
+        main_doc = main_doc_ref.get()
+        main_doc_existing = main_doc.to_dict() if main_doc.exists else None
+        if (
+            not rebuild
+            and main_doc_existing
+            and main_doc_existing.get("schemaVersion") == TRACKING_SCHEMA_VERSION
+            and main_doc_existing.get("sourceFingerprint")
+            == _source_fingerprint(db, event_id, day_id)
+        ):
+            main_doc_ref.update(
+                {"isActive": day_status, "dayName": day_name, "updatedAt": now_local}
             )
-        else:
             logging.info(
-                f"track_competitors: No hay routes para crear (0 routes encontradas para el día {day_id})"
+                "track_competitors: Estructura %s ya existe (schemaVersion %s), solo se reactiva",
+                tracking_doc_id,
+                TRACKING_SCHEMA_VERSION,
             )
-
-        # Crear subcolección de competidores
-        competitors_collection_ref = main_doc_ref.collection("competitors")
-
-        competitors_created = []
-        logging.info(
-            f"track_competitors: Creando {len(participants_docs)} documentos de competidores"
-        )
-
-        # Preparar lista de participantes con timeToStart para ordenar
-        participants_with_time = []
-        participants_without_time = []
-
-        for participant_doc in participants_docs:
-            participant_data = participant_doc.to_dict()
-
-            # Extraer datos del participante
-            personal_data = participant_data.get("personalData", {})
-            competition_category = participant_data.get("competitionCategory", {})
-
-            # Buscar timestoStart (Map<String, DateTime>) y verificar si day_id existe
-            time_start_map = participant_data.get("timesToStart", {})
-            time_to_start = None
-
-            if time_start_map and day_id in time_start_map:
-                # Obtener el valor DateTime del mapa
-                time_start_value = time_start_map[day_id]
-
-                # Convertir Timestamp de Firestore a datetime si es necesario
-                # Firebase Admin convierte automáticamente Timestamps a datetime con .to_dict()
-                # pero puede haber casos donde sea necesario manejar diferentes tipos
-                if isinstance(time_start_value, datetime):
-                    # Ya es un datetime (caso más común con Firebase Admin)
-                    time_to_start = time_start_value
-                    # Asegurar que esté en UTC si no tiene timezone
-                    if time_to_start.tzinfo is None:
-                        time_to_start = time_to_start.replace(tzinfo=timezone.utc)
-                elif hasattr(time_start_value, "timestamp") and callable(
-                    getattr(time_start_value, "timestamp", None)
-                ):
-                    # Es un Timestamp de Firestore (verificación por método timestamp)
-                    try:
-                        # Intentar convertir usando el método timestamp
-                        timestamp_seconds = time_start_value.timestamp()
-                        time_to_start = datetime.fromtimestamp(
-                            timestamp_seconds, tz=timezone.utc
-                        )
-                    except (AttributeError, TypeError):
-                        # Si tiene método to_datetime, usarlo
-                        if hasattr(time_start_value, "to_datetime"):
-                            time_to_start = time_start_value.to_datetime()
-                            if time_to_start.tzinfo is None:
-                                time_to_start = time_to_start.replace(
-                                    tzinfo=timezone.utc
-                                )
-                        else:
-                            time_to_start = None
-                elif isinstance(time_start_value, str):
-                    # Es un string, intentar parsearlo
-                    try:
-                        time_to_start = datetime.fromisoformat(
-                            time_start_value.replace("Z", "+00:00")
-                        )
-                    except:
-                        logging.warning(
-                            f"track_competitors: No se pudo parsear timeStart para participante {participant_doc.id}, día {day_id}"
-                        )
-                        time_to_start = None
-                else:
-                    logging.warning(
-                        f"track_competitors: Tipo de timeStart no reconocido para participante {participant_doc.id}, día {day_id}: {type(time_start_value)}"
-                    )
-                    time_to_start = None
-
-                logging.debug(
-                    f"track_competitors: Participante {participant_doc.id} tiene timeToStart: {time_to_start} para día {day_id}"
-                )
-
-            # Crear estructura temporal con los datos del participante
-            participant_info = {
-                "doc": participant_doc,
-                "data": participant_data,
-                "personal_data": personal_data,
-                "competition_category": competition_category,
-                "time_to_start": time_to_start,
-            }
-
-            if time_to_start is not None:
-                participants_with_time.append(participant_info)
-            else:
-                participants_without_time.append(participant_info)
-
-        # Ordenar participantes con timeToStart del más antiguo al más nuevo
-        participants_with_time.sort(
-            key=lambda x: x["time_to_start"] if x["time_to_start"] else datetime.max
-        )
-
-        # Combinar listas: primero los que tienen timeToStart (ordenados), luego los que no
-        sorted_participants = participants_with_time + participants_without_time
-
-        logging.info(
-            f"track_competitors: {len(participants_with_time)} participantes con timeToStart, {len(participants_without_time)} sin timeToStart"
-        )
-
-        # Crear documentos de competidores en el orden correcto
-        for i, participant_info in enumerate(sorted_participants):
-            participant_doc = participant_info["doc"]
-            participant_data = participant_info["data"]
-            personal_data = participant_info["personal_data"]
-            competition_category = participant_info["competition_category"]
-            time_to_start = participant_info["time_to_start"]
-
-            # Crear documento del competidor
-            competitor_id = participant_doc.id
-            competitor_doc_ref = competitors_collection_ref.document(competitor_id)
-
-            competitor_data = {
-                "id": competitor_id,
-                "name": personal_data.get("fullName", "Competidor"),
-                # Asigna el orden del competidor:
-                # Si pilotNumber existe y es un número válido, usa ese número como el order.
-                # Si no, usa el índice del ciclo + 1 (i + 1) como valor por defecto.
-                "order": (
-                    int(competition_category.get("pilotNumber", i + 1))
-                    if competition_category.get("pilotNumber") is not None
-                    and str(competition_category.get("pilotNumber")).isdigit()
-                    else int(i + 1)
-                ),
-                "category": competition_category.get(
-                    "registrationCategory", "Sin categoría"
-                ),
-                "number": competition_category.get("pilotNumber", "Sin número"),
-                "createdAt": format_utc_to_local_datetime(datetime.utcnow()),
-                "updatedAt": format_utc_to_local_datetime(datetime.utcnow()),
+            return {
+                "success": True,
+                "message": f"Tracking de competidores reactivado para el evento '{event.name}' día {day_id}",
+                "event_id": event_id,
+                "day_id": day_id,
+                "event_name": event.name,
+                "competitors_count": main_doc_existing.get("competitorsCount", 0),
+                "routes_count": main_doc_existing.get("routesCount", 0),
+                "tracking_id": tracking_doc_id,
+                "structure_type": "optimized_granular",
+                "reactivated": True,
             }
 
-            # Agregar timeToStart si existe
-            if time_to_start is not None:
-                # Asegurar que el datetime esté en UTC antes de formatearlo
-                if time_to_start.tzinfo is not None:
-                    # Convertir a UTC si tiene timezone
-                    time_to_start_utc = time_to_start.astimezone(timezone.utc).replace(
-                        tzinfo=None
-                    )
-                else:
-                    # Asumir que ya está en UTC si no tiene timezone
-                    time_to_start_utc = time_to_start
-
-                competitor_data["timeToStart"] = format_utc_to_local_datetime(
-                    time_to_start_utc
-                )
-                logging.debug(
-                    f"track_competitors: Competidor {competitor_id} - order: {i + 1}, timeToStart: {competitor_data['timeToStart']}"
-                )
-
-            competitor_doc_ref.set(competitor_data)
-
-            # Crear subcolección de checkpoints para este competidor
-            checkpoints_collection_ref = competitor_doc_ref.collection("checkpoints")
-
-            checkpoints_created = []
-            for checkpoint_doc in checkpoints_docs:
-                checkpoint_id = checkpoint_doc.id
-                checkpoint_data = checkpoint_doc.to_dict()
-
-                checkpoint_doc_ref = checkpoints_collection_ref.document(checkpoint_id)
-
-                # Obtener y validar el tipo de checkpoint
-                checkpoint_type_str = checkpoint_data.get("type", "")
-                checkpoint_type_value = ""
-
-                # Mapear el valor del enum CheckpointType
-                try:
-                    if checkpoint_type_str:
-                        # Validar que sea un valor válido del enum
-                        checkpoint_type_enum = CheckpointType(checkpoint_type_str)
-                        checkpoint_type_value = checkpoint_type_enum.value
-                    else:
-                        # Valor por defecto si no está especificado
-                        checkpoint_type_value = CheckpointType.START.value
-                except (ValueError, KeyError):
-                    # Si el valor no es válido, usar "start" como valor por defecto
-                    logging.warning(
-                        f"track_competitors: Tipo de checkpoint inválido '{checkpoint_type_str}' para checkpoint {checkpoint_id}. Usando 'start' como valor por defecto."
-                    )
-                    checkpoint_type_value = CheckpointType.START.value
-
-                checkpoint_tracking_data = {
-                    "id": checkpoint_id,
-                    "name": checkpoint_data.get("name", "Checkpoint"),
-                    "checkpointType": checkpoint_type_value,
-                    "checkpointDisable": None,
-                    "checkpointDisableName": None,
-                    "order": checkpoint_data.get("order", 0),
-                    "statusCompetitor": "none",  # Estado inicial
-                    "passTime": format_utc_to_local_datetime(
-                        datetime.utcnow()
-                    ),  # Se actualizará cuando pase
-                    "note": None,
-                    "createdAt": format_utc_to_local_datetime(datetime.utcnow()),
-                    "updatedAt": format_utc_to_local_datetime(datetime.utcnow()),
-                }
-
-                checkpoint_doc_ref.set(checkpoint_tracking_data)
-                checkpoints_created.append(
-                    {
-                        "checkpointId": checkpoint_id,
-                        "checkpointName": checkpoint_data.get("name", "Checkpoint"),
-                    }
-                )
-
-            competitors_created.append(
-                {
-                    "competitorId": competitor_id,
-                    "competitorName": personal_data.get("fullName", "Competidor"),
-                    "checkpointsCount": len(checkpoints_created),
-                    "checkpoints": checkpoints_created,
-                }
+        if not wait:
+            return _enqueue_tracking_build(
+                main_doc_ref, event, event_id, day_id, day_name, day_status, now_local
             )
 
-            logging.debug(
-                f"track_competitors: Competidor {i+1} creado: {competitor_data['name']} (ID: {competitor_id}) con {len(checkpoints_created)} checkpoints"
+        competitors_count, competitors_created, routes_created = (
+            _build_tracking_structure(
+                db,
+                main_doc_ref,
+                event_id,
+                day_id,
+                day_name,
+                day_status,
+                now_local,
+                verbose,
             )
-
-        logging.info(
-            f"track_competitors: {len(competitors_created)} competidores procesados con estructura optimizada"
         )
 
         result = {
@@ -531,33 +819,99 @@ def track_competitors(req: https_fn.CallableRequest) -> dict:
             "event_id": event_id,
             "day_id": day_id,
             "event_name": event.name,
-            "competitors_count": len(competitors_created),
+            "competitors_count": competitors_count,
             "routes_count": len(routes_created),
             "tracking_id": tracking_doc_id,
             "structure_type": "optimized_granular",
-            "competitors": competitors_created,
-            "routes": routes_created,
         }
+        # El detalle por competidor/route solo se serializa si el cliente lo pide
+        if verbose:
+            result["competitors"] = competitors_created
+            result["routes"] = routes_created
 
         logging.info(
-            f"track_competitors: Función completada exitosamente. Resultado: {result}"
+            "track_competitors: Función completada exitosamente. competitors=%d routes=%d tracking_id=%s",
+            competitors_count,
+            len(routes_created),
+            tracking_doc_id,
         )
         return result
 
     except https_fn.HttpsError as e:
         # Re-lanzar errores de Firebase Functions
         logging.error(
-            f"track_competitors: Error de Firebase Functions: {e.code} - {e.message}"
+            "track_competitors: Error de Firebase Functions: %s - %s",
+            e.code,
+            e.message,
         )
         raise
     except Exception as e:
         # Convertir otros errores a HttpsError
-        logging.error(f"track_competitors: Error interno: {str(e)}", exc_info=True)
+        logging.error("track_competitors: Error interno: %s", e, exc_info=True)
         raise https_fn.HttpsError(
             code="internal", message=f"Error interno del servidor: {str(e)}"
         )
 
 
+@firestore_fn.on_document_written(
+    document="events_tracking/{eventId}/competitor_tracking/{trackingId}"
+)
+def build_competitors_tracking(
+    event: firestore_fn.Event[firestore_fn.Change[firestore_fn.DocumentSnapshot | None]],
+) -> None:
+    """
+    Construye en segundo plano la estructura de tracking solicitada por track_competitors.
+    Solo actúa cuando el documento principal pasa a status 'building' con un buildRequestedAt
+    nuevo; sus propias escrituras ('ready'/'error') no lo vuelven a disparar.
+    """
+    after = event.data.after
+    if after is None or not after.exists:
+        return
+    after_data = after.to_dict() or {}
+    if after_data.get("status") != TRACKING_STATUS_BUILDING:
+        return
+
+    before = event.data.before
+    before_data = (before.to_dict() or {}) if before is not None and before.exists else {}
+    if before_data.get("status") == TRACKING_STATUS_BUILDING and before_data.get(
+        "buildRequestedAt"
+    ) == after_data.get("buildRequestedAt"):
+        return
+
+    main_doc_ref = after.reference
+    now_local = format_utc_to_local_datetime(datetime.now(timezone.utc))
+    try:
+        competitors_count, _, routes_created = _build_tracking_structure(
+            firestore.client(),
+            main_doc_ref,
+            after_data["eventId"],
+            after_data["dayId"],
+            after_data.get("dayName", ""),
+            after_data.get("requestedIsActive", True),
+            now_local,
+        )
+        logging.info(
+            "build_competitors_tracking: Estructura %s lista. competitors=%d routes=%d",
+            main_doc_ref.id,
+            competitors_count,
+            len(routes_created),
+        )
+    except Exception as e:
+        logging.error(
+            "build_competitors_tracking: Error construyendo %s: %s",
+            main_doc_ref.id,
+            e,
+            exc_info=True,
+        )
+        main_doc_ref.update(
+            {
+                "status": TRACKING_STATUS_ERROR,
+                "errorMessage": str(e),
+                "updatedAt": now_local,
+            }
+        )
+
+
 @https_fn.on_call()
 def track_competitors_off(req: https_fn.CallableRequest) -> dict:
     """
@@ -567,7 +921,7 @@ def track_competitors_off(req: https_fn.CallableRequest) -> dict:
     """
     try:
         data = req.data
-        logging.info(f"track_competitors_off: Iniciando función con datos: {data}")
+        logging.debug("track_competitors_off: Iniciando función con datos: %s", data)
 
         if not data or "eventId" not in data or "dayId" not in data:
             logging.error("track_competitors_off: Parámetros requeridos faltantes")
@@ -580,60 +934,74 @@ def track_competitors_off(req: https_fn.CallableRequest) -> dict:
         day_id = data["dayId"]
 
         logging.info(
-            f"track_competitors_off: Procesando evento {event_id}, día {day_id}"
+            "track_competitors_off: Procesando evento %s, día %s",
+            event_id,
+            day_id,
         )
 
         db = firestore.client()
+        now_local = format_utc_to_local_datetime(datetime.now(timezone.utc))
 
-        # Actualizar el documento del día en events/{event_id}/day_of_races/{day_id}
+        # Referencias: día en events/{event_id}/day_of_races/{day_id} y documento de tracking
+        # en events_tracking/{event_id}/competitor_tracking/{eventId_dayId}
         day_of_race_ref = db.collection(f"events/{event_id}/day_of_races").document(
             day_id
         )
-        day_of_race_doc = day_of_race_ref.get()
+        tracking_doc_id = f"{event_id}_{day_id}"
+        collection_path = f"events_tracking/{event_id}/competitor_tracking"
+        tracking_ref = db.collection(collection_path).document(tracking_doc_id)
+
+        # Ambos documentos en una sola lectura (get_all no garantiza orden: se indexa por path)
+        logging.info(
+            "track_competitors_off: Leyendo día %s y tracking %s en una sola llamada",
+            day_id,
+            tracking_doc_id,
+        )
+        snapshots_by_path = {
+            snapshot.reference.path: snapshot
+            for snapshot in db.get_all([day_of_race_ref, tracking_ref])
+        }
+        day_of_race_doc = snapshots_by_path[day_of_race_ref.path]
+        tracking_doc = snapshots_by_path[tracking_ref.path]
 
+        # Actualizar el documento del día
         if day_of_race_doc.exists:
             # Obtener estado actual del día
             day_of_race_data = day_of_race_doc.to_dict()
             current_day_is_active = day_of_race_data.get("isActivate", True)
 
             logging.info(
-                f"track_competitors_off: Actualizando documento del día {day_id} en events/{event_id}/day_of_races"
+                "track_competitors_off: Actualizando documento del día %s en events/%s/day_of_races",
+                day_id,
+                event_id,
             )
             logging.info(
-                f"track_competitors_off: Estado actual isActivate del día: {current_day_is_active}"
+                "track_competitors_off: Estado actual isActivate del día: %s",
+                current_day_is_active,
             )
 
             # Actualizar el documento del día con isActivate = false
             day_of_race_ref.update(
                 {
                     "isActivate": False,
-                    "updatedAt": format_utc_to_local_datetime(datetime.utcnow()),
+                    "updatedAt": now_local,
                 }
             )
 
             logging.info(
-                f"track_competitors_off: Documento del día actualizado exitosamente. isActivate cambiado a False"
+                "track_competitors_off: Documento del día actualizado exitosamente. isActivate cambiado a False"
             )
         else:
             logging.warning(
-                f"track_competitors_off: Documento del día {day_id} no encontrado en events/{event_id}/day_of_races"
+                "track_competitors_off: Documento del día %s no encontrado en events/%s/day_of_races",
+                day_id,
+                event_id,
             )
 
-        # Construir el ID del documento de tracking
-        tracking_doc_id = f"{event_id}_{day_id}"
-        collection_path = f"events_tracking/{event_id}/competitor_tracking"
-
-        logging.info(
-            f"track_competitors_off: Buscando documento {tracking_doc_id} en {collection_path}"
-        )
-
-        # Buscar el documento de tracking
-        tracking_ref = db.collection(collection_path).document(tracking_doc_id)
-        tracking_doc = tracking_ref.get()
-
         if not tracking_doc.exists:
             logging.error(
-                f"track_competitors_off: Documento de tracking {tracking_doc_id} no encontrado"
+                "track_competitors_off: Documento de tracking %s no encontrado",
+                tracking_doc_id,
             )
             raise https_fn.HttpsError(
                 code="not-found",
@@ -641,7 +1009,8 @@ def track_competitors_off(req: https_fn.CallableRequest) -> dict:
             )
 
         logging.info(
-            f"track_competitors_off: Documento de tracking {tracking_doc_id} encontrado"
+            "track_competitors_off: Documento de tracking %s encontrado",
+            tracking_doc_id,
         )
 
         # Obtener datos actuales del documento
@@ -649,19 +1018,20 @@ def track_competitors_off(req: https_fn.CallableRequest) -> dict:
         current_is_active = tracking_data.get("isActivate", True)
 
         logging.info(
-            f"track_competitors_off: Estado actual isActive del tracking: {current_is_active}"
+            "track_competitors_off: Estado actual isActive del tracking: %s",
+            current_is_active,
         )
 
         # Actualizar el documento con isActive = false
         tracking_ref.update(
             {
                 "isActivate": False,
-                "updatedAt": format_utc_to_local_datetime(datetime.utcnow()),
+                "updatedAt": now_local,
             }
         )
 
         logging.info(
-            f"track_competitors_off: Documento de tracking actualizado exitosamente. isActivate cambiado a False"
+            "track_competitors_off: Documento de tracking actualizado exitosamente. isActivate cambiado a False"
         )
 
         result = {
@@ -675,17 +1045,20 @@ def track_competitors_off(req: https_fn.CallableRequest) -> dict:
         }
 
         logging.info(
-            f"track_competitors_off: Función completada exitosamente. Resultado: {result}"
+            "track_competitors_off: Función completada exitosamente. Resultado: %s",
+            result,
         )
         return result
 
     except https_fn.HttpsError as e:
         logging.error(
-            f"track_competitors_off: Error de Firebase Functions: {e.code} - {e.message}"
+            "track_competitors_off: Error de Firebase Functions: %s - %s",
+            e.code,
+            e.message,
         )
         raise
     except Exception as e:
-        logging.error(f"track_competitors_off: Error interno: {str(e)}", exc_info=True)
+        logging.error("track_competitors_off: Error interno: %s", e, exc_info=True)
         raise https_fn.HttpsError(
             code="internal", message=f"Error interno del servidor: {str(e)}"
         )
@@ -14,6 +14,8 @@ from utils.datetime_helper import get_current_timestamp
 from utils.firestore_helper import FirestoreHelper
 from utils.validation_helper import validate_email
 
+from .user_document import build_create_document
+
 
 def _find_user_by_email(
     helper: FirestoreHelper, email: str
@@ -28,20 +30,6 @@ def _find_user_by_email(
     return results[0]
 
 
-def _build_create_document(request_data: Dict[str, Any]) -> Dict[str, Any]:
-    now = get_current_timestamp()
-    email = request_data.get("email", "").strip()
-    return {
-        "email": email,
-        "username": email,
-        "authUserId": request_data.get("authUserId"),
-        "avatarUrl": request_data.get("avatarUrl"),
-        "isActive": True,
-        "createdAt": now,
-        "updatedAt": now,
-    }
-
-
 def _build_update_fields(
     request_data: Dict[str, Any], existing_username: str
 ) -> Dict[str, Any]:
@@ -60,7 +48,8 @@ def _build_update_fields(
 def _validate_body(request_data: Any) -> Optional[str]:
     if not request_data or not isinstance(request_data, dict):
         return "Request body inválido o faltante"
-    email = request_data.get("email", "").strip() if isinstance(request_data.get("email"), str) else ""
+    email = request_data.get("email")
+    email = email.strip() if isinstance(email, str) else ""
     if not email:
         return "email es requerido"
     if not validate_email(email):
@@ -114,7 +103,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
                 },
             )
 
-        user_doc = _build_create_document(request_data)
+        user_doc = build_create_document(request_data)
         new_id = helper.create_document(FirestoreCollections.USERS, user_doc)
         logging.info("create: Usuario creado: userId=%s email=%s", new_id, email)
         return https_fn.Response(
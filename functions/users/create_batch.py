@@ -0,0 +1,172 @@
+"""
+Create Users Batch - Alta masiva de usuarios (Firebase Auth + colección users).
+
+Lógica de negocio únicamente. La validación CORS y Bearer token la realiza user_route; aquí
+se exige además el custom claim admin=true (solo administradores pueden crear cuentas en masa).
+Pensado para importaciones/migraciones: las cuentas de Auth se crean en paralelo y los
+documentos users (ID autogenerado, como users/create) se escriben en una sola sesión de
+BulkWriter. Si el documento de un usuario no se puede escribir, su cuenta de Auth se elimina
+(Auth es la fuente de verdad).
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from firebase_functions import https_fn
+from models.firestore_collections import FirestoreCollections
+from utils.auth_helper import create_firebase_auth_user, delete_firebase_auth_user
+from utils.firestore_helper import FirestoreHelper
+from utils.helper_http import get_bearer_claims
+from utils.validation_helper import validate_email, validate_password
+
+from .user_document import build_create_document
+
+# Máximo de usuarios por request y llamadas concurrentes a Firebase Auth
+MAX_USERS_PER_BATCH = 500
+_AUTH_MAX_WORKERS = 20
+
+# Custom claim (Firebase Auth) requerido para usar el endpoint
+ADMIN_CLAIM = "admin"
+
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_JSON_HEADERS = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+}
+
+
+def _validate_body(request_data: Any) -> Optional[str]:
+    if not request_data or not isinstance(request_data, dict):
+        return "Request body inválido o faltante"
+    users = request_data.get("users")
+    if not isinstance(users, list) or not users:
+        return "users debe ser una lista no vacía"
+    if len(users) > MAX_USERS_PER_BATCH:
+        return f"users admite como máximo {MAX_USERS_PER_BATCH} elementos"
+    seen_emails = set()
+    for i, user in enumerate(users):
+        if not isinstance(user, dict):
+            return f"users[{i}] debe ser un objeto"
+        email = user.get("email")
+        email = email.strip() if isinstance(email, str) else ""
+        if not email or not validate_email(email):
+            return f"users[{i}]: email inválido o faltante"
+        if email.lower() in seen_emails:
+            return f"users[{i}]: email duplicado en el batch"
+        seen_emails.add(email.lower())
+        is_valid, msg = validate_password(user.get("password") or "")
+        if not is_valid:
+            return f"users[{i}]: {msg}"
+    return None
+
+
+def _create_auth_user(user: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Crea la cuenta de Auth. Retorna (uid, None) o (None, mensaje de error)."""
+    try:
+        return create_firebase_auth_user(user["email"].strip(), user["password"]), None
+    except Exception as e:
+        return None, str(e)
+
+
+def handle(req: https_fn.Request) -> https_fn.Response:
+    """
+    POST /api/users/create-batch con body {"users": [{"email", "password", "avatarUrl"?}, ...]}.
+    Asume request ya validado y autenticado; el token debe traer el claim admin=true.
+
+    Returns:
+    - 200: {"created": [{"email", "id"}], "failed": [{"email", "error"}]} (éxito parcial posible)
+    - 400: body inválido (sin cuerpo)
+    - 403: token sin claim admin (sin cuerpo)
+    - 500: error interno (sin cuerpo)
+    """
+    try:
+        claims = get_bearer_claims(req, "create_batch")
+        if not claims or claims.get(ADMIN_CLAIM) is not True:
+            logging.warning(
+                "create_batch: Acceso denegado (sin claim %s): uid=%s",
+                ADMIN_CLAIM,
+                (claims or {}).get("uid"),
+            )
+            return https_fn.Response("", status=403, headers=_CORS_HEADERS)
+
+        try:
+            request_data = req.get_json(silent=True)
+        except (ValueError, TypeError) as e:
+            logging.warning("create_batch: Error parseando JSON: %s", e)
+            return https_fn.Response("", status=400, headers=_CORS_HEADERS)
+
+        validation_error = _validate_body(request_data)
+        if validation_error:
+            logging.warning("create_batch: Validación fallida: %s", validation_error)
+            return https_fn.Response("", status=400, headers=_CORS_HEADERS)
+
+        users: List[Dict[str, Any]] = request_data["users"]
+
+        # 1. Cuentas de Auth en paralelo (cada alta es un round-trip independiente)
+        with ThreadPoolExecutor(
+            max_workers=min(_AUTH_MAX_WORKERS, len(users))
+        ) as executor:
+            auth_results = list(executor.map(_create_auth_user, users))
+
+        helper = FirestoreHelper()
+        created: List[Dict[str, str]] = []
+        failed: List[Dict[str, str]] = []
+        # ID de documento autogenerado -> documento, email y uid de Auth
+        user_docs: Dict[str, Dict[str, Any]] = {}
+        email_by_doc_id: Dict[str, str] = {}
+        uid_by_doc_id: Dict[str, str] = {}
+        for user, (uid, error) in zip(users, auth_results):
+            email = user["email"].strip()
+            if uid is None:
+                failed.append({"email": email, "error": error or "Error creando auth user"})
+                continue
+            doc_id = helper.new_document_id(FirestoreCollections.USERS)
+            user_docs[doc_id] = build_create_document(
+                {"email": email, "authUserId": uid, "avatarUrl": user.get("avatarUrl")}
+            )
+            email_by_doc_id[doc_id] = email
+            uid_by_doc_id[doc_id] = uid
+
+        # 2. Documentos users en una sola sesión de BulkWriter
+        failed_doc_ids = set()
+        if user_docs:
+            try:
+                failed_doc_ids = set(helper.bulk_set(FirestoreCollections.USERS, user_docs))
+            except Exception as e:
+                # Sin confirmación de escritura: se revierten todas las cuentas creadas
+                logging.error("create_batch: Error en BulkWriter: %s", e, exc_info=True)
+                failed_doc_ids = set(user_docs)
+
+        # 3. Rollback de Auth para los usuarios sin documento
+        if failed_doc_ids:
+            failed_uids = [uid_by_doc_id[doc_id] for doc_id in failed_doc_ids]
+            with ThreadPoolExecutor(
+                max_workers=min(_AUTH_MAX_WORKERS, len(failed_uids))
+            ) as executor:
+                list(executor.map(delete_firebase_auth_user, failed_uids))
+
+        for doc_id, email in email_by_doc_id.items():
+            if doc_id in failed_doc_ids:
+                failed.append({"email": email, "error": "Error escribiendo documento de usuario"})
+            else:
+                created.append({"email": email, "id": doc_id})
+
+        logging.info(
+            "create_batch: created=%d failed=%d", len(created), len(failed)
+        )
+        return https_fn.Response(
+            json.dumps({"created": created, "failed": failed}, ensure_ascii=False),
+            status=200,
+            headers=_JSON_HEADERS,
+        )
+
+    except ValueError as e:
+        logging.error("create_batch: Error de validación: %s", e)
+        return https_fn.Response("", status=400, headers=_CORS_HEADERS)
+    except (AttributeError, KeyError, RuntimeError, TypeError) as e:
+        logging.error("create_batch: Error interno: %s", e, exc_info=True)
+        return https_fn.Response("", status=500, headers=_CORS_HEADERS)
@@ -4,13 +4,13 @@ Read profile - Obtiene perfil básico de usuario (id, authUserId, avatarUrl, ema
 Lógica de negocio únicamente. La validación CORS y Bearer token la realiza user_route.
 """
 
-import json
 import logging
 
-from firebase_admin import firestore
+import orjson
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
-from utils.helpers import convert_firestore_value
+from utils.firestore_helper import get_db
+from utils.helpers import ORJSON_RESPONSE_OPTIONS, convert_firestore_value
 from utils.validation_helper import validate_email
 
 USER_PROFILE_FIELDS = ("authUserId", "avatarUrl", "email", "username")
@@ -21,23 +21,21 @@ def _find_user_by_email(db, email_param: str):
     if not email_param or not email_param.strip():
         return None
     users_ref = db.collection(FirestoreCollections.USERS)
-    query_snapshot = (
-        users_ref.where("email", "==", email_param.strip()).limit(1).get()
-    )
-    if query_snapshot and len(query_snapshot) > 0:
-        return query_snapshot[0]
-    return None
+    query = users_ref.where("email", "==", email_param.strip()).limit(1)
+    return next(query.stream(), None)
 
 
 def _build_profile_response(user_doc) -> dict:
     user_data = user_doc.to_dict()
     if user_data is None:
         return {}
-    result = {"id": user_doc.id}
-    for field in USER_PROFILE_FIELDS:
-        value = user_data.get(field)
-        result[field] = convert_firestore_value(value) if value is not None else None
-    return result
+    return {
+        "id": user_doc.id,
+        **{
+            field: convert_firestore_value(user_data.get(field))
+            for field in USER_PROFILE_FIELDS
+        },
+    }
 
 
 def handle(req: https_fn.Request) -> https_fn.Response:
@@ -61,7 +59,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
                 headers={"Access-Control-Allow-Origin": "*"},
             )
 
-        db = firestore.client()
+        db = get_db()
         user_doc = _find_user_by_email(db, email_param)
 
         if user_doc is None:
@@ -82,7 +80,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
 
         profile_data = _build_profile_response(user_doc)
         return https_fn.Response(
-            json.dumps(profile_data, ensure_ascii=False),
+            orjson.dumps(profile_data, option=ORJSON_RESPONSE_OPTIONS),
             status=200,
             headers={
                 "Content-Type": "application/json; charset=utf-8",
@@ -5,14 +5,14 @@ Lógica de negocio únicamente. La validación CORS y Bearer token la realiza us
 Formato de respuesta alineado a get_event_competitor_by_email (excluir createdAt/updatedAt, incluir id).
 """
 
-import json
 import logging
 from typing import Any, Dict, List, Optional
 
+import orjson
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
 from utils.firestore_helper import FirestoreHelper
-from utils.helpers import convert_firestore_value
+from utils.helpers import ORJSON_RESPONSE_OPTIONS, convert_firestore_value
 
 _EXCLUDED_FIELDS = {"createdAt", "updatedAt"}
 
@@ -31,6 +31,7 @@ _PERSONAL_DATA_RESPONSE_FIELDS = (
     "country",
     "postalCode",
 )
+_PERSONAL_DATA_EMPTY_RESPONSE = dict.fromkeys(_PERSONAL_DATA_RESPONSE_FIELDS)
 
 
 def _resolve_user_id(helper: FirestoreHelper, user_id: str) -> Optional[str]:
@@ -101,13 +102,12 @@ def handle(req: https_fn.Request, section: str) -> https_fn.Response:
                     user_doc = helper.get_document(FirestoreCollections.USERS, user_id)
                     email_val = (user_doc.get("email") if user_doc else None)
                     body = {
-                        "email": convert_firestore_value(email_val) if email_val is not None else None,
+                        "email": convert_firestore_value(email_val),
+                        **_PERSONAL_DATA_EMPTY_RESPONSE,
                     }
-                    for field in _PERSONAL_DATA_RESPONSE_FIELDS:
-                        body[field] = None
                     logging.info("read_sections: personalData vacío, retornando email y nulls: userId=%s", user_id)
                     return https_fn.Response(
-                        json.dumps(body, ensure_ascii=False),
+                        orjson.dumps(body, option=ORJSON_RESPONSE_OPTIONS),
                         status=200,
                         headers={
                             "Content-Type": "application/json; charset=utf-8",
@@ -135,7 +135,7 @@ def handle(req: https_fn.Request, section: str) -> https_fn.Response:
             body = [_doc_to_response_item(doc_id, doc_data) for doc_id, doc_data in results]
 
         return https_fn.Response(
-            json.dumps(body, ensure_ascii=False),
+            orjson.dumps(body, option=ORJSON_RESPONSE_OPTIONS),
             status=200,
             headers={
                 "Content-Type": "application/json; charset=utf-8",
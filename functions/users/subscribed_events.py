@@ -2,22 +2,29 @@
 Eventos suscritos del usuario - Obtiene los eventos en los que el userId está suscrito (membership).
 
 Lógica de negocio únicamente. La validación CORS y Bearer token la realiza user_route.
-Lee users/{userId}/membership, resuelve cada evento y su event_content, devuelve respuesta paginada.
+Lee users/{userId}/membership, resuelve los eventos de la página con un get_all y su event_content
+en paralelo, devuelve respuesta paginada.
 Cada ítem de evento usa el mismo shape que GET /api/events (EventShortDocument + overrides de event_content).
 Solo la respuesta 200 retorna JSON; errores retornan cuerpo vacío.
 """
 
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
-from events.event_short_document import EventShortDocument
+import orjson
+from events.event_short_document import EVENT_SHORT_SOURCE_FIELDS, EventShortDocument
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
 from models.paginated_response import PaginatedResponse
 from utils.firestore_helper import FirestoreHelper
+from utils.helpers import ORJSON_RESPONSE_OPTIONS
 
 _CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+# Lecturas de event_content concurrentes por página
+_EVENT_CONTENT_MAX_WORKERS = 10
+# Únicos campos de event_content que usa la respuesta
+_EVENT_CONTENT_FIELDS = ["photoMain", "address"]
 _JSON_HEADERS = {
     "Content-Type": "application/json; charset=utf-8",
     "Access-Control-Allow-Origin": "*",
@@ -35,6 +42,17 @@ def _resolve_user_id(helper: FirestoreHelper, user_id: str) -> str | None:
     return user_id if doc is not None else None
 
 
+def _get_event_content(
+    helper: FirestoreHelper, event_id: str
+) -> Dict[str, Any] | None:
+    """Primer documento de events/{eventId}/event_content o None."""
+    event_content_path = f"{FirestoreCollections.EVENTS}/{event_id}/{FirestoreCollections.EVENT_CONTENT}"
+    event_content_results = helper.query_documents(
+        event_content_path, limit=1, field_paths=_EVENT_CONTENT_FIELDS
+    )
+    return event_content_results[0][1] if event_content_results else None
+
+
 def _build_event_short_for_subscribed(
     event_id: str,
     event_doc: Dict[str, Any],
@@ -126,19 +144,37 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         has_more = total > start + limit
         last_doc_id = event_ids_page[-1] if event_ids_page and has_more else None
 
-        items: List[Dict[str, Any]] = []
-        for event_id in event_ids_page:
-            event_doc = helper.get_document(FirestoreCollections.EVENTS, event_id)
-            if event_doc is None:
-                continue
-            event_content_path = f"{FirestoreCollections.EVENTS}/{event_id}/{FirestoreCollections.EVENT_CONTENT}"
-            event_content_results = helper.query_documents(event_content_path, limit=1)
-            event_content_doc = event_content_results[0][1] if event_content_results else None
-            items.append(
-                _build_event_short_for_subscribed(
-                    event_id, event_doc, event_content_doc
+        # Eventos de la página en una sola lectura (get_all) y su event_content en paralelo,
+        # en lugar de dos round-trips secuenciales por evento.
+        events_by_id = helper.multi_get(
+            FirestoreCollections.EVENTS,
+            event_ids_page,
+            field_paths=list(EVENT_SHORT_SOURCE_FIELDS),
+        )
+        found_event_ids = [
+            event_id for event_id in event_ids_page if event_id in events_by_id
+        ]
+        event_content_by_id: Dict[str, Dict[str, Any] | None] = {}
+        if found_event_ids:
+            with ThreadPoolExecutor(
+                max_workers=min(_EVENT_CONTENT_MAX_WORKERS, len(found_event_ids))
+            ) as executor:
+                event_content_by_id = dict(
+                    zip(
+                        found_event_ids,
+                        executor.map(
+                            lambda event_id: _get_event_content(helper, event_id),
+                            found_event_ids,
+                        ),
+                    )
                 )
+
+        items: List[Dict[str, Any]] = [
+            _build_event_short_for_subscribed(
+                event_id, events_by_id[event_id], event_content_by_id.get(event_id)
             )
+            for event_id in found_event_ids
+        ]
 
         paginated = PaginatedResponse.create(
             items=items,
@@ -149,7 +185,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         )
         response_data = paginated.to_dict()
         return https_fn.Response(
-            json.dumps(response_data, ensure_ascii=False),
+            orjson.dumps(response_data, option=ORJSON_RESPONSE_OPTIONS),
             status=200,
             headers=_JSON_HEADERS,
         )
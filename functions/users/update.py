@@ -14,13 +14,15 @@ from utils.datetime_helper import get_current_timestamp
 from utils.firestore_helper import FirestoreHelper
 from utils.validation_helper import validate_email, validate_phone
 
-_KNOWN_SECTIONS = {"email", "username", "personalData", "healthData", "emergencyContacts", "vehicleData"}
+_KNOWN_SECTIONS = frozenset(
+    {"email", "username", "personalData", "healthData", "emergencyContacts", "vehicleData"}
+)
 
 
 def _validate_request_data(request_data: Dict[str, Any]) -> Optional[str]:
     if not request_data or not isinstance(request_data, dict):
         return "Request body inválido o faltante"
-    if not any(k in request_data for k in _KNOWN_SECTIONS):
+    if request_data.keys().isdisjoint(_KNOWN_SECTIONS):
         return "No hay datos para actualizar"
     email = request_data.get("email")
     if email is not None:
@@ -109,7 +111,7 @@ def _update_personal_data(helper: FirestoreHelper, user_id: str, personal_data:
 def _update_health_data(helper: FirestoreHelper, user_id: str, health_data: Dict[str, Any]) -> None:
     now = get_current_timestamp()
     subcol_path = f"{FirestoreCollections.USERS}/{user_id}/{FirestoreCollections.USER_HEALTH_DATA}"
-    fields = {k: v for k, v in health_data.items()}
+    fields = dict(health_data)
     fields["updatedAt"] = now
     existing_ids = helper.list_document_ids(subcol_path)
     if existing_ids:
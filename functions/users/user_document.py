@@ -0,0 +1,25 @@
+"""
+Documento de la colección users compartido por las altas de usuario (create y create_batch).
+"""
+
+from typing import Any, Dict
+
+from utils.datetime_helper import get_current_timestamp
+
+
+def build_create_document(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Documento nuevo de users a partir de email, authUserId y avatarUrl (opcional).
+    El username inicial es el email.
+    """
+    now = get_current_timestamp()
+    email = request_data.get("email", "").strip()
+    return {
+        "email": email,
+        "username": email,
+        "authUserId": request_data.get("authUserId"),
+        "avatarUrl": request_data.get("avatarUrl"),
+        "isActive": True,
+        "createdAt": now,
+        "updatedAt": now,
+    }
@@ -1,10 +1,10 @@
 """
-Router central para API de usuarios: /api/users/read, /api/users/profile, /api/users/{section}, /api/users/subscribedEvents, /api/users/create, /api/users/update, /api/users/my-routes.
+Router central para API de usuarios: /api/users/read, /api/users/profile, /api/users/{section}, /api/users/subscribedEvents, /api/users/create, /api/users/create-batch, /api/users/update, /api/users/my-routes.
 
 Secciones: personalData, healthData, emergencyContacts, vehicles, membership (GET /api/users/{section}).
 DELETE solo para emergencyContacts y vehicles (/api/users/{section}?userId=xxx&id=docId).
 Rutas my-routes: POST/GET en /api/users/my-routes; PUT/DELETE en /api/users/my-routes/{routeId}/notes; DELETE en /api/users/my-routes/{routeId}.
-Valida CORS, método HTTP y Bearer token una vez; despacha por path a create.handle, read.handle, read_sections.handle, delete_section_item.handle, update.handle, create_my_route.handle, get_my_routes.handle (detalle con points, notes y trackStyles), update_my_route_notes, delete_my_route_notes o delete_my_route.
+Valida CORS, método HTTP y Bearer token una vez; despacha por path a create.handle, create_batch.handle, read.handle, read_sections.handle, delete_section_item.handle, update.handle, create_my_route.handle, get_my_routes.handle (detalle con points, notes y trackStyles), update_my_route_notes, delete_my_route_notes o delete_my_route.
 """
 
 import logging
@@ -15,6 +15,7 @@ from utils.helper_http import verify_bearer_token
 from utils.helper_http_verb import validate_request
 
 from .create import handle as create_handle
+from .create_batch import handle as create_batch_handle
 from .create_my_route import handle as create_my_route_handle
 from .delete_my_route import handle as delete_my_route_handle
 from .delete_my_route_notes import handle as delete_my_route_notes_handle
@@ -30,6 +31,7 @@ _ACTION_READ = "read"
 _ACTION_READ_SECTION = "read_section"
 _ACTION_SUBSCRIBED_EVENTS = "subscribedevents"
 _ACTION_CREATE = "create"
+_ACTION_CREATE_BATCH = "create-batch"
 _ACTION_UPDATE = "update"
 _ACTION_MY_ROUTES = "my-routes"
 
@@ -38,6 +40,7 @@ _ROUTES = {
     _ACTION_READ: ("GET", read_handle),
     _ACTION_SUBSCRIBED_EVENTS: ("GET", subscribed_events_handle),
     _ACTION_CREATE: ("POST", create_handle),
+    _ACTION_CREATE_BATCH: ("POST", create_batch_handle),
     _ACTION_UPDATE: ("PUT", update_handle),
     _ACTION_MY_ROUTES: ("GET_OR_POST", None),
 }
@@ -48,7 +51,7 @@ def _action_from_path(path: str) -> Tuple[str | None, str | None]:
     Extrae (acción, sección) del path.
     - /api/users/{section} (section en ALLOWED_SECTIONS) -> ("read_section", section)
     - read, profile -> ("read", None)
-    - create, update, my-routes -> (acción, None)
+    - create, create-batch, update, my-routes -> (acción, None)
     Rutas de sección: /api/users/personalData, /api/users/healthData, etc.
     """
     if not path:
@@ -103,7 +106,7 @@ def _extract_my_route_delete_route_id(path: str) -> str | None:
 def user_route(req: https_fn.Request) -> https_fn.Response:
     """
     Una sola Cloud Function para users: valida token y despacha por path.
-    Paths: /api/users/read, /api/users/profile (GET), /api/users/{section} (GET o DELETE), /api/users/subscribedEvents (GET), /api/users/create (POST), /api/users/update (PUT), /api/users/my-routes (GET/POST), /api/users/my-routes/{routeId} (DELETE), /api/users/my-routes/{routeId}/notes (PUT/DELETE).
+    Paths: /api/users/read, /api/users/profile (GET), /api/users/{section} (GET o DELETE), /api/users/subscribedEvents (GET), /api/users/create (POST), /api/users/create-batch (POST), /api/users/update (PUT), /api/users/my-routes (GET/POST), /api/users/my-routes/{routeId} (DELETE), /api/users/my-routes/{routeId}/notes (PUT/DELETE).
     """
     validation_response = validate_request(
         req, ["GET", "POST", "PUT", "DELETE"], "user_route", return_json_error=False
@@ -0,0 +1,105 @@
+"""
+Checkpoints de un competidor dentro de la estructura de tracking.
+
+Desde schemaVersion 2 de track_competitors los checkpoints se guardan como arreglo en el
+campo 'checkpoints' del documento del competidor (una lectura/escritura por competidor).
+Las estructuras anteriores los tienen en la subcolección competitors/{competitorId}/checkpoints;
+estas funciones soportan ambos formatos.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from firebase_admin import firestore
+from models.firestore_collections import FirestoreCollections
+
+COMPETITOR_CHECKPOINTS_FIELD = "checkpoints"
+
+
+def has_inline_checkpoints(competitor_data: Dict[str, Any]) -> bool:
+    """True si el competidor guarda sus checkpoints como arreglo en su propio documento."""
+    return isinstance(competitor_data.get(COMPETITOR_CHECKPOINTS_FIELD), list)
+
+
+def get_competitor_checkpoints(
+    competitor_ref, competitor_data: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Checkpoints del competidor como lista de dicts (cada uno con 'id').
+    Usa el arreglo del documento si existe; si no, lee la subcolección (estructura previa).
+    """
+    if has_inline_checkpoints(competitor_data):
+        return competitor_data[COMPETITOR_CHECKPOINTS_FIELD]
+
+    checkpoints: List[Dict[str, Any]] = []
+    checkpoints_ref = competitor_ref.collection(
+        FirestoreCollections.EVENT_TRACKING_CHECKPOINTS
+    )
+    for checkpoint_doc in checkpoints_ref.stream():
+        checkpoint_data = checkpoint_doc.to_dict()
+        if checkpoint_data is None:
+            continue
+        checkpoint_data["id"] = checkpoint_doc.id
+        checkpoints.append(checkpoint_data)
+    return checkpoints
+
+
+def get_competitor_checkpoint(
+    competitor_ref, competitor_data: Dict[str, Any], checkpoint_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Un checkpoint del competidor por ID, o None si no existe.
+    Con arreglo inline no hace lecturas; con la estructura previa lee solo ese documento.
+    """
+    if has_inline_checkpoints(competitor_data):
+        for checkpoint in competitor_data[COMPETITOR_CHECKPOINTS_FIELD]:
+            if checkpoint.get("id") == checkpoint_id:
+                return checkpoint
+        return None
+
+    checkpoint_doc = (
+        competitor_ref.collection(FirestoreCollections.EVENT_TRACKING_CHECKPOINTS)
+        .document(checkpoint_id)
+        .get()
+    )
+    if not checkpoint_doc.exists:
+        return None
+    return checkpoint_doc.to_dict()
+
+
+def update_competitor_checkpoints(
+    db,
+    competitor_ref,
+    competitor_data: Dict[str, Any],
+    updates_by_checkpoint_id: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    Aplica updates_by_checkpoint_id ({checkpointId: campos}) a los checkpoints del competidor.
+
+    Con arreglo inline se hace en una transacción sobre el documento del competidor (una
+    escritura, sin perder cambios concurrentes de otros checkpoints). Con la estructura
+    previa se actualiza cada documento de la subcolección.
+    """
+    if not updates_by_checkpoint_id:
+        return
+
+    if not has_inline_checkpoints(competitor_data):
+        checkpoints_ref = competitor_ref.collection(
+            FirestoreCollections.EVENT_TRACKING_CHECKPOINTS
+        )
+        for checkpoint_id, update_data in updates_by_checkpoint_id.items():
+            checkpoints_ref.document(checkpoint_id).update(update_data)
+        return
+
+    @firestore.transactional
+    def _apply(transaction):
+        snapshot = competitor_ref.get(transaction=transaction)
+        current = (snapshot.to_dict() or {}).get(COMPETITOR_CHECKPOINTS_FIELD) or []
+        updated = [
+            {**checkpoint, **updates_by_checkpoint_id[checkpoint.get("id")]}
+            if checkpoint.get("id") in updates_by_checkpoint_id
+            else checkpoint
+            for checkpoint in current
+        ]
+        transaction.update(competitor_ref, {COMPETITOR_CHECKPOINTS_FIELD: updated})
+
+    _apply(db.transaction())
@@ -6,22 +6,151 @@ DEBE SER USADA por todas las APIs que necesiten acceder a Firestore.
 NO duplicar lógica de Firestore en cada Cloud Function.
 """
 
+import functools
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from firebase_admin import firestore
+from google.api_core.exceptions import Aborted, DeadlineExceeded, ServiceUnavailable
 from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.client import Client
 
 LOG = logging.getLogger(__name__)
 
+# Límite de operaciones por WriteBatch de Firestore
+_BATCH_MAX_OPERATIONS = 500
+# Documentos por batch en multi_set y batches enviados en paralelo
+_MULTI_SET_CHUNK_SIZE = 400
+_MULTI_SET_MAX_WORKERS = 10
+# Reintentos ante errores transitorios de Firestore (backoff exponencial con jitter)
+_TRANSIENT_ERRORS = (Aborted, DeadlineExceeded, ServiceUnavailable)
+_RETRY_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY_SECONDS = 0.05
+_RETRY_MAX_DELAY_SECONDS = 1.0
+# Intentos por operación del BulkWriter antes de darla por fallida
+_BULK_WRITER_MAX_ATTEMPTS = 5
+
+# Cliente de Firestore compartido por todas las invocaciones de la instancia
+_DB_SINGLETON: Optional[Client] = None
+
+
+def get_db() -> Client:
+    """
+    Retorna el cliente de Firestore de la instancia, creándolo en la primera llamada.
+
+    Todas las funciones y FirestoreHelper comparten el mismo cliente (y su canal gRPC)
+    en lugar de resolverlo con firestore.client() en cada request.
+    """
+    global _DB_SINGLETON
+    if _DB_SINGLETON is None:
+        _DB_SINGLETON = firestore.client()
+    return _DB_SINGLETON
+
+
+_T = TypeVar("_T")
+
+
+def _call_with_retry(operation_name: str, fn: Callable[[], _T]) -> _T:
+    """
+    Ejecuta fn reintentando los errores transitorios (_TRANSIENT_ERRORS) hasta
+    _RETRY_MAX_ATTEMPTS veces; cualquier otro error se propaga de inmediato.
+    """
+    for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+        try:
+            return fn()
+        except _TRANSIENT_ERRORS as e:
+            if attempt == _RETRY_MAX_ATTEMPTS:
+                raise
+            delay = min(
+                _RETRY_MAX_DELAY_SECONDS,
+                _RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1),
+            )
+            LOG.warning(
+                "FirestoreHelper.%s reintento %s/%s: %s",
+                operation_name,
+                attempt,
+                _RETRY_MAX_ATTEMPTS,
+                e,
+            )
+            time.sleep(delay + random.uniform(0, delay))
+    raise AssertionError("unreachable")
+
+
+def _firestore_op(retry: bool = True):
+    """
+    Decorador de las operaciones de FirestoreHelper: registra el error con el nombre del
+    método y lo relanza. Con retry=True (operaciones idempotentes) reintenta los errores
+    transitorios antes de fallar.
+    """
+
+    def decorator(fn):
+        operation_name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                if retry:
+                    return _call_with_retry(operation_name, lambda: fn(*args, **kwargs))
+                return fn(*args, **kwargs)
+            except Exception as e:
+                LOG.error("FirestoreHelper.%s error: %s", operation_name, e, exc_info=True)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+def _build_query(
+    db: Client,
+    collection_path: str,
+    filters: Optional[List[Dict[str, Any]]],
+    order_by: Optional[List[Tuple[str, str]]],
+    limit: Optional[int],
+    field_paths: Optional[List[str]],
+):
+    """Arma la query de query_documents (filtros, orden, límite y proyección)."""
+    query = db.collection(collection_path)
+
+    if filters:
+        for f in filters:
+            query = query.where(
+                filter=FieldFilter(f["field"], f["operator"], f["value"])
+            )
+
+    if order_by:
+        for field, direction in order_by:
+            dir_enum = (
+                firestore.Query.DESCENDING
+                if direction == "desc"
+                else firestore.Query.ASCENDING
+            )
+            query = query.order_by(field, direction=dir_enum)
+
+    if limit:
+        query = query.limit(limit)
+
+    if field_paths:
+        query = query.select(field_paths)
+
+    return query
+
 
 class FirestoreHelper:
     """Helper centralizado para operaciones de Firestore."""
 
+    # Sin estado propio: solo la referencia al cliente compartido (instancias de un slot)
+    __slots__ = ("db",)
+
     def __init__(self):
-        """Inicializa el cliente de Firestore (ya inicializado en main.py)."""
-        self.db = firestore.client()
+        """Usa el cliente de Firestore compartido (app ya inicializada en main.py)."""
+        self.db = get_db()
 
+    @_firestore_op()
     def get_document(
         self,
         collection_path: str,
@@ -38,15 +167,89 @@ class FirestoreHelper:
         Returns:
             Diccionario con datos del documento o None si no existe.
         """
-        try:
-            doc_ref = self.db.collection(collection_path).document(document_id)
-            doc = doc_ref.get()
-            if doc.exists:
-                return doc.to_dict()
-            return None
-        except Exception as e:
-            LOG.error("FirestoreHelper.get_document error: %s", e, exc_info=True)
-            raise
+        doc = self.db.collection(collection_path).document(document_id).get()
+        if doc.exists:
+            return doc.to_dict()
+        return None
+
+    @_firestore_op()
+    def multi_get(
+        self,
+        collection_path: str,
+        document_ids: List[str],
+        field_paths: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene varios documentos por ID en una sola llamada (get_all).
+
+        Args:
+            collection_path: Ruta de la colección.
+            document_ids: IDs de los documentos.
+            field_paths: Proyección opcional; solo se transfieren estos campos.
+
+        Returns:
+            Diccionario {document_id: datos}; los documentos inexistentes se omiten.
+        """
+        if not document_ids:
+            return {}
+        col_ref = self.db.collection(collection_path)
+        refs = [col_ref.document(document_id) for document_id in document_ids]
+        return {
+            snap.id: snap.to_dict()
+            for snap in self.db.get_all(refs, field_paths=field_paths)
+            if snap.exists
+        }
+
+    @_firestore_op(retry=False)
+    def multi_set(
+        self,
+        collection_path: str,
+        items: Dict[str, Dict[str, Any]],
+        chunk_size: int = _MULTI_SET_CHUNK_SIZE,
+    ) -> List[str]:
+        """
+        Escribe (set) varios documentos de una colección en batches paralelos.
+
+        Los items se dividen en batches de chunk_size que se confirman en paralelo; cada
+        batch es atómico pero el conjunto no. Cada batch reintenta por separado los
+        errores transitorios.
+
+        Args:
+            collection_path: Ruta de la colección.
+            items: Diccionario {document_id: datos}.
+            chunk_size: Documentos por batch (máximo 500).
+
+        Returns:
+            Lista de IDs escritos.
+        """
+        if not items:
+            return []
+        chunk_size = min(chunk_size, _BATCH_MAX_OPERATIONS)
+        col_ref = self.db.collection(collection_path)
+        entries = list(items.items())
+        chunks = [
+            entries[start : start + chunk_size]
+            for start in range(0, len(entries), chunk_size)
+        ]
+
+        def _commit_chunk(chunk: List[Tuple[str, Dict[str, Any]]]) -> None:
+            batch = self.db.batch()
+            for document_id, data in chunk:
+                batch.set(col_ref.document(document_id), data)
+            batch.commit()
+
+        with ThreadPoolExecutor(
+            max_workers=min(_MULTI_SET_MAX_WORKERS, len(chunks))
+        ) as executor:
+            list(
+                executor.map(
+                    lambda chunk: _call_with_retry(
+                        "multi_set", lambda: _commit_chunk(chunk)
+                    ),
+                    chunks,
+                )
+            )
+        return list(items.keys())
 
     def create_document(
         self,
@@ -56,6 +259,9 @@ class FirestoreHelper:
         """
         Crea un documento con ID autogenerado por Firestore.
 
+        El ID se genera antes de escribir, así un reintento reescribe el mismo documento
+        en lugar de crear un duplicado.
+
         Args:
             collection_path: Ruta de la colección.
             data: Datos del documento.
@@ -63,14 +269,11 @@ class FirestoreHelper:
         Returns:
             ID del documento creado.
         """
-        try:
-            doc_ref = self.db.collection(collection_path).document()
-            doc_ref.set(data)
-            return doc_ref.id
-        except Exception as e:
-            LOG.error("FirestoreHelper.create_document error: %s", e, exc_info=True)
-            raise
+        return self.create_document_with_id(
+            collection_path, self.new_document_id(collection_path), data
+        )
 
+    @_firestore_op()
     def create_document_with_id(
         self,
         collection_path: str,
@@ -90,16 +293,11 @@ class FirestoreHelper:
         Returns:
             ID del documento creado.
         """
-        try:
-            doc_ref = self.db.collection(collection_path).document(document_id)
-            doc_ref.set(data)
-            return doc_ref.id
-        except Exception as e:
-            LOG.error(
-                "FirestoreHelper.create_document_with_id error: %s", e, exc_info=True
-            )
-            raise
+        doc_ref = self.db.collection(collection_path).document(document_id)
+        doc_ref.set(data)
+        return doc_ref.id
 
+    @_firestore_op()
     def update_document(
         self,
         collection_path: str,
@@ -117,14 +315,10 @@ class FirestoreHelper:
         Returns:
             True si se actualizó correctamente.
         """
-        try:
-            doc_ref = self.db.collection(collection_path).document(document_id)
-            doc_ref.update(data)
-            return True
-        except Exception as e:
-            LOG.error("FirestoreHelper.update_document error: %s", e, exc_info=True)
-            raise
+        self.db.collection(collection_path).document(document_id).update(data)
+        return True
 
+    @_firestore_op()
     def delete_document(
         self,
         collection_path: str,
@@ -140,31 +334,30 @@ class FirestoreHelper:
         Returns:
             True si se eliminó correctamente.
         """
-        try:
-            doc_ref = self.db.collection(collection_path).document(document_id)
-            doc_ref.delete()
-            return True
-        except Exception as e:
-            LOG.error("FirestoreHelper.delete_document error: %s", e, exc_info=True)
-            raise
+        self.db.collection(collection_path).document(document_id).delete()
+        return True
 
+    @_firestore_op()
     def list_document_ids(self, collection_path: str) -> List[str]:
         """
         Lista los IDs de todos los documentos de una colección (o subcolección).
 
+        Proyecta solo __name__, así Firestore no transfiere los campos de cada documento.
+
         Args:
             collection_path: Ruta de la colección (ej: "users/abc/emergencyContact").
 
         Returns:
             Lista de IDs de documentos.
         """
-        try:
-            docs = self.db.collection(collection_path).stream()
-            return [doc.id for doc in docs]
-        except Exception as e:
-            LOG.error("FirestoreHelper.list_document_ids error: %s", e, exc_info=True)
-            raise
-
+        docs = (
+            self.db.collection(collection_path)
+            .select([FieldPath.document_id()])
+            .stream()
+        )
+        return [doc.id for doc in docs]
+
+    @_firestore_op()
     def query_documents(
         self,
         collection_path: str,
@@ -172,6 +365,7 @@ class FirestoreHelper:
         order_by: Optional[List[Tuple[str, str]]] = None,
         limit: Optional[int] = None,
         start_after_doc_id: Optional[str] = None,
+        field_paths: Optional[List[str]] = None,
     ) -> List[Tuple[str, Dict[str, Any]]]:
         """
         Ejecuta una query en una colección.
@@ -182,46 +376,27 @@ class FirestoreHelper:
             order_by: Lista de ordenamiento [("field", "asc"|"desc")].
             limit: Límite de resultados.
             start_after_doc_id: ID del documento tras el cual empezar (cursor para paginación).
+            field_paths: Proyección opcional (select); solo se transfieren estos campos.
 
         Returns:
             Lista de tuplas (document_id, document_data).
         """
-        try:
-            query = self.db.collection(collection_path)
-
-            if filters:
-                for f in filters:
-                    query = query.where(
-                        filter=FieldFilter(f["field"], f["operator"], f["value"])
-                    )
-
-            if order_by:
-                for field, direction in order_by:
-                    dir_enum = (
-                        firestore.Query.DESCENDING
-                        if direction == "desc"
-                        else firestore.Query.ASCENDING
-                    )
-                    query = query.order_by(field, direction=dir_enum)
-
-            if start_after_doc_id:
-                doc_ref = self.db.collection(collection_path).document(
-                    start_after_doc_id
-                )
-                snap = doc_ref.get()
-                if snap.exists:
-                    query = query.start_after(snap)
+        query = _build_query(
+            self.db, collection_path, filters, order_by, limit, field_paths
+        )
 
-            if limit:
-                query = query.limit(limit)
-
-            docs = query.stream()
-            return [(doc.id, doc.to_dict()) for doc in docs]
+        if start_after_doc_id:
+            doc_ref = self.db.collection(collection_path).document(
+                start_after_doc_id
+            )
+            snap = doc_ref.get()
+            if snap.exists:
+                query = query.start_after(snap)
 
-        except Exception as e:
-            LOG.error("FirestoreHelper.query_documents error: %s", e, exc_info=True)
-            raise
+        docs = query.stream()
+        return [(doc.id, doc.to_dict()) for doc in docs]
 
+    @_firestore_op(retry=False)
     def batch_update(
         self,
         updates: List[Tuple[str, str, Dict[str, Any]]],
@@ -229,22 +404,114 @@ class FirestoreHelper:
         """
         Actualiza múltiples documentos en una transacción batch.
 
+        Un WriteBatch admite como máximo _BATCH_MAX_OPERATIONS operaciones; con más
+        updates se delega en bulk_update (no atómico).
+
         Args:
             updates: Lista de tuplas (collection_path, document_id, data).
 
         Returns:
             True si todas las actualizaciones fueron exitosas.
         """
-        try:
-            batch = self.db.batch()
-            for collection_path, document_id, data in updates:
-                doc_ref = self.db.collection(collection_path).document(document_id)
-                batch.update(doc_ref, data)
-            batch.commit()
-            return True
-        except Exception as e:
-            LOG.error("FirestoreHelper.batch_update error: %s", e, exc_info=True)
-            raise
+        if len(updates) > _BATCH_MAX_OPERATIONS:
+            # Sin el decorador de bulk_update: el error se registra una sola vez
+            return self._bulk_update_impl(updates)
+        batch = self.db.batch()
+        for collection_path, document_id, data in updates:
+            doc_ref = self.db.collection(collection_path).document(document_id)
+            batch.update(doc_ref, data)
+        # Solo se reintenta el commit atómico; el BulkWriter ya reintenta cada escritura
+        _call_with_retry("batch_update", batch.commit)
+        return True
+
+    @_firestore_op(retry=False)
+    def bulk_update(
+        self,
+        updates: List[Tuple[str, str, Dict[str, Any]]],
+    ) -> bool:
+        """
+        Actualiza múltiples documentos con un BulkWriter, sin límite de operaciones.
+
+        Las escrituras se envían en paralelo con control de tasa y reintentos; no es
+        atómico. Si alguna operación agota _BULK_WRITER_MAX_ATTEMPTS se lanza RuntimeError.
+
+        Args:
+            updates: Lista de tuplas (collection_path, document_id, data).
+
+        Returns:
+            True si todas las actualizaciones fueron exitosas.
+        """
+        return self._bulk_update_impl(updates)
+
+    def _bulk_update_impl(self, updates: List[Tuple[str, str, Dict[str, Any]]]) -> bool:
+        """Implementación de bulk_update sin registro ni reintentos (ver _firestore_op)."""
+        write_failures = []
+
+        def _on_write_error(failure, _bulk_writer) -> bool:
+            if failure.attempts < _BULK_WRITER_MAX_ATTEMPTS:
+                return True
+            LOG.error(
+                "FirestoreHelper.bulk_update error en %s: %s",
+                failure.operation.reference.path,
+                failure.message,
+            )
+            write_failures.append(failure)
+            return False
+
+        bulk_writer = self.db.bulk_writer()
+        bulk_writer.on_write_error(_on_write_error)
+        for collection_path, document_id, data in updates:
+            doc_ref = self.db.collection(collection_path).document(document_id)
+            bulk_writer.update(doc_ref, data)
+        bulk_writer.close()
+        if write_failures:
+            raise RuntimeError(
+                f"FirestoreHelper.bulk_update: {len(write_failures)} de {len(updates)} "
+                "actualizaciones fallaron"
+            )
+        return True
+
+    @_firestore_op(retry=False)
+    def bulk_set(
+        self,
+        collection_path: str,
+        items: Dict[str, Dict[str, Any]],
+    ) -> List[str]:
+        """
+        Escribe (set) varios documentos con un BulkWriter y reporta los que fallaron.
+
+        A diferencia de bulk_update no lanza por escrituras individuales fallidas: retorna
+        sus IDs para que el llamador decida (p. ej. rollback de recursos asociados).
+
+        Args:
+            collection_path: Ruta de la colección.
+            items: Diccionario {document_id: datos}.
+
+        Returns:
+            IDs de los documentos que agotaron _BULK_WRITER_MAX_ATTEMPTS (vacío si todo se escribió).
+        """
+        failed_ids: List[str] = []
+
+        def _on_write_error(failure, _bulk_writer) -> bool:
+            if failure.attempts < _BULK_WRITER_MAX_ATTEMPTS:
+                return True
+            LOG.error(
+                "FirestoreHelper.bulk_set error en %s: %s",
+                failure.operation.reference.path,
+                failure.message,
+            )
+            failed_ids.append(failure.operation.reference.id)
+            return False
+
+        if not items:
+            return failed_ids
+        col_ref = self.db.collection(collection_path)
+        bulk_writer = self.db.bulk_writer()
+        bulk_writer.on_write_error(_on_write_error)
+        for document_id, data in items.items():
+            bulk_writer.set(col_ref.document(document_id), data)
+        bulk_writer.close()
+        return failed_ids
 
     def new_document_id(self, collection_path: str) -> str:
         """
@@ -261,6 +528,7 @@ class FirestoreHelper:
         """
         return self.db.collection(collection_path).document().id
 
+    @_firestore_op(retry=False)
     def batch_set(
         self,
         operations: List[Tuple[str, Optional[str], Dict[str, Any]]],
@@ -275,16 +543,13 @@ class FirestoreHelper:
         Returns:
             Lista de IDs de documentos en el mismo orden que operations.
         """
-        try:
-            batch = self.db.batch()
-            doc_refs = []
-            for collection_path, doc_id, data in operations:
-                col_ref = self.db.collection(collection_path)
-                doc_ref = col_ref.document(doc_id) if doc_id else col_ref.document()
-                batch.set(doc_ref, data)
-                doc_refs.append(doc_ref)
-            batch.commit()
-            return [ref.id for ref in doc_refs]
-        except Exception as e:
-            LOG.error("FirestoreHelper.batch_set error: %s", e, exc_info=True)
-            raise
+        batch = self.db.batch()
+        doc_refs = []
+        for collection_path, doc_id, data in operations:
+            col_ref = self.db.collection(collection_path)
+            doc_ref = col_ref.document(doc_id) if doc_id else col_ref.document()
+            batch.set(doc_ref, data)
+            doc_refs.append(doc_ref)
+        # Solo se reintenta el commit: los IDs autogenerados ya quedaron fijados en el batch
+        _call_with_retry("batch_set", batch.commit)
+        return [ref.id for ref in doc_refs]
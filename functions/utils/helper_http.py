@@ -1,13 +1,60 @@
+import hashlib
 import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
 
 from firebase_admin import auth
+from firebase_admin.auth import ExpiredIdTokenError
 from firebase_functions import https_fn
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-try:
-    from firebase_admin._token_gen import ExpiredIdTokenError
-except ImportError:
-    ExpiredIdTokenError = type("ExpiredIdTokenError", (), {})
+# Cache (por instancia) de tokens ya verificados: blake2b(token) -> (claims, expira_en).
+# Evita repetir la verificación de firma en ráfagas del mismo cliente; la entrada vence
+# _TOKEN_EXP_SKEW_SECONDS antes del 'exp' del token. AUTH_CACHE_TTL_SECONDS=0 desactiva el cache.
+_TOKEN_CACHE_MAX_SIZE = 10000
+_TOKEN_CACHE_TTL_SECONDS = float(os.environ.get("AUTH_CACHE_TTL_SECONDS", "60"))
+_TOKEN_EXP_SKEW_SECONDS = 30
+_token_cache: OrderedDict[bytes, Tuple[Dict[str, Any], float]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+_BEARER_PREFIX = "Bearer "
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
+
+# Forma de un JWT: header.payload.firma, cada segmento base64url sin padding
+_JWT_RE = re.compile(r"[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+")
+
+
+def _verify_id_token_cached(token: str) -> Dict[str, Any]:
+    """
+    auth.verify_id_token con cache TTL por hash del token (no se guarda el token en claro).
+    Propaga las mismas excepciones que auth.verify_id_token en un fallo de cache.
+    """
+    cache_key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            claims, expires_at = cached
+            if now < expires_at:
+                _token_cache.move_to_end(cache_key)
+                return claims
+            del _token_cache[cache_key]
+
+    claims = auth.verify_id_token(token)
+    expires_at = now + _TOKEN_CACHE_TTL_SECONDS
+    token_exp = claims.get("exp") if isinstance(claims, dict) else None
+    if isinstance(token_exp, (int, float)):
+        expires_at = min(expires_at, float(token_exp) - _TOKEN_EXP_SKEW_SECONDS)
+    if expires_at > now:
+        with _token_cache_lock:
+            _token_cache[cache_key] = (claims, expires_at)
+            _token_cache.move_to_end(cache_key)
+            if len(_token_cache) > _TOKEN_CACHE_MAX_SIZE:
+                _token_cache.popitem(last=False)
+    return claims
 
 
 def verify_bearer_token(req: https_fn.Request, function_name: str = "function") -> bool:
@@ -27,17 +74,22 @@ def verify_bearer_token(req: https_fn.Request, function_name: str = "function")
         logging.warning("%s: Header Authorization faltante", function_name)
         return False
 
-    if not auth_header.startswith("Bearer "):
+    if not auth_header.startswith(_BEARER_PREFIX):
         logging.warning("%s: Formato de Authorization incorrecto", function_name)
         return False
 
-    token = auth_header.split("Bearer ", 1)[1].strip()
+    token = auth_header[_BEARER_PREFIX_LEN:].strip()
     if not token:
         logging.warning("%s: Token vacío", function_name)
         return False
 
+    # Descarta basura (sondeos, clientes rotos) sin llegar a la verificación criptográfica
+    if not _JWT_RE.fullmatch(token):
+        logging.warning("%s: Token con formato inválido", function_name)
+        return False
+
     try:
-        auth.verify_id_token(token)
+        _verify_id_token_cached(token)
         return True
     except ExpiredIdTokenError:
         logging.warning("%s: Token expirado", function_name)
@@ -51,39 +103,61 @@ def verify_bearer_token(req: https_fn.Request, function_name: str = "function")
         return False
 
 
-def get_bearer_uid(
+def get_bearer_claims(
     req: https_fn.Request, function_name: str = "function"
-) -> Optional[str]:
+) -> Optional[Dict[str, Any]]:
     """
-    Retorna el UID autenticado desde Authorization Bearer token.
+    Retorna los claims del Authorization Bearer token (incluye custom claims).
 
     Args:
         req: Request HTTP de Firebase Functions
         function_name: Nombre de la función que llama (para logging)
 
     Returns:
-        str | None: UID autenticado, o None si el token es inválido/faltante.
+        dict | None: Claims decodificados, o None si el token es inválido/faltante.
     """
     auth_header = req.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        logging.warning("%s: Authorization faltante o inválido para UID", function_name)
+    if not auth_header or not auth_header.startswith(_BEARER_PREFIX):
+        logging.warning("%s: Authorization faltante o inválido para claims", function_name)
         return None
 
-    token = auth_header.split("Bearer ", 1)[1].strip()
+    token = auth_header[_BEARER_PREFIX_LEN:].strip()
     if not token:
-        logging.warning("%s: Token vacío para UID", function_name)
+        logging.warning("%s: Token vacío para claims", function_name)
+        return None
+
+    if not _JWT_RE.fullmatch(token):
+        logging.warning("%s: Token con formato inválido para claims", function_name)
         return None
 
     try:
-        decoded = auth.verify_id_token(token)
-        uid = decoded.get("uid")
-        if not uid:
-            logging.warning("%s: Token sin uid", function_name)
-            return None
-        return uid
+        return _verify_id_token_cached(token)
     except Exception as e:
-        logging.warning("%s: Error extrayendo UID del token: %s", function_name, e)
+        logging.warning("%s: Error extrayendo claims del token: %s", function_name, e)
+        return None
+
+
+def get_bearer_uid(
+    req: https_fn.Request, function_name: str = "function"
+) -> Optional[str]:
+    """
+    Retorna el UID autenticado desde Authorization Bearer token.
+
+    Args:
+        req: Request HTTP de Firebase Functions
+        function_name: Nombre de la función que llama (para logging)
+
+    Returns:
+        str | None: UID autenticado, o None si el token es inválido/faltante.
+    """
+    decoded = get_bearer_claims(req, function_name)
+    if decoded is None:
+        return None
+    uid = decoded.get("uid")
+    if not uid:
+        logging.warning("%s: Token sin uid", function_name)
         return None
+    return uid
 
 
 def validate_bearer_token(
@@ -1,6 +1,22 @@
-from typing import List, Optional
+import json
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
 from firebase_functions import https_fn
 
+# Max-Age del preflight (24h, igual que track_competitor_position). Cada navegador lo
+# recorta a su propio máximo (Chrome 2h); la auth es por header Bearer, sin cookies,
+# así que Allow-Origin "*" sigue siendo válido y la respuesta no varía por Origin.
+_CORS_MAX_AGE_SECONDS = "86400"
+
+
+@lru_cache(maxsize=32)
+def _compile_methods(methods: Tuple[str, ...]) -> Tuple[FrozenSet[str], str]:
+    """
+    (set de métodos permitidos, valor "GET, POST, OPTIONS" para Allow/Allow-Methods).
+    Cada router usa siempre la misma lista, así que se calcula una vez por combinación.
+    """
+    return frozenset(methods), ", ".join(methods + ("OPTIONS",))
+
 
 def handle_cors_preflight(
     req: https_fn.Request,
@@ -18,7 +34,7 @@ def handle_cors_preflight(
         Response con headers CORS si es OPTIONS, None si no es OPTIONS
     """
     if req.method == "OPTIONS":
-        methods = ", ".join((allowed_methods or ["GET"]) + ["OPTIONS"])
+        _, methods = _compile_methods(tuple(allowed_methods or ("GET",)))
         return https_fn.Response(
             "",
             status=204,
@@ -26,7 +42,7 @@ def handle_cors_preflight(
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Methods": methods,
                 "Access-Control-Allow-Headers": "Content-Type, Authorization",
-                "Access-Control-Max-Age": "3600",
+                "Access-Control-Max-Age": _CORS_MAX_AGE_SECONDS,
             },
         )
     return None
@@ -50,15 +66,11 @@ def validate_http_method(
     Returns:
         Response con error 405 si el método no está permitido, None si es válido
     """
-    if req.method in allowed_methods:
+    method_set, allowed_str = _compile_methods(tuple(allowed_methods))
+    if req.method in method_set:
         return None
 
-    # Construir lista de métodos permitidos para el header Allow
-    allowed_str = ", ".join(allowed_methods + ["OPTIONS"])
-
     if return_json_error:
-        import json
-
         error_response = {
             "error": {
                 "code": "method-not-allowed",
@@ -1,5 +1,12 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Dict
+
+import orjson
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+
+# Opciones de orjson para cuerpos de respuesta JSON (bytes UTF-8, equivalente a
+# json.dumps(..., ensure_ascii=False)); los datetime restantes se serializan en ISO 8601 con Z.
+ORJSON_RESPONSE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
 
 
 def format_utc_to_local_datetime(utc_datetime: datetime) -> str:
@@ -7,9 +14,66 @@ def format_utc_to_local_datetime(utc_datetime: datetime) -> str:
     Convierte un datetime UTC al formato ISO 8601 con Z
     Ejemplo: 2025-10-24T19:03:35Z
     """
-    # Formatear como ISO 8601 con Z (UTC)
-    formatted_date = utc_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
-    return formatted_date
+    # Formato fijo armado con los campos (sin pasar por strftime); igual que
+    # strftime("%Y-%m-%dT%H:%M:%SZ"): sin microsegundos y sin convertir zona horaria
+    return (
+        f"{utc_datetime.year:04d}-{utc_datetime.month:02d}-{utc_datetime.day:02d}"
+        f"T{utc_datetime.hour:02d}:{utc_datetime.minute:02d}:{utc_datetime.second:02d}Z"
+    )
+
+
+def _datetime_to_iso(value: datetime) -> str:
+    """ISO 8601; los datetime naive se consideran UTC y se marcan con Z."""
+    if value.tzinfo is None:
+        return f"{value.isoformat()}Z"
+    return value.isoformat()
+
+
+def _firestore_timestamp_to_iso(value: Any) -> str:
+    return _datetime_to_iso(value.to_datetime())
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# Conversión por tipo exacto: primitivos, datetime y el datetime que retorna Firestore para
+# los Timestamps (DatetimeWithNanoseconds). Los demás tipos se clasifican una sola vez en
+# _resolve_converter y se agregan a la tabla.
+_SCALAR_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    type(None): _identity,
+    datetime: _datetime_to_iso,
+    DatetimeWithNanoseconds: _datetime_to_iso,
+}
+
+
+# Tipos que se retornan sin conversión; se comprueban antes de cualquier otro despacho
+_PASSTHROUGH_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _resolve_converter(value_type: type) -> Callable[[Any], Any]:
+    """Elige el conversor de un tipo no registrado (Timestamp con to_datetime, subclases de datetime)."""
+    if hasattr(value_type, "timestamp") and hasattr(value_type, "to_datetime"):
+        converter = _firestore_timestamp_to_iso
+    elif issubclass(value_type, datetime):
+        converter = _datetime_to_iso
+    else:
+        converter = _identity
+    _SCALAR_CONVERTERS[value_type] = converter
+    return converter
+
+
+def _convert_scalar(value: Any) -> Any:
+    """Convierte un valor que no es dict ni list."""
+    value_type = type(value)
+    converter = _SCALAR_CONVERTERS.get(value_type)
+    if converter is None:
+        converter = _resolve_converter(value_type)
+    return converter(value)
 
 
 def convert_firestore_value(value: Any) -> Any:
@@ -19,7 +83,7 @@ def convert_firestore_value(value: Any) -> Any:
     Maneja:
     - Timestamps de Firestore (convierte a ISO8601)
     - datetime de Python (convierte a ISO8601)
-    - dict y list (recursivo)
+    - dict y list (recorridos con una pila explícita, sin recursión)
     - Otros tipos primitivos (str, int, float, bool) se retornan tal cual
 
     Args:
@@ -28,21 +92,33 @@ def convert_firestore_value(value: Any) -> Any:
     Returns:
         Valor convertido a tipo JSON serializable
     """
-    if value is None:
-        return None
-    # Timestamp de Firestore (verificar por tipo o método)
-    if hasattr(value, "timestamp") and hasattr(value, "to_datetime"):
-        # Es un Timestamp de Firestore
-        dt = value.to_datetime()
-        return dt.isoformat() + "Z" if dt.tzinfo is None else dt.isoformat()
-    # datetime de Python
-    if isinstance(value, datetime):
-        return value.isoformat() + "Z" if value.tzinfo is None else value.isoformat()
-    # dict - recursivo
-    if isinstance(value, dict):
-        return {k: convert_firestore_value(v) for k, v in value.items()}
-    # list - recursivo
-    if isinstance(value, list):
-        return [convert_firestore_value(item) for item in value]
-    # Otros tipos (str, int, float, bool) se retornan tal cual
-    return value
+    if type(value) in _PASSTHROUGH_TYPES:
+        return value
+    if not isinstance(value, (dict, list)):
+        return _convert_scalar(value)
+
+    passthrough = _PASSTHROUGH_TYPES
+    root: Any = {} if isinstance(value, dict) else []
+    # Pila de (contenedor original, contenedor convertido) pendientes de llenar
+    stack = [(value, root)]
+    while stack:
+        source, target = stack.pop()
+        # El tipo del contenedor se resuelve una vez, no por cada elemento
+        target_is_dict = isinstance(target, dict)
+        items = source.items() if target_is_dict else enumerate(source)
+        for key, item in items:
+            if type(item) in passthrough:
+                converted: Any = item
+            elif isinstance(item, dict):
+                converted = {}
+                stack.append((item, converted))
+            elif isinstance(item, list):
+                converted = []
+                stack.append((item, converted))
+            else:
+                converted = _convert_scalar(item)
+            if target_is_dict:
+                target[key] = converted
+            else:
+                target.append(converted)
+    return root
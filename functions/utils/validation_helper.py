@@ -6,7 +6,16 @@ validación en cada Cloud Function.
 """
 
 import re
-from typing import Dict, List, Tuple
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+# Letras aceptadas por validate_password (solo ASCII, como el antiguo [a-zA-Z])
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+# Patrones compilados una sola vez al importar el módulo
+_PHONE_CLEAN_RE = re.compile(r"[\s()\-]")
+_PHONE_RE = re.compile(r"^\+?\d{10,15}$")
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$")
 
 
 def validate_password(password: str) -> Tuple[bool, str]:
@@ -27,10 +36,20 @@ def validate_password(password: str) -> Tuple[bool, str]:
     if not password or len(password) < 8:
         return False, "La contraseña debe tener al menos 8 caracteres"
 
-    if not re.search(r"[a-zA-Z]", password):
+    # Una sola pasada: se corta en cuanto aparecen una letra y un dígito
+    has_letter = has_digit = False
+    for char in password:
+        if char in _ASCII_LETTERS:
+            has_letter = True
+        elif char.isdecimal():
+            has_digit = True
+        if has_letter and has_digit:
+            break
+
+    if not has_letter:
         return False, "La contraseña debe incluir al menos una letra"
 
-    if not re.search(r"\d", password):
+    if not has_digit:
         return False, "La contraseña debe incluir al menos un número"
 
     return True, ""
@@ -55,10 +74,10 @@ def validate_phone(phone: str) -> bool:
         return False
 
     # Remover espacios, paréntesis y guiones
-    clean_phone = re.sub(r"[\s()\-]", "", phone)
+    clean_phone = _PHONE_CLEAN_RE.sub("", phone)
 
     # Validar entre 10 y 15 dígitos (incluyendo código de país)
-    return bool(re.match(r"^\+?\d{10,15}$", clean_phone))
+    return bool(_PHONE_RE.match(clean_phone))
 
 
 def validate_required_fields(
@@ -101,5 +120,30 @@ def validate_email(email: str) -> bool:
     if not email:
         return False
 
-    pattern = r"^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
+
+
+def parse_non_negative_int(value: Any) -> Optional[int]:
+    """
+    Convierte value a entero >= 0 sin usar excepciones en los casos comunes.
+
+    Acepta int y strings decimales (con espacios alrededor y un "+" inicial opcional, igual
+    que int()); otros tipos (p. ej. float desde JSON) se convierten con int() como antes.
+
+    Args:
+        value: Valor a convertir (query param o campo del body).
+
+    Returns:
+        El entero, o None si value no es un entero válido.
+    """
+    if isinstance(value, str):
+        digits = value.strip()
+        if digits.startswith("+"):
+            digits = digits[1:]
+        return int(digits) if digits.isdecimal() else None
+    if not isinstance(value, int):
+        try:
+            value = int(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+    return value if value >= 0 else None
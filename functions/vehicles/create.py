@@ -7,27 +7,31 @@ Ruta: users/{userId}/vehicles. Requiere userId y body (branch, year, model, colo
 Logica de negocio unicamente. La validacion CORS y Bearer token la realiza vehicle_route.
 """
 
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict
 
-from firebase_admin import firestore
+import orjson
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
+from utils.firestore_helper import get_db
+from utils.helpers import ORJSON_RESPONSE_OPTIONS
+from utils.validation_helper import parse_non_negative_int
+
+from .search_cache import invalidate_user_searches
+from .user_exists_cache import user_exists
 
 LOG = logging.getLogger(__name__)
 LOG_PREFIX = "[create_vehicle]"
 
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_JSON_HEADERS = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+}
 
-def _validate_user_exists(db, user_id: str) -> bool:
-    """
-    Comprueba que el usuario exista.
-    Retorna True si existe, False si no existe.
-    """
-    user_ref = db.collection(FirestoreCollections.USERS).document(user_id)
-    user_doc = user_ref.get()
-    return user_doc.exists
 
 
 def _validate_body(body: Dict[str, Any]) -> str | None:
@@ -43,12 +47,11 @@ def _validate_body(body: Dict[str, Any]) -> str | None:
     year = body.get("year")
     if year is None:
         return "year es requerido"
-    try:
-        y = int(year)
-        if y < 1900 or y > 2100:
-            return "year debe ser un ano valido (1900-2100)"
-    except (TypeError, ValueError):
+    y = parse_non_negative_int(year)
+    if y is None:
         return "year debe ser un entero"
+    if y < 1900 or y > 2100:
+        return "year debe ser un ano valido (1900-2100)"
     photo_url = body.get("photoUrl")
     if photo_url is not None:
         if not isinstance(photo_url, str) or not photo_url.strip():
@@ -85,36 +88,36 @@ def handle(req: https_fn.Request) -> https_fn.Response:
     try:
         user_id = (req.args.get("userId") or "").strip()
         if not user_id:
-            logging.warning("%s userId faltante o vacio", LOG_PREFIX)
+            LOG.warning("%s userId faltante o vacio", LOG_PREFIX)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         try:
             request_data = req.get_json(silent=True)
         except (ValueError, TypeError) as e:
-            logging.warning("%s Error parseando JSON: %s", LOG_PREFIX, e)
+            LOG.warning("%s Error parseando JSON: %s", LOG_PREFIX, e)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         body = request_data if isinstance(request_data, dict) else None
         err = _validate_body(body)
         if err:
-            logging.warning("%s %s", LOG_PREFIX, err)
+            LOG.warning("%s %s", LOG_PREFIX, err)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
-        db = firestore.client()
-        if not _validate_user_exists(db, user_id):
-            logging.warning(
+        user_ref = get_db().collection(FirestoreCollections.USERS).document(user_id)
+        if not user_exists(user_ref):
+            LOG.warning(
                 "%s Usuario no encontrado: userId=%s",
                 LOG_PREFIX,
                 user_id,
@@ -122,7 +125,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
             return https_fn.Response(
                 "",
                 status=404,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         now = datetime.now(timezone.utc)
@@ -141,13 +144,9 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         if body.get("mileageKm") is not None:
             vehicle_data["mileageKm"] = int(body["mileageKm"])
 
-        vehicles_ref = (
-            db.collection(FirestoreCollections.USERS)
-            .document(user_id)
-            .collection(FirestoreCollections.USER_VEHICLES)
-        )
-        new_doc = vehicles_ref.document()
+        new_doc = user_ref.collection(FirestoreCollections.USER_VEHICLES).document()
         new_doc.set(vehicle_data)
+        invalidate_user_searches(user_id)
 
         result = {
             "id": new_doc.id,
@@ -161,30 +160,25 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         if "mileageKm" in vehicle_data:
             result["mileageKm"] = vehicle_data["mileageKm"]
 
-        logging.info("%s Vehiculo creado: userId=%s, vehicleId=%s", LOG_PREFIX, user_id, new_doc.id)
+        LOG.info("%s Vehiculo creado: userId=%s, vehicleId=%s", LOG_PREFIX, user_id, new_doc.id)
 
         return https_fn.Response(
-            json.dumps(result, ensure_ascii=False),
+            orjson.dumps(result, option=ORJSON_RESPONSE_OPTIONS),
             status=201,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            },
+            headers=_JSON_HEADERS,
         )
 
     except ValueError as e:
-        logging.error("%s Error de validacion: %s", LOG_PREFIX, e)
+        LOG.error("%s Error de validacion: %s", LOG_PREFIX, e)
         return https_fn.Response(
             "",
             status=400,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
     except (AttributeError, KeyError, RuntimeError, TypeError) as e:
-        logging.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
+        LOG.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
         return https_fn.Response(
             "",
             status=500,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
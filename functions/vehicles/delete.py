@@ -9,66 +9,65 @@ Logica de negocio unicamente. La validacion CORS y Bearer token la realiza vehic
 """
 
 import logging
-from typing import TYPE_CHECKING
+import re
+from typing import Tuple
 
 from firebase_admin import firestore
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
+from utils.firestore_helper import get_db
 
-if TYPE_CHECKING:
-    from firebase_admin.firestore import Client as FirestoreClient
+from .search_cache import invalidate_user_searches
 
 LOG = logging.getLogger(__name__)
 LOG_PREFIX = "[delete_vehicle]"
 
+# Headers CORS de todas las respuestas (sin body) del endpoint
+_CORS_HEADERS_204 = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+}
+
+# /api/vehicles/{vehicleId}[/...]; tolera barras repetidas o finales como el split previo
+_VEHICLE_PATH_RE = re.compile(r"/*api/+vehicles/+([^/]+)")
+
 
 def _vehicle_id_from_path(path: str) -> str | None:
     """Extrae vehicleId del path /api/vehicles/{vehicleId}. Retorna None si no hay segmento."""
-    if not path:
-        return None
-    parts = [p for p in path.rstrip("/").split("/") if p]
-    if len(parts) >= 3 and parts[0] == "api" and parts[1] == "vehicles":
-        return parts[2] if len(parts) > 2 else None
-    return None
-
-
-def _validate_user_exists(db: "FirestoreClient", user_id: str) -> bool:
-    """Comprueba que el usuario exista en Firestore."""
-    user_ref = db.collection(FirestoreCollections.USERS).document(user_id)
-    return user_ref.get().exists
-
-
-def _validate_vehicle(db: "FirestoreClient", user_id: str, vehicle_id: str) -> bool:
-    """Comprueba que el vehiculo exista en users/{userId}/vehicles/{vehicleId}."""
-    vehicle_ref = (
-        db.collection(FirestoreCollections.USERS)
-        .document(user_id)
-        .collection(FirestoreCollections.USER_VEHICLES)
-        .document(vehicle_id)
-    )
-    return vehicle_ref.get().exists
+    match = _VEHICLE_PATH_RE.match(path or "")
+    return match.group(1) if match else None
 
 
-def _delete_vehicle_from_firestore(
-    db: "FirestoreClient", user_id: str, vehicle_id: str
-) -> None:
-    """Elimina el documento del vehiculo en Firestore."""
-    vehicle_ref = (
-        db.collection(FirestoreCollections.USERS)
-        .document(user_id)
-        .collection(FirestoreCollections.USER_VEHICLES)
-        .document(vehicle_id)
-    )
-    vehicle_ref.delete()
+def _vehicle_ref(
+    user_ref: firestore.DocumentReference, vehicle_id: str
+) -> firestore.DocumentReference:
+    """Referencia a users/{userId}/vehicles/{vehicleId}."""
+    return user_ref.collection(FirestoreCollections.USER_VEHICLES).document(vehicle_id)
 
 
-def _cors_headers_204() -> dict:
-    """Headers CORS para respuesta 204."""
-    return {
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Methods": "PUT, DELETE, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, Authorization",
+def _user_and_vehicle_exist(
+    db: firestore.Client,
+    user_ref: firestore.DocumentReference,
+    vehicle_ref: firestore.DocumentReference,
+) -> Tuple[bool, bool]:
+    """
+    (existe usuario, existe vehiculo) leyendo ambos documentos en un solo get_all.
+    Solo importa .exists, así que se pide únicamente authUserId (field mask).
+    """
+    exists_by_path = {
+        snap.reference.path: snap.exists
+        for snap in db.get_all([user_ref, vehicle_ref], field_paths=["authUserId"])
     }
+    return (
+        exists_by_path.get(user_ref.path, False),
+        exists_by_path.get(vehicle_ref.path, False),
+    )
+
+
+def _delete_vehicle_from_firestore(vehicle_ref: firestore.DocumentReference) -> None:
+    """Elimina el documento del vehiculo en Firestore."""
+    vehicle_ref.delete()
 
 
 def handle(req: https_fn.Request) -> https_fn.Response:
@@ -90,26 +89,29 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         if not vehicle_id:
             vehicle_id = (req.args.get("vehicleId") or "").strip()
         if not vehicle_id:
-            logging.warning("%s vehicleId faltante (path o query)", LOG_PREFIX)
+            LOG.warning("%s vehicleId faltante (path o query)", LOG_PREFIX)
             return https_fn.Response(
                 "",
                 status=400,
-                headers=_cors_headers_204(),
+                headers=_CORS_HEADERS_204,
             )
 
         user_id = (req.args.get("userId") or "").strip()
 
         if not user_id:
-            logging.warning("%s userId faltante o vacio", LOG_PREFIX)
+            LOG.warning("%s userId faltante o vacio", LOG_PREFIX)
             return https_fn.Response(
                 "",
                 status=400,
-                headers=_cors_headers_204(),
+                headers=_CORS_HEADERS_204,
             )
 
-        db = firestore.client()
-        if not _validate_user_exists(db, user_id):
-            logging.warning(
+        db = get_db()
+        user_ref = db.collection(FirestoreCollections.USERS).document(user_id)
+        vehicle_ref = _vehicle_ref(user_ref, vehicle_id)
+        user_exists, vehicle_exists = _user_and_vehicle_exist(db, user_ref, vehicle_ref)
+        if not user_exists:
+            LOG.warning(
                 "%s Usuario no encontrado: userId=%s",
                 LOG_PREFIX,
                 user_id,
@@ -117,11 +119,11 @@ def handle(req: https_fn.Request) -> https_fn.Response:
             return https_fn.Response(
                 "",
                 status=404,
-                headers=_cors_headers_204(),
+                headers=_CORS_HEADERS_204,
             )
 
-        if not _validate_vehicle(db, user_id, vehicle_id):
-            logging.warning(
+        if not vehicle_exists:
+            LOG.warning(
                 "%s Vehiculo no encontrado: userId=%s, vehicleId=%s",
                 LOG_PREFIX,
                 user_id,
@@ -130,12 +132,13 @@ def handle(req: https_fn.Request) -> https_fn.Response:
             return https_fn.Response(
                 "",
                 status=404,
-                headers=_cors_headers_204(),
+                headers=_CORS_HEADERS_204,
             )
 
-        _delete_vehicle_from_firestore(db, user_id, vehicle_id)
+        _delete_vehicle_from_firestore(vehicle_ref)
+        invalidate_user_searches(user_id)
 
-        logging.info(
+        LOG.info(
             "%s Vehiculo eliminado: userId=%s, vehicleId=%s",
             LOG_PREFIX,
             user_id,
@@ -145,13 +148,13 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         return https_fn.Response(
             "",
             status=204,
-            headers=_cors_headers_204(),
+            headers=_CORS_HEADERS_204,
         )
 
     except (AttributeError, KeyError, RuntimeError, TypeError) as e:
-        logging.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
+        LOG.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
         return https_fn.Response(
             "",
             status=500,
-            headers=_cors_headers_204(),
+            headers=_CORS_HEADERS_204,
         )
@@ -7,31 +7,43 @@ Ruta: users/{userId}/vehicles.
 Logica de negocio unicamente. La validacion CORS y Bearer token la realiza vehicle_route.
 """
 
-import json
 import logging
 from typing import Any, Dict, List
 
-from firebase_admin import firestore
+import orjson
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
+from utils.firestore_helper import get_db
+from utils.helpers import ORJSON_RESPONSE_OPTIONS
+
+from .user_exists_cache import user_exists
 
 LOG = logging.getLogger(__name__)
 LOG_PREFIX = "[list_vehicles]"
 
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_JSON_HEADERS = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+}
+
+# Campos que usa _build_vehicle_dict (createdAt/updatedAt no se leen)
+_VEHICLE_FIELDS = ["branch", "year", "model", "color", "photoUrl", "mileageKm"]
+
 
-def _get_vehicles_from_firestore(db, user_id: str):
+def _get_vehicles_from_firestore(user_id: str):
     """
-    Obtiene la referencia a la subcoleccion de vehiculos del usuario.
-    Retorna (user_exists, snapshot_vehicles).
-    Si el usuario no existe, user_exists=False y snapshot_vehicles es None.
+    Obtiene los vehiculos del usuario.
+    Retorna (user_exists, stream_vehicles): iterador de documentos proyectado a _VEHICLE_FIELDS.
+    Si el usuario no existe, user_exists=False y stream_vehicles es None.
     """
-    user_ref = db.collection(FirestoreCollections.USERS).document(user_id)
-    user_doc = user_ref.get()
-    if not user_doc.exists:
+    user_ref = get_db().collection(FirestoreCollections.USERS).document(user_id)
+    if not user_exists(user_ref):
         return False, None
     vehicles_ref = user_ref.collection(FirestoreCollections.USER_VEHICLES)
-    snapshot = vehicles_ref.stream()
-    return True, list(snapshot)
+    return True, vehicles_ref.select(_VEHICLE_FIELDS).stream()
 
 
 def _build_vehicle_dict(doc) -> Dict[str, Any]:
@@ -68,28 +80,27 @@ def handle(req: https_fn.Request) -> https_fn.Response:
     try:
         user_id = (req.args.get("userId") or "").strip()
         if not user_id:
-            logging.warning("%s userId faltante o vacio", LOG_PREFIX)
+            LOG.warning("%s userId faltante o vacio", LOG_PREFIX)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
-        db = firestore.client()
-        user_exists, vehicles_docs = _get_vehicles_from_firestore(db, user_id)
+        user_exists, vehicles_docs = _get_vehicles_from_firestore(user_id)
 
         if not user_exists:
-            logging.warning("%s Usuario no encontrado: %s", LOG_PREFIX, user_id)
+            LOG.warning("%s Usuario no encontrado: %s", LOG_PREFIX, user_id)
             return https_fn.Response(
                 "",
                 status=404,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         result: List[Dict[str, Any]] = [
             _build_vehicle_dict(doc) for doc in (vehicles_docs or [])
         ]
-        logging.info(
+        LOG.info(
             "%s Vehiculos obtenidos para usuario %s: %d",
             LOG_PREFIX,
             user_id,
@@ -97,27 +108,22 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         )
 
         return https_fn.Response(
-            json.dumps(result, ensure_ascii=False),
+            orjson.dumps(result, option=ORJSON_RESPONSE_OPTIONS),
             status=200,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            },
+            headers=_JSON_HEADERS,
         )
 
     except ValueError as e:
-        logging.error("%s Error de validacion: %s", LOG_PREFIX, e)
+        LOG.error("%s Error de validacion: %s", LOG_PREFIX, e)
         return https_fn.Response(
             "",
             status=400,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
     except (AttributeError, KeyError, RuntimeError, TypeError) as e:
-        logging.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
+        LOG.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
         return https_fn.Response(
             "",
             status=500,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
@@ -7,16 +7,34 @@ Ruta: users/{userId}/vehicles.
 Logica de negocio unicamente. La validacion CORS y Bearer token la realiza vehicle_route.
 """
 
-import json
 import logging
 
+import orjson
 from firebase_functions import https_fn
 from models.firestore_collections import FirestoreCollections
 from utils.firestore_helper import FirestoreHelper
+from utils.helpers import ORJSON_RESPONSE_OPTIONS
+from utils.validation_helper import parse_non_negative_int
+
+from .search_cache import cache_search, get_cached_search
 
 LOG = logging.getLogger(__name__)
 LOG_PREFIX = "[search_vehicle]"
 
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_JSON_HEADERS = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+}
+
+# Campos del vehiculo que se devuelven en la respuesta
+_SEARCH_RESULT_FIELDS = ["branch", "model", "year", "color"]
+
+# Query params requeridos, en el orden en que se reporta el primero faltante
+_REQUIRED_PARAMS = ("userId", "branch", "model", "year")
+
 
 def _build_collection_path(user_id: str) -> str:
     """Construye la ruta de la subcoleccion vehicles del usuario."""
@@ -35,10 +53,16 @@ def _search_vehicle_in_firestore(
 ):
     """
     Busca un vehiculo que coincida exactamente en branch, model y year.
+    Usa la cache de coincidencias antes de consultar Firestore (los misses no se cachean).
 
     Returns:
         Tupla (vehicle_id, vehicle_data) si encuentra coincidencia, o None.
     """
+    cache_key = (user_id, branch, model, year)
+    cached = get_cached_search(cache_key)
+    if cached is not None:
+        return cached
+
     collection_path = _build_collection_path(user_id)
     results = fs.query_documents(
         collection_path,
@@ -48,10 +72,12 @@ def _search_vehicle_in_firestore(
             {"field": "year", "operator": "==", "value": year},
         ],
         limit=1,
+        field_paths=_SEARCH_RESULT_FIELDS,
     )
-    if results:
-        return results[0]
-    return None
+    if not results:
+        return None
+    cache_search(cache_key, results[0])
+    return results[0]
 
 
 def handle(req: https_fn.Request) -> https_fn.Response:
@@ -68,74 +94,43 @@ def handle(req: https_fn.Request) -> https_fn.Response:
     Returns:
     - 200: JSON con vehiculo encontrado
     - 400: parametros faltantes o invalidos
-    - 404: usuario o vehiculo no encontrado
+    - 404: vehiculo no encontrado (incluye usuario inexistente)
     - 500: error interno
     """
     try:
-        user_id = (req.args.get("userId") or "").strip()
-        if not user_id:
-            logging.warning("%s userId faltante o vacio", LOG_PREFIX)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
-
-        branch = (req.args.get("branch") or "").strip()
-        if not branch:
-            logging.warning("%s branch faltante o vacio", LOG_PREFIX)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
-
-        model = (req.args.get("model") or "").strip()
-        if not model:
-            logging.warning("%s model faltante o vacio", LOG_PREFIX)
+        params = {name: (req.args.get(name) or "").strip() for name in _REQUIRED_PARAMS}
+        missing = next((name for name in _REQUIRED_PARAMS if not params[name]), None)
+        if missing is not None:
+            LOG.warning("%s %s faltante o vacio", LOG_PREFIX, missing)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
-
-        year_raw = (req.args.get("year") or "").strip()
-        if not year_raw:
-            logging.warning("%s year faltante o vacio", LOG_PREFIX)
+        user_id = params["userId"]
+        branch = params["branch"]
+        model = params["model"]
+        year_raw = params["year"]
+
+        # Mismo parseo que vehicles/create y vehicles/update
+        year = parse_non_negative_int(year_raw)
+        if year is None or year < 1900 or year > 2100:
+            LOG.warning("%s year invalido: %s", LOG_PREFIX, year_raw)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
-
-        try:
-            year = int(year_raw)
-            if year < 1900 or year > 2100:
-                raise ValueError("year fuera de rango")
-        except (ValueError, TypeError):
-            logging.warning("%s year invalido: %s", LOG_PREFIX, year_raw)
-            return https_fn.Response(
-                "",
-                status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         fs = FirestoreHelper()
 
-        user_doc = fs.get_document(FirestoreCollections.USERS, user_id)
-        if user_doc is None:
-            logging.warning("%s Usuario no encontrado: %s", LOG_PREFIX, user_id)
-            return https_fn.Response(
-                "",
-                status=404,
-                headers={"Access-Control-Allow-Origin": "*"},
-            )
-
+        # Sin lectura previa de users/{userId}: si el usuario no existe su subcolección
+        # vehicles está vacía y la query ya responde 404 (misma respuesta que antes).
         match = _search_vehicle_in_firestore(fs, user_id, branch, model, year)
 
         if match is None:
-            logging.info(
-                "%s Vehiculo no encontrado: userId=%s, branch=%s, model=%s, year=%d",
+            LOG.info(
+                "%s Vehiculo no encontrado (o usuario inexistente): userId=%s, branch=%s, model=%s, year=%d",
                 LOG_PREFIX,
                 user_id,
                 branch,
@@ -145,7 +140,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
             return https_fn.Response(
                 "",
                 status=404,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         vehicle_id, vehicle_data = match
@@ -158,7 +153,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
             "color": vehicle_data.get("color"),
         }
 
-        logging.info(
+        LOG.info(
             "%s Vehiculo encontrado: userId=%s, vehicleId=%s",
             LOG_PREFIX,
             user_id,
@@ -166,27 +161,22 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         )
 
         return https_fn.Response(
-            json.dumps(result, ensure_ascii=False),
+            orjson.dumps(result, option=ORJSON_RESPONSE_OPTIONS),
             status=200,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            },
+            headers=_JSON_HEADERS,
         )
 
     except ValueError as e:
-        logging.error("%s Error de validacion: %s", LOG_PREFIX, e)
+        LOG.error("%s Error de validacion: %s", LOG_PREFIX, e)
         return https_fn.Response(
             "",
             status=400,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
     except (AttributeError, KeyError, RuntimeError, TypeError) as e:
-        logging.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
+        LOG.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
         return https_fn.Response(
             "",
             status=500,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
@@ -0,0 +1,59 @@
+"""
+Cache por instancia de coincidencias de search_vehicle.
+
+Clave (userId, branch, model, year) -> (vehicleId, datos). Solo se cachean coincidencias:
+una busqueda sin resultado siempre consulta Firestore, para que un vehiculo recien creado
+aparezca de inmediato (los clientes buscan duplicados antes de crear).
+
+Las entradas viven SEARCH_CACHE_TTL_SECONDS. vehicles/create, update y delete invalidan las
+del usuario solo en su propia instancia; otras escrituras de vehiculos (otras instancias, o
+funciones como users/update, users/delete_section_item y competitors/create_competitor_user)
+no invalidan nada. Por eso una coincidencia cacheada puede seguir devolviendose hasta
+SEARCH_CACHE_TTL_SECONDS despues de que el vehiculo se modifique o elimine.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+SEARCH_CACHE_TTL_SECONDS = 30.0
+_SEARCH_CACHE_MAX_SIZE = 4096
+
+SearchKey = Tuple[str, str, str, int]
+SearchResult = Tuple[str, Dict[str, Any]]
+
+# Clave de búsqueda -> (resultado, instante en que vence la entrada)
+_search_cache: "OrderedDict[SearchKey, Tuple[SearchResult, float]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+
+def get_cached_search(key: SearchKey) -> Optional[SearchResult]:
+    """Coincidencia vigente para key, o None si no hay entrada (o ya vencio)."""
+    now = time.monotonic()
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+        if cached is None:
+            return None
+        result, expires_at = cached
+        if now >= expires_at:
+            del _search_cache[key]
+            return None
+        _search_cache.move_to_end(key)
+        return result
+
+
+def cache_search(key: SearchKey, result: SearchResult) -> None:
+    """Guarda una coincidencia por SEARCH_CACHE_TTL_SECONDS (las busquedas vacias no se cachean)."""
+    with _search_cache_lock:
+        _search_cache[key] = (result, time.monotonic() + SEARCH_CACHE_TTL_SECONDS)
+        _search_cache.move_to_end(key)
+        if len(_search_cache) > _SEARCH_CACHE_MAX_SIZE:
+            _search_cache.popitem(last=False)
+
+
+def invalidate_user_searches(user_id: str) -> None:
+    """Descarta las coincidencias cacheadas de un usuario en esta instancia."""
+    with _search_cache_lock:
+        for key in [k for k in _search_cache if k[0] == user_id]:
+            del _search_cache[key]
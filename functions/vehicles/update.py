@@ -7,59 +7,113 @@ Path: /api/vehicles/{vehicleId}. Query: userId. Body: branch, year, model, color
 Logica de negocio unicamente. La validacion CORS y Bearer token la realiza vehicle_route.
 """
 
-import json
 import logging
+import re
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
 from firebase_admin import firestore
 from firebase_functions import https_fn
+from google.api_core.exceptions import NotFound
 from models.firestore_collections import FirestoreCollections
+from utils.firestore_helper import get_db
+from utils.helpers import ORJSON_RESPONSE_OPTIONS
+from utils.validation_helper import parse_non_negative_int
+
+from .search_cache import invalidate_user_searches
+from .user_exists_cache import is_user_cached, remember_user_exists
 
 LOG = logging.getLogger(__name__)
 LOG_PREFIX = "[update_vehicle]"
 
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_JSON_HEADERS = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+}
+
+# Del documento actual solo se usan los campos opcionales que no vengan en el body
+_EXISTING_VEHICLE_FIELDS = ["photoUrl", "mileageKm"]
+
+# /api/vehicles/{vehicleId}[/...]; tolera barras repetidas o finales como el split previo
+_VEHICLE_PATH_RE = re.compile(r"/*api/+vehicles/+([^/]+)")
+
 
 def _vehicle_id_from_path(path: str) -> str | None:
     """Extrae vehicleId del path /api/vehicles/{vehicleId}. Retorna None si no hay segmento."""
-    if not path:
-        return None
-    parts = [p for p in path.rstrip("/").split("/") if p]
-    if len(parts) >= 3 and parts[0] == "api" and parts[1] == "vehicles":
-        return parts[2] if len(parts) > 2 else None
-    return None
+    match = _VEHICLE_PATH_RE.match(path or "")
+    return match.group(1) if match else None
+
+
+def _get_user_and_vehicle(
+    db: firestore.Client,
+    user_ref: firestore.DocumentReference,
+    vehicle_ref: firestore.DocumentReference,
+    need_existing: bool = True,
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    (existe usuario, datos del vehiculo o None) con a lo sumo una lectura a Firestore.
+
+    Si el usuario está en la cache de existencia solo se lee el vehiculo; si no, ambos
+    documentos se piden en un solo get_all (un round-trip en lugar de dos secuenciales).
+    Con usuario cacheado y need_existing=False (el body trae todos los campos opcionales)
+    no se lee nada: la existencia del vehiculo la valida update(), que falla con NotFound.
+    """
+    if is_user_cached(user_ref):
+        if not need_existing:
+            return True, {}
+        vehicle_doc = vehicle_ref.get(field_paths=_EXISTING_VEHICLE_FIELDS)
+        return True, (vehicle_doc.to_dict() or {}) if vehicle_doc.exists else None
 
+    snaps_by_path = {
+        snap.reference.path: snap
+        for snap in db.get_all(
+            [user_ref, vehicle_ref],
+            field_paths=["authUserId", *_EXISTING_VEHICLE_FIELDS],
+        )
+    }
+    user_snap = snaps_by_path.get(user_ref.path)
+    if user_snap is None or not user_snap.exists:
+        return False, None
+    remember_user_exists(user_ref)
 
-def _validate_user_exists(db, user_id: str) -> bool:
-    """Comprueba que el usuario exista."""
-    user_ref = db.collection(FirestoreCollections.USERS).document(user_id)
-    user_doc = user_ref.get()
-    return user_doc.exists
+    vehicle_snap = snaps_by_path.get(vehicle_ref.path)
+    if vehicle_snap is None or not vehicle_snap.exists:
+        return True, None
+    return True, vehicle_snap.to_dict() or {}
 
 
 def _validate_body(body: Dict[str, Any]) -> str | None:
-    """Valida el body. Retorna None si es valido, o mensaje de error."""
+    """
+    Valida el body. Retorna None si es valido, o mensaje de error.
+    Normaliza el body en el lugar: strings sin espacios alrededor y year como int.
+    """
     if not body or not isinstance(body, dict):
         return "Request body invalido o faltante"
-    if not body.get("branch") or not isinstance(body.get("branch"), str):
-        return "branch es requerido y debe ser string"
-    if not body.get("model") or not isinstance(body.get("model"), str):
-        return "model es requerido y debe ser string"
-    if not body.get("color") or not isinstance(body.get("color"), str):
-        return "color es requerido y debe ser string"
+    for field in ("branch", "model", "color"):
+        value = body.get(field)
+        value = value.strip() if isinstance(value, str) else ""
+        if not value:
+            return f"{field} es requerido y debe ser string"
+        body[field] = value
     year = body.get("year")
     if year is None:
         return "year es requerido"
-    try:
-        y = int(year)
-        if y < 1900 or y > 2100:
-            return "year debe ser un ano valido (1900-2100)"
-    except (TypeError, ValueError):
+    y = parse_non_negative_int(year)
+    if y is None:
         return "year debe ser un entero"
+    if y < 1900 or y > 2100:
+        return "year debe ser un ano valido (1900-2100)"
+    body["year"] = y
     photo_url = body.get("photoUrl")
     if photo_url is not None:
-        if not isinstance(photo_url, str) or not photo_url.strip():
+        photo_url = photo_url.strip() if isinstance(photo_url, str) else ""
+        if not photo_url:
             return "photoUrl debe ser un string no vacio"
+        body["photoUrl"] = photo_url
     mileage_km = body.get("mileageKm")
     if mileage_km is not None:
         if not isinstance(mileage_km, int) or isinstance(mileage_km, bool) or mileage_km < 0:
@@ -87,45 +141,53 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         if not vehicle_id:
             vehicle_id = (req.args.get("vehicleId") or "").strip()
         if not vehicle_id:
-            logging.warning("%s vehicleId faltante (path o query)", LOG_PREFIX)
+            LOG.warning("%s vehicleId faltante (path o query)", LOG_PREFIX)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         user_id = (req.args.get("userId") or "").strip()
         if not user_id:
-            logging.warning("%s userId faltante o vacio", LOG_PREFIX)
+            LOG.warning("%s userId faltante o vacio", LOG_PREFIX)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         try:
             request_data = req.get_json(silent=True)
         except (ValueError, TypeError) as e:
-            logging.warning("%s Error parseando JSON: %s", LOG_PREFIX, e)
+            LOG.warning("%s Error parseando JSON: %s", LOG_PREFIX, e)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
         body = request_data if isinstance(request_data, dict) else None
         err = _validate_body(body)
         if err:
-            logging.warning("%s %s", LOG_PREFIX, err)
+            LOG.warning("%s %s", LOG_PREFIX, err)
             return https_fn.Response(
                 "",
                 status=400,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
-        db = firestore.client()
-        if not _validate_user_exists(db, user_id):
-            logging.warning(
+        db = get_db()
+        user_ref = db.collection(FirestoreCollections.USERS).document(user_id)
+        vehicle_ref = user_ref.collection(FirestoreCollections.USER_VEHICLES).document(
+            vehicle_id
+        )
+        need_existing = any(body.get(f) is None for f in _EXISTING_VEHICLE_FIELDS)
+        user_found, existing = _get_user_and_vehicle(
+            db, user_ref, vehicle_ref, need_existing=need_existing
+        )
+        if not user_found:
+            LOG.warning(
                 "%s Usuario no encontrado: userId=%s",
                 LOG_PREFIX,
                 user_id,
@@ -133,18 +195,10 @@ def handle(req: https_fn.Request) -> https_fn.Response:
             return https_fn.Response(
                 "",
                 status=404,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
-
-        vehicle_ref = (
-            db.collection(FirestoreCollections.USERS)
-            .document(user_id)
-            .collection(FirestoreCollections.USER_VEHICLES)
-            .document(vehicle_id)
-        )
-        vehicle_doc = vehicle_ref.get()
-        if not vehicle_doc.exists:
-            logging.warning(
+        if existing is None:
+            LOG.warning(
                 "%s Vehiculo no encontrado: userId=%s, vehicleId=%s",
                 LOG_PREFIX,
                 user_id,
@@ -153,25 +207,36 @@ def handle(req: https_fn.Request) -> https_fn.Response:
             return https_fn.Response(
                 "",
                 status=404,
-                headers={"Access-Control-Allow-Origin": "*"},
+                headers=_CORS_HEADERS,
             )
 
-        existing = vehicle_doc.to_dict() or {}
-        year_val = int(body["year"])
-        now = datetime.now(timezone.utc)
-
+        # _validate_body ya dejo branch/model/color/photoUrl sin espacios y year como int
         update_data = {
-            "branch": str(body["branch"]).strip(),
-            "year": year_val,
-            "model": str(body["model"]).strip(),
-            "color": str(body["color"]).strip(),
-            "updatedAt": now,
+            "branch": body["branch"],
+            "year": body["year"],
+            "model": body["model"],
+            "color": body["color"],
+            "updatedAt": datetime.now(timezone.utc),
         }
         if body.get("photoUrl") is not None:
-            update_data["photoUrl"] = str(body["photoUrl"]).strip()
+            update_data["photoUrl"] = body["photoUrl"]
         if body.get("mileageKm") is not None:
-            update_data["mileageKm"] = int(body["mileageKm"])
-        vehicle_ref.update(update_data)
+            update_data["mileageKm"] = body["mileageKm"]
+        try:
+            vehicle_ref.update(update_data)
+        except NotFound:
+            LOG.warning(
+                "%s Vehiculo no encontrado al actualizar: userId=%s, vehicleId=%s",
+                LOG_PREFIX,
+                user_id,
+                vehicle_id,
+            )
+            return https_fn.Response(
+                "",
+                status=404,
+                headers=_CORS_HEADERS,
+            )
+        invalidate_user_searches(user_id)
 
         result = {
             "id": vehicle_id,
@@ -189,7 +254,7 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         elif existing.get("mileageKm") is not None:
             result["mileageKm"] = existing["mileageKm"]
 
-        logging.info(
+        LOG.info(
             "%s Vehiculo actualizado: userId=%s, vehicleId=%s",
             LOG_PREFIX,
             user_id,
@@ -197,27 +262,22 @@ def handle(req: https_fn.Request) -> https_fn.Response:
         )
 
         return https_fn.Response(
-            json.dumps(result, ensure_ascii=False),
+            orjson.dumps(result, option=ORJSON_RESPONSE_OPTIONS),
             status=200,
-            headers={
-                "Content-Type": "application/json; charset=utf-8",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            },
+            headers=_JSON_HEADERS,
         )
 
     except ValueError as e:
-        logging.error("%s Error de validacion: %s", LOG_PREFIX, e)
+        LOG.error("%s Error de validacion: %s", LOG_PREFIX, e)
         return https_fn.Response(
             "",
             status=400,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
     except (AttributeError, KeyError, RuntimeError, TypeError) as e:
-        logging.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
+        LOG.error("%s Error interno: %s", LOG_PREFIX, e, exc_info=True)
         return https_fn.Response(
             "",
             status=500,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
@@ -0,0 +1,54 @@
+"""
+Cache por instancia de "el usuario existe" para los handlers de vehiculos.
+
+Varias operaciones seguidas de un mismo usuario (listar, crear, actualizar) validan
+users/{userId} antes de tocar su subcolección de vehiculos. Solo se cachean resultados
+positivos y por USER_EXISTS_TTL_SECONDS: un usuario inexistente se vuelve a leer siempre.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+USER_EXISTS_TTL_SECONDS = 60.0
+_USER_EXISTS_MAX_SIZE = 1024
+
+# Path del documento (users/{userId}) -> instante en que vence la entrada
+_user_exists_cache: "OrderedDict[str, float]" = OrderedDict()
+_user_exists_lock = threading.Lock()
+
+
+def is_user_cached(user_ref) -> bool:
+    """True si hay una entrada vigente de users/{userId} en la cache (sin leer Firestore)."""
+    now = time.monotonic()
+    with _user_exists_lock:
+        expires_at = _user_exists_cache.get(user_ref.path)
+        if expires_at is None:
+            return False
+        if now < expires_at:
+            _user_exists_cache.move_to_end(user_ref.path)
+            return True
+        del _user_exists_cache[user_ref.path]
+        return False
+
+
+def remember_user_exists(user_ref) -> None:
+    """Guarda que users/{userId} existe (p. ej. tras leerlo junto con otro documento)."""
+    with _user_exists_lock:
+        _user_exists_cache[user_ref.path] = time.monotonic() + USER_EXISTS_TTL_SECONDS
+        _user_exists_cache.move_to_end(user_ref.path)
+        if len(_user_exists_cache) > _USER_EXISTS_MAX_SIZE:
+            _user_exists_cache.popitem(last=False)
+
+
+def user_exists(user_ref) -> bool:
+    """
+    True si users/{userId} existe. En un fallo de cache lee el documento con field mask
+    (solo authUserId) y guarda el resultado si el usuario existe.
+    """
+    if is_user_cached(user_ref):
+        return True
+    if not user_ref.get(field_paths=["authUserId"]).exists:
+        return False
+    remember_user_exists(user_ref)
+    return True
@@ -29,6 +29,8 @@ _ACTION_SEARCH = "search"
 _ACTION_UPDATE = "update"
 _ACTION_DELETE = "delete"
 
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+
 
 def _action_from_request(path: str, method: str) -> str | None:
     """
@@ -99,7 +101,7 @@ def vehicle_route(req: https_fn.Request) -> https_fn.Response:
         return https_fn.Response(
             "",
             status=401,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
 
     path = getattr(req, "path", "") or ""
@@ -111,7 +113,7 @@ def vehicle_route(req: https_fn.Request) -> https_fn.Response:
         return https_fn.Response(
             "",
             status=404,
-            headers={"Access-Control-Allow-Origin": "*"},
+            headers=_CORS_HEADERS,
         )
 
     return _HANDLERS[action](req)